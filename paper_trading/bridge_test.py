@@ -26,10 +26,13 @@ After Telegram arrives:
 import json
 import sys
 import os
-import requests
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+# Shared pooled HTTP client lives in scripts/ (one keep-alive session for every API)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import http_client
+
 WORKSPACE    = Path("/home/ubuntu/.openclaw/workspace")
 SIGNALS_FILE = WORKSPACE / "scripts" / "whale_signals.json"
 SIGNALS_BAK  = WORKSPACE / "scripts" / "whale_signals.json.bak"
@@ -47,7 +50,7 @@ def find_target_market():
     """Find the tariff market by keyword in question text."""
     print("[*] Searching Gamma API for target market...")
     try:
-        r = requests.get(
+        r = http_client.get(
             f"{GAMMA_API}/markets",
             params={"active": "true", "closed": "false", "limit": 100},
             timeout=10
@@ -18,10 +18,14 @@ import json
 import sys
 import os
 import uuid
-import requests
 from datetime import datetime, timezone
 from pathlib import Path
 
+# Shared category taxonomy and batched price oracle live in scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import category_classifier
+import price_oracle
+
 # ── Paths ────────────────────────────────────────────────────────────────────
 WORKSPACE  = Path("/home/ubuntu/.openclaw/workspace")
 PAPER_DIR  = WORKSPACE / "paper_trading"
@@ -78,53 +82,14 @@ def _log(message, event="INFO"):
 
 def get_market_price(market_id: str, side: str = "YES") -> float | None:
     """
-    Fetch live token price from Polymarket Gamma API.
-    Gamma returns outcomePrices (list of strings) paired with outcomes (list of strings).
-    e.g. outcomes: ["Yes","No"]  outcomePrices: ["0.725","0.275"]
+    Live token price for one position, via the batched price oracle (scripts/price_oracle.py).
+    Any id form (numeric id, hex conditionId, slug, CLOB token id) is resolved through the
+    market index (scripts/market_index.py) -- one targeted query, no listing scans.
     """
-    try:
-        base = "https://gamma-api.polymarket.com/markets"
-        if market_id.startswith("0x"):
-            # conditionId hex market: scan active then closed, match exactly
-            data = {}
-            for closed_val in ["false", "true"]:
-                r2 = requests.get(base, params={"closed": closed_val, "limit": 500}, timeout=15)
-                r2.raise_for_status()
-                matched = [m for m in r2.json() if m.get("conditionId","").lower() == market_id.lower()]
-                if matched:
-                    data = matched[0]
-                    break
-        else:
-            resp = requests.get(f"{base}/{market_id}", timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-
-        if isinstance(data, list):
-            data = data[0] if data else {}
-
-        import json as _json
-        outcomes_raw = data.get("outcomes", [])
-        prices_raw   = data.get("outcomePrices", [])
-
-        # Gamma API returns these as JSON strings OR actual lists
-        outcomes = _json.loads(outcomes_raw) if isinstance(outcomes_raw, str) else outcomes_raw
-        prices   = _json.loads(prices_raw)   if isinstance(prices_raw,   str) else prices_raw
-
-        if outcomes and prices:
-            for i, outcome in enumerate(outcomes):
-                if outcome.strip().upper() == side.upper():
-                    return float(prices[i])
-            # fallback: YES is index 0 on binary markets
-            return float(prices[0])
-
-        # last resort
-        ltp = data.get("lastTradePrice")
-        if ltp is not None:
-            return float(ltp)
-
-    except Exception as e:
-        print(f"  [WARN] Live price unavailable for {market_id}: {e}")
-    return None
+    price = price_oracle.get_price(market_id, side)
+    if price is None:
+        print(f"  [WARN] Live price unavailable for {market_id}")
+    return price
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -177,28 +142,6 @@ def cmd_init(args):
 
 # ─────────────────────────────────────────────────────────────────────────────
 
-CATEGORY_KEYWORDS = {
-    "politics":      ["election", "president", "congress", "senate", "vote",
-                      "trump", "governor", "primary", "democrat", "republican"],
-    "entertainment": ["oscar", "emmy", "grammy", "award", "actor", "actress",
-                      "film", "movie", "singer", "celebrity", "music", "album"],
-    "sports":        ["nba", "nfl", "mlb", "nhl", "playoff", "championship",
-                      "tournament", "super bowl", "finals", "mvp", "basketball"],
-    "finance":       ["fed", "rate", "bitcoin", "crypto", "inflation", "gdp",
-                      "recession", "stock", "market", "btc", "eth", "earnings"],
-}
-
-def _detect_category(market_name: str) -> str:
-    name_lower = market_name.lower()
-    scores = {cat: 0 for cat in CATEGORY_KEYWORDS}
-    for cat, keywords in CATEGORY_KEYWORDS.items():
-        for kw in keywords:
-            if kw in name_lower:
-                scores[cat] += 1
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "other"
-
-
 def cmd_buy(args):
     """
     Execute a paper trade (after Ankur has approved via Telegram).
@@ -223,15 +166,15 @@ def cmd_buy(args):
     signal_tier  = int(args[4])
 
     # Category is optional last arg — if last word is a known category, extract it
-    KNOWN_CATEGORIES = {"politics", "entertainment", "sports", "finance", "other"}
+    KNOWN_CATEGORIES = set(category_classifier.CATEGORIES) | set(category_classifier.LEGACY_CATEGORIES)
     name_args = args[5:]
     if name_args and name_args[-1].lower() in KNOWN_CATEGORIES:
         category    = name_args[-1].lower()
         market_name = " ".join(name_args[:-1])
     else:
-        # Auto-detect category from market name via keyword matching
+        # Auto-detect category from market name (shared classifier, same taxonomy as the tracker)
         market_name = " ".join(name_args)
-        category    = _detect_category(market_name)
+        category    = category_classifier.classify(market_name)
 
     if side not in ("YES", "NO"):
         print("Side must be YES or NO")
@@ -326,10 +269,12 @@ def cmd_status(args):
 
     total_invested     = 0.0
     total_current_val  = 0.0
+    # every open position priced in one batched lookup
+    live_prices = price_oracle.get_prices((pos["market_id"], pos["side"]) for pos in open_pos)
 
     for pos in open_pos:
         invested      = pos["virtual_amount"]
-        current_price = get_market_price(pos["market_id"], pos["side"])
+        current_price = live_prices[(pos["market_id"], pos["side"])]
 
         if current_price is not None:
             current_value = round(pos["shares"] * current_price, 4)
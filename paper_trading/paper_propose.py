@@ -26,10 +26,13 @@ import sys
 import os
 import time
 import subprocess
-import requests
 from datetime import datetime, timezone
 from pathlib import Path
 
+# Shared pooled HTTP client lives in scripts/ (one keep-alive session for every API)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import http_client
+
 # -- Paths ---------------------------------------------------------------------
 WORKSPACE   = Path("/home/ubuntu/.openclaw/workspace")
 PAPER_DIR   = WORKSPACE / "paper_trading"
@@ -74,7 +77,7 @@ def tg_send_with_keyboard(message: str, yes_data: str, no_data: str) -> dict:
     yes_data / no_data are callback_data strings we match when polling.
     """
     url  = f"https://api.telegram.org/bot{TG['token']}/sendMessage"
-    resp = requests.post(url, json={
+    resp = http_client.post(url, json={
         "chat_id":    TG["chat_id"],
         "text":       message,
         "parse_mode": "HTML",
@@ -92,7 +95,7 @@ def tg_send_with_keyboard(message: str, yes_data: str, no_data: str) -> dict:
 def tg_send(message: str) -> dict:
     """Send a plain text message (used for confirmations, not proposals)."""
     url  = f"https://api.telegram.org/bot{TG['token']}/sendMessage"
-    resp = requests.post(url, json={
+    resp = http_client.post(url, json={
         "chat_id":    TG["chat_id"],
         "text":       message,
         "parse_mode": "HTML"
@@ -108,7 +111,7 @@ def tg_answer_callback(callback_query_id: str, text: str = "") -> None:
     """
     url = f"https://api.telegram.org/bot{TG['token']}/answerCallbackQuery"
     try:
-        requests.post(url, json={
+        http_client.post(url, json={
             "callback_query_id": callback_query_id,
             "text": text,
             "show_alert": False
@@ -124,7 +127,7 @@ def tg_edit_keyboard_off(chat_id: str, message_id: int, result_text: str) -> Non
     """
     url = f"https://api.telegram.org/bot{TG['token']}/editMessageReplyMarkup"
     try:
-        requests.post(url, json={
+        http_client.post(url, json={
             "chat_id":      chat_id,
             "message_id":   message_id,
             "reply_markup": {}   # empty = remove keyboard
@@ -137,7 +140,7 @@ def tg_get_updates(offset: int = 0) -> list:
     """Fetch new updates via short-poll (timeout=0)."""
     url = f"https://api.telegram.org/bot{TG['token']}/getUpdates"
     try:
-        resp = requests.get(url, params={"offset": offset, "timeout": 0}, timeout=10)
+        resp = http_client.get(url, params={"offset": offset, "timeout": 0}, timeout=10)
         resp.raise_for_status()
         return resp.json().get("result", [])
     except Exception as e:
@@ -20,10 +20,15 @@ import json
 import sys
 import os
 import subprocess
-import requests
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+# Shared pooled HTTP client lives in scripts/ (one keep-alive session for every API)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import http_client
+import category_classifier
+import price_oracle
+
 # --- Paths --------------------------------------------------------------------
 WORKSPACE    = Path("/home/ubuntu/.openclaw/workspace")
 SIGNALS_FILE = WORKSPACE / "scripts"       / "whale_signals.json"
@@ -44,23 +49,9 @@ PROPOSAL_TTL_MINS = 30     # proposals expire after 30 min
 DUPLICATE_BLOCK_HOURS = 24  # same market blocked for 24h after any proposal
 MAX_PROPOSALS_DAY = 10     # daily cap — max Telegram proposals per UTC day
 
-# --- Category keyword map (unchanged from v1) ---------------------------------
-CATEGORY_KEYWORDS = {
-    "politics":      ["election", "president", "congress", "senate", "vote",
-                      "trump", "governor", "primary", "democrat", "republican",
-                      "ballot", "poll", "candidate", "federal", "white house"],
-    "entertainment": ["oscar", "emmy", "grammy", "award", "actor", "actress",
-                      "film", "movie", "singer", "celebrity", "music", "album",
-                      "box office", "director", "netflix", "hollywood"],
-    "sports":        ["nba", "nfl", "mlb", "nhl", "playoff", "championship",
-                      "tournament", "super bowl", "world cup", "league",
-                      "finals", "mvp", "season", "match", "game", "team",
-                      "basketball", "football", "baseball", "soccer"],
-    "finance":       ["fed", "rate", "bitcoin", "crypto", "inflation", "gdp",
-                      "recession", "stock", "market", "economy", "interest",
-                      "dollar", "btc", "eth", "ethereum", "nasdaq", "s&p",
-                      "earnings", "ipo", "debt", "treasury"],
-}
+# --- Categories (shared taxonomy: scripts/category_classifier.py) -------------
+# legacy "finance" positions are re-classified into these in calc_category_exposure()
+ALL_CATEGORIES = list(category_classifier.CATEGORIES)
 
 
 # --- Logging ------------------------------------------------------------------
@@ -98,7 +89,7 @@ def send_telegram(msg, dry_run=False):
         print(msg)
         return False
     try:
-        r = requests.post(
+        r = http_client.post(
             f"https://api.telegram.org/bot{token}/sendMessage",
             json={"chat_id": chat_id, "text": msg},
             timeout=10
@@ -167,15 +158,10 @@ def increment_daily_cap(pending: dict) -> dict:
 
 # --- Category detection -------------------------------------------------------
 
-def detect_category(market_name: str) -> str:
-    name_lower = market_name.lower()
-    scores     = {cat: 0 for cat in CATEGORY_KEYWORDS}
-    for cat, keywords in CATEGORY_KEYWORDS.items():
-        for kw in keywords:
-            if kw in name_lower:
-                scores[cat] += 1
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "other"
+def detect_category(signal: dict) -> str:
+    """Category the tracker assigned to the signal; classify the name only for older signal files."""
+    return signal.get("market_category") or category_classifier.classify_market(
+        signal.get("market_id"), signal.get("market_name", ""))
 
 
 # --- Kelly sizing -------------------------------------------------------------
@@ -225,44 +211,32 @@ def calculate_trade_size(signal: dict, total_portfolio: float) -> tuple[float, s
 # --- Portfolio calculations ---------------------------------------------------
 
 def get_live_price(market_id: str, side: str = "YES"):
-    try:
-        r = requests.get(
-            f"https://gamma-api.polymarket.com/markets/{market_id}",
-            timeout=10
-        )
-        r.raise_for_status()
-        data = r.json()
-        if isinstance(data, list):
-            data = data[0] if data else {}
-        outcomes_raw = data.get("outcomes", [])
-        prices_raw   = data.get("outcomePrices", [])
-        outcomes = json.loads(outcomes_raw) if isinstance(outcomes_raw, str) else outcomes_raw
-        prices   = json.loads(prices_raw)   if isinstance(prices_raw,   str) else prices_raw
-        if outcomes and prices:
-            for i, outcome in enumerate(outcomes):
-                if outcome.strip().upper() == side.upper():
-                    return float(prices[i])
-            return float(prices[0])
-    except Exception:
-        pass
-    return None
+    return price_oracle.get_price(market_id, side)
 
 
 def calc_portfolio_value(ledger: dict) -> tuple[float, float, float]:
     """Returns (cash, open_value, total_portfolio)."""
     cash       = ledger["meta"]["virtual_balance"]
     open_value = 0.0
+    live_prices = price_oracle.get_prices(
+        (pos["market_id"], pos["side"]) for pos in ledger["open_positions"])
     for pos in ledger["open_positions"]:
-        live = get_live_price(pos["market_id"], pos["side"])
+        live = live_prices[(pos["market_id"], pos["side"])]
         open_value += (pos["shares"] * live) if live is not None else pos["virtual_amount"]
     return cash, open_value, cash + open_value
 
 
 def calc_category_exposure(ledger: dict, total_portfolio: float) -> dict:
-    """Returns {category: pct_of_total_portfolio} for all open positions."""
+    """
+    Returns {category: pct_of_total_portfolio} for all open positions. Positions stored
+    under a legacy category ("finance") are re-classified from their market name, so they
+    count against the same cap as new economics / crypto trades in that kind of market.
+    """
     cat_invested = {}
     for pos in ledger["open_positions"]:
         cat = pos.get("category", "other")
+        if cat in category_classifier.LEGACY_CATEGORIES:
+            cat = category_classifier.classify_market(pos.get("market_id"), pos.get("market_name", ""))
         cat_invested[cat] = cat_invested.get(cat, 0.0) + pos["virtual_amount"]
     if total_portfolio <= 0:
         return {}
@@ -342,7 +316,7 @@ def build_proposal(signal: dict, category: str, amount: float, sizing_rationale:
     cat_after = dict(cat_exposure)
     cat_after[category] = cat_after.get(category, 0.0) + (
         amount / total_portfolio if total_portfolio > 0 else 0)
-    all_cats  = ["politics", "entertainment", "sports", "finance", "other"]
+    all_cats  = ALL_CATEGORIES
     cat_lines = " / ".join(
         f"{c.title()} {cat_after.get(c, 0)*100:.0f}%"
         for c in all_cats if cat_after.get(c, 0) > 0
@@ -435,7 +409,7 @@ def run_bridge(dry_run=False):
         market_id   = signal["market_id"]
         market_name = signal["market_name"]
         tier        = signal["tier"]
-        category    = detect_category(market_name)
+        category    = detect_category(signal)
         days_left   = signal.get("days_to_resolve", 0)
 
         log(f"Processing: {market_name[:50]} | Tier {tier} | "
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+category_classifier.py - One market category classifier for tracker, bridge and engine
+Location: ~/.openclaw/workspace/scripts/category_classifier.py
+Version: 1.0 | Built: 2026-10-18
+
+whale_tracker, paper_signal_bridge and paper_engine each had their own keyword map
+and ran a substring test per keyword per category, so the same market could be
+"geopolitics" in the tracker and "other" in the bridge (and "war" matched "Warriors").
+This module holds the single taxonomy:
+
+    geopolitics > economics > entertainment > sports > politics > crypto > other
+
+All keywords are compiled into ONE alternation regex (longest keyword first, word
+boundaries, optional plural s/es), so a market name is classified in one pass.
+Score = distinct keywords matched per category; ties go to the higher-priority category.
+
+"finance" (bridge/engine v1 taxonomy) is no longer produced -- its keywords now live
+under economics / crypto -- but it is kept in LEGACY_CATEGORIES so existing ledger
+positions and manual `paper_engine.py buy ... finance` still work.
+
+Results are memoised by conditionId in paper_trading/category_cache.json. The cache
+stores a hash of the taxonomy and is discarded automatically when keywords change.
+
+Usage:
+    import category_classifier
+    category_classifier.classify("Will Iran strike Israel?")            -> "geopolitics"
+    category_classifier.classify_market(cid, question)                  -> cached lookup
+    category_classifier.save_cache()                                    -> persist memo
+"""
+
+import hashlib
+import json
+import os
+import re
+
+CACHE_FILE      = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'category_cache.json')
+CACHE_MAX       = 20000   # memo entries kept (oldest dropped first)
+
+# Priority order == dict order (also the scan order used by whale_tracker)
+CATEGORY_KEYWORDS = {
+    "geopolitics":   ["war","iran","russia","ukraine","israel","gaza","nato","sanction","nuclear","ceasefire","conflict",
+                      "military","attack","strike","invasion","troops","missile","hormuz","regime","forces enter"],
+    "economics":     ["fed","interest rate","inflation","gdp","recession","unemployment","tariff","trade","debt","deficit",
+                      "treasury","cpi","pce","shutdown","budget","federal reserve","rate","interest","economy","dollar",
+                      "stock","stock market","nasdaq","s&p","earnings","ipo"],
+    "entertainment": ["oscar","academy award","grammy","emmy","golden globe","box office","film","movie","album","award",
+                      "actor","actress","singer","celebrity","music","director","netflix","hollywood"],
+    "sports":        ["nba","nfl","nhl","mlb","tennis","soccer","football","basketball","baseball","hockey","mls","ufc",
+                      "f1","formula","match","game","series","championship","playoff","tournament","wimbledon","bnp",
+                      "open","cup","league","warriors","lakers","celtics","masters","pga","super bowl","world cup",
+                      "finals","mvp","season","team"],
+    "politics":      ["election","president","congress","senate","vote","poll","democrat","republican","trump","biden",
+                      "harris","governor","primary","ballot","candidate","federal","white house"],
+    "crypto":        ["bitcoin","btc","ethereum","eth","crypto","coin","token","blockchain","defi","solana","base"],
+}
+CATEGORY_PRIORITY = {cat: i for i, cat in enumerate(list(CATEGORY_KEYWORDS) + ["other"], start=1)}
+CATEGORIES        = tuple(CATEGORY_PRIORITY)
+LEGACY_CATEGORIES = ("finance",)
+
+# keyword -> category (first category in priority order wins a shared keyword)
+_KEYWORD_CATEGORY = {}
+for _cat, _kws in CATEGORY_KEYWORDS.items():
+    for _kw in _kws:
+        _KEYWORD_CATEGORY.setdefault(_kw, _cat)
+
+_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(kw) for kw in sorted(_KEYWORD_CATEGORY, key=len, reverse=True)) + r")(?:s|es)?\b",
+    re.IGNORECASE)
+
+TAXONOMY_HASH = hashlib.sha1(json.dumps(CATEGORY_KEYWORDS, sort_keys=True).encode()).hexdigest()[:12]
+
+_cache       = None
+_cache_dirty = False
+
+
+def classify(text: str) -> str:
+    """Category for a market name / question, in one regex pass."""
+    hits = {}
+    for kw in {m.group(1).lower() for m in _PATTERN.finditer(text or "")}:
+        cat = _KEYWORD_CATEGORY[kw]
+        hits[cat] = hits.get(cat, 0) + 1
+    if not hits:
+        return "other"
+    return max(hits, key=lambda c: (hits[c], -CATEGORY_PRIORITY[c]))
+
+
+# --- conditionId memo ---------------------------------------------------------
+
+def _load_cache() -> dict:
+    global _cache
+    if _cache is None:
+        _cache = {}
+        if os.path.exists(CACHE_FILE):
+            try:
+                with open(CACHE_FILE) as f:
+                    data = json.load(f)
+                if data.get("taxonomy") == TAXONOMY_HASH:
+                    _cache = data.get("markets", {})
+            except Exception:
+                pass
+    return _cache
+
+
+def classify_market(cid, text: str) -> str:
+    """classify() memoised by conditionId (falls back to plain classify() without an id)."""
+    global _cache_dirty
+    if not cid:
+        return classify(text)
+    cache = _load_cache()
+    cat   = cache.get(cid)
+    if cat is None:
+        cat = cache[cid] = classify(text)
+        _cache_dirty = True
+    return cat
+
+
+def save_cache():
+    """Persist the memo (atomic write) if anything new was classified."""
+    global _cache_dirty
+    if not _cache_dirty or _cache is None:
+        return
+    for cid in list(_cache)[:max(0, len(_cache) - CACHE_MAX)]:
+        del _cache[cid]
+    tmp = CACHE_FILE + ".tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump({"taxonomy": TAXONOMY_HASH, "markets": _cache}, f)
+        os.replace(tmp, CACHE_FILE)
+        _cache_dirty = False
+    except Exception as e:
+        print(f"  [x] Category cache save failed: {e}")
+
+
+if __name__ == "__main__":
+    import sys
+    for q in sys.argv[1:] or ["Will Iran strike Israel before July?", "Warriors vs Lakers", "Fed rate cut in June?"]:
+        print(f"{classify(q):14} {q}")
@@ -12,8 +12,10 @@ v5 fixes:
   - Telegram creds: hardcoded /home/ubuntu path (SSM runs as root, ~ resolves wrong)
 """
 
-import subprocess, requests, json, os, re
+import subprocess, json, os, re
 from datetime import datetime, timezone
+import http_client
+import price_oracle
 
 POLYCLAW_DIR = "/home/ubuntu/.openclaw/workspace/skills/polyclaw"
 VENV_PYTHON  = "/home/ubuntu/.openclaw/workspace/skills/polyclaw/.venv/bin/python"
@@ -104,7 +106,7 @@ def send_telegram(msg):
         print("TELEGRAM CREDS NOT FOUND\n" + msg)
         return False
     try:
-        r = requests.post(
+        r = http_client.post(
             f"https://api.telegram.org/bot{token}/sendMessage",
             json={"chat_id": chat_id, "text": msg},
             timeout=15
@@ -118,40 +120,12 @@ def send_telegram(msg):
 # ─── GAMMA API ────────────────────────────────────────────────────────────────
 
 def get_gamma_yes_price(market_id, side="YES"):
-    """Get current YES price. Uses CLOB API for hex conditionIds, Gamma for numeric IDs."""
-    # BUG-025 FIX: hex conditionIds (from /events endpoint) need CLOB API
-    if str(market_id).startswith('0x'):
-        try:
-            r = requests.get(f"https://clob.polymarket.com/markets/{market_id}", timeout=10)
-            r.raise_for_status()
-            tokens = r.json().get('tokens', [])
-            for t in tokens:
-                if t.get('outcome', '').strip().upper() == side.upper():
-                    return float(t['price'])
-            if tokens:
-                return float(tokens[0]['price'])
-        except Exception as e:
-            print(f"  CLOB API error for {market_id}: {e}")
-        return None
-    # Numeric IDs use Gamma API (existing logic unchanged)
-    try:
-        r = requests.get(f"{GAMMA_API}/markets/{market_id}", timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        if isinstance(data, list):
-            data = data[0] if data else {}
-        outcomes_raw = data.get("outcomes", [])
-        prices_raw   = data.get("outcomePrices", [])
-        outcomes = json.loads(outcomes_raw) if isinstance(outcomes_raw, str) else outcomes_raw
-        prices   = json.loads(prices_raw)   if isinstance(prices_raw,   str) else prices_raw
-        if outcomes and prices:
-            for i, outcome in enumerate(outcomes):
-                if outcome.strip().upper() == "YES":
-                    return float(prices[i])
-            return float(prices[0])
-    except Exception as e:
-        print(f"  Gamma API error for {market_id}: {e}")
-    return None
+    """Current price of `side`. Any id form (numeric id, hex conditionId, slug, token id) is
+    resolved through the market index and priced with one targeted Gamma query."""
+    price = price_oracle.get_price(market_id, side)
+    if price is None:
+        print(f"  Gamma API: no price for {market_id}")
+    return price
 
 
 # ─── REAL MONEY ───────────────────────────────────────────────────────────────
@@ -161,8 +135,9 @@ def parse_oscar_positions():
     alerts      = []
     total_value = 0.0
 
+    prices = price_oracle.get_prices((market_id, "YES") for market_id in OSCAR_POSITIONS)
     for market_id, (label, entry, invested) in OSCAR_POSITIONS.items():
-        price = get_gamma_yes_price(market_id)
+        price = prices[(market_id, "YES")]
 
         if price is None:
             lines.append(f"- {label}: price unavailable")
@@ -247,8 +222,10 @@ def build_paper_report():
     pos_lines    = []
     cat_invested = {}
 
+    # one batched lookup for the whole ledger (report values every position at its YES price)
+    live_prices = price_oracle.get_prices((pos["market_id"], "YES") for pos in open_pos)
     for pos in open_pos:
-        live        = get_gamma_yes_price(pos["market_id"])
+        live        = live_prices[(pos["market_id"], "YES")]
         shares      = float(pos.get("shares", 0))
         entry_price = float(pos.get("entry_price", 0))
         invested    = float(pos.get("virtual_amount", 0))
@@ -332,7 +309,7 @@ def build_paper_report():
 def get_market_status(market_id):
     """Check if a Gamma market is resolved. Returns (is_resolved, winner, yes_price)."""
     try:
-        r = requests.get(f"{GAMMA_API}/markets/{market_id}", timeout=10)
+        r = http_client.get(f"{GAMMA_API}/markets/{market_id}", timeout=10)
         r.raise_for_status()
         data = r.json()
         if isinstance(data, list):
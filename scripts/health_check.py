@@ -11,6 +11,8 @@ import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
 
+import http_client
+
 # ── Config ───────────────────────────────────────────────────────────────────
 BASE = Path('/home/ubuntu/.openclaw/workspace')
 BRIDGE_LOG   = BASE / 'paper_trading/bridge.log'
@@ -31,17 +33,13 @@ def load_telegram_creds():
         return '', ''
 
 def send_telegram(msg):
-    import urllib.request, json
     token, chat_id = load_telegram_creds()
     if not token or not chat_id:
         print("No Telegram creds found")
         return
     url = f"https://api.telegram.org/bot{token}/sendMessage"
-    data = json.dumps({"chat_id": chat_id, "text": msg}).encode()
-    req = urllib.request.Request(url, data=data,
-                                  headers={"Content-Type": "application/json"})
     try:
-        urllib.request.urlopen(req, timeout=10)
+        http_client.post(url, json={"chat_id": chat_id, "text": msg}, timeout=10).raise_for_status()
     except Exception as e:
         print(f"Telegram error: {e}")
 
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+http_client.py - Shared pooled HTTP client for Gamma, Data, CLOB and Telegram APIs
+Location: ~/.openclaw/workspace/scripts/http_client.py
+Version: 1.0 | Built: 2026-10-18
+
+Every script used to make bare requests.get/post calls (health_check even used urllib),
+so each call paid a fresh TCP+TLS handshake. This module holds ONE requests.Session per
+process with a keep-alive connection pool per host, gzip enabled, and the same timeout +
+retry-with-jitter policy for everybody. It also counts requests / bytes / time per
+endpoint so a scan can print where its network budget went.
+
+Usage:
+    import http_client
+    resp = http_client.get(f"{GAMMA_API}/markets", params={...}, timeout=10)
+    resp.raise_for_status()
+    http_client.print_stats()
+
+Retry policy:
+    connect failures and HTTP 429       -> retried for every method (request never sent:
+                                           connect timeout, refused, DNS)
+    other connection errors (connection
+    aborted / reset mid-request), read
+    timeouts and HTTP 5xx               -> retried for GET/HEAD only (a POST may have
+                                           landed -- Telegram would deliver it twice)
+    sleep = random(0, min(BACKOFF_CAP, BACKOFF_BASE * 2^attempt)), or Retry-After if larger
+After the last attempt the final response is returned as-is (callers keep raise_for_status)
+or the last exception is re-raised.
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+# --- Policy -------------------------------------------------------------------
+DEFAULT_TIMEOUT  = 10         # seconds, used when a caller passes no timeout
+MAX_RETRIES      = 2          # extra attempts after the first one
+BACKOFF_BASE     = 0.5        # seconds, doubled per attempt (full jitter)
+BACKOFF_CAP      = 8.0        # seconds, ceiling for one backoff sleep
+POOL_CONNECTIONS = 8          # distinct hosts kept in the pool manager
+POOL_MAXSIZE     = 16         # keep-alive connections per host (>= whale_tracker worker counts)
+RETRY_STATUSES   = {429, 500, 502, 503, 504}
+IDEMPOTENT       = {"GET", "HEAD", "OPTIONS"}
+USER_AGENT       = "openclaw-alpha/1.0"
+
+_session      = None
+_session_lock = threading.Lock()
+_stats        = {}
+_stats_lock   = threading.Lock()
+
+
+# --- Session ------------------------------------------------------------------
+
+def get_session() -> requests.Session:
+    """Process-wide session, created on first use. Safe to share across worker threads."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                s.mount("https://", adapter)
+                s.mount("http://",  adapter)
+                s.headers.update({"Accept-Encoding": "gzip, deflate", "User-Agent": USER_AGENT})
+                _session = s
+    return _session
+
+
+# --- Per-endpoint accounting --------------------------------------------------
+
+def endpoint_key(url: str) -> str:
+    """
+    Collapse a URL to host + path with ids removed, e.g.
+      https://gamma-api.polymarket.com/markets/613835 -> gamma-api.polymarket.com/markets/{id}
+      https://api.telegram.org/bot<token>/sendMessage -> api.telegram.org/{token}/sendMessage
+    Bot tokens never reach the stats table or the logs.
+    """
+    parts = urlsplit(url)
+    segs  = []
+    for seg in parts.path.split("/"):
+        if not seg:
+            continue
+        if ":" in seg:
+            seg = "{token}"
+        elif seg.isdigit() or seg.startswith("0x"):
+            seg = "{id}"
+        segs.append(seg)
+    return parts.netloc + "/" + "/".join(segs)
+
+
+def _record(key, nbytes=0, seconds=0.0, error=False, retry=False):
+    with _stats_lock:
+        st = _stats.setdefault(key, {"requests": 0, "errors": 0, "retries": 0, "bytes": 0, "seconds": 0.0})
+        if retry:
+            st["retries"] += 1
+            return
+        st["requests"] += 1
+        st["bytes"]    += nbytes
+        st["seconds"]  += seconds
+        if error:
+            st["errors"] += 1
+
+
+def _wire_bytes(resp) -> int:
+    """Bytes pulled over the wire (compressed size when gzip was used)."""
+    content = resp.content
+    try:
+        n = resp.raw.tell()
+        if n:
+            return int(n)
+    except Exception:
+        pass
+    return len(content or b"")
+
+
+def stats() -> dict:
+    """Snapshot of {endpoint: {requests, errors, retries, bytes, seconds}}."""
+    with _stats_lock:
+        return {k: dict(v) for k, v in _stats.items()}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def print_stats(title="HTTP"):
+    snap = stats()
+    if not snap:
+        return
+    total_req   = sum(v["requests"] for v in snap.values())
+    total_bytes = sum(v["bytes"]    for v in snap.values())
+    print(f"[+] {title}: {total_req} request(s), {total_bytes/1024:,.0f} KB on the wire")
+    for key, v in sorted(snap.items(), key=lambda kv: -kv[1]["bytes"]):
+        avg_ms = v["seconds"] / v["requests"] * 1000 if v["requests"] else 0
+        extra  = f" | {v['retries']} retried | {v['errors']} failed" if (v["retries"] or v["errors"]) else ""
+        print(f"    {key}: {v['requests']} req | {v['bytes']/1024:,.0f} KB | avg {avg_ms:.0f}ms{extra}")
+
+
+# --- Requests -----------------------------------------------------------------
+
+def _backoff(attempt, retry_after=None):
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+    if retry_after:
+        try:
+            delay = max(delay, min(float(retry_after), BACKOFF_CAP * 4))
+        except (TypeError, ValueError):
+            pass
+    time.sleep(delay)
+
+
+def _never_sent(exc) -> bool:
+    """True if the request failed while connecting, before any byte of it was sent."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    seen = set()
+    while exc is not None and id(exc) not in seen:   # requests -> MaxRetryError -> reason
+        seen.add(id(exc))
+        if isinstance(exc, ConnectTimeoutError):     # includes NewConnectionError / NameResolutionError
+            return True
+        exc = getattr(exc, "reason", None) or (exc.args[0] if exc.args and isinstance(exc.args[0], BaseException)
+                                               else exc.__cause__)
+    return False
+
+
+def request(method: str, url: str, timeout=None, retries=None, **kwargs) -> requests.Response:
+    """Send one request through the shared session with the module retry policy."""
+    method  = method.upper()
+    key     = endpoint_key(url)
+    retries = MAX_RETRIES if retries is None else retries
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+    session = get_session()
+
+    for attempt in range(retries + 1):
+        last = attempt == retries
+        t0   = time.monotonic()
+        try:
+            resp = session.request(method, url, timeout=timeout, **kwargs)
+        except requests.exceptions.ConnectionError as e:
+            _record(key, seconds=time.monotonic() - t0, error=True)
+            if last or (method not in IDEMPOTENT and not _never_sent(e)):
+                raise
+        except requests.exceptions.Timeout:
+            _record(key, seconds=time.monotonic() - t0, error=True)
+            if last or method not in IDEMPOTENT:
+                raise
+        else:
+            failed = resp.status_code >= 400
+            _record(key, _wire_bytes(resp), time.monotonic() - t0, error=failed)
+            retryable = resp.status_code == 429 or (resp.status_code in RETRY_STATUSES and method in IDEMPOTENT)
+            if last or not retryable:
+                return resp
+            _record(key, retry=True)
+            _backoff(attempt, resp.headers.get("Retry-After"))
+            continue
+        _record(key, retry=True)
+        _backoff(attempt)
+
+
+def get(url: str, params=None, **kwargs) -> requests.Response:
+    return request("GET", url, params=params, **kwargs)
+
+
+def post(url: str, json=None, **kwargs) -> requests.Response:
+    return request("POST", url, json=json, **kwargs)
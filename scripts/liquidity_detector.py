@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+liquidity_detector.py - Streaming liquidity anomaly detector (EWMA mean/variance + peak drawdown)
+Location: ~/.openclaw/workspace/scripts/liquidity_detector.py
+Version: 1.0 | Built: 2026-10-18
+
+Phase 3 used to flag a shock only on a fixed 20% drop versus the previous scan: slow
+drains never fired and naturally noisy markets fired all the time. This detector keeps
+constant state per market, updated once per scan in O(1):
+
+    mean, var   exponentially weighted (EWMA_ALPHA) mean / variance of liquidity
+    peak        highest liquidity seen inside PEAK_WINDOW_HOURS (reset on expiry)
+    n           observations so far
+
+A market is flagged when
+    z = (liq - mean) / sqrt(var) <= -Z_THRESHOLD            ("zscore")     -- fast drop vs its own noise
+    (peak - liq) / peak        >= DRAWDOWN_PCT + DRAWDOWN_NOISE_K * std/mean
+                                                            ("drawdown")   -- slow drain from the peak
+once n >= MIN_OBS, and at any n on the old rule (the fallback, so a plain 20% drop
+between scans still fires on markets whose EWMA noise band is wide)
+    (prev - liq) / prev        >= whale_tracker.LIQUIDITY_SHOCK_PCT ("drop")
+
+State: paper_trading/liquidity_detector.json  {cid: [mean, var, peak, peak_ts, n, last_ts]}
+Markets idle for STATE_MAX_AGE_DAYS are dropped on save.
+
+CLI (inspect state):
+    python scripts/liquidity_detector.py                 # most stressed markets
+    python scripts/liquidity_detector.py <conditionId>   # one market
+"""
+
+import json
+import math
+import os
+import time
+
+STATE_FILE         = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'liquidity_detector.json')
+EWMA_ALPHA         = 0.2     # weight of the newest scan (~5-scan memory)
+Z_THRESHOLD        = 3.0     # flag drops this many EWMA std-devs below the mean
+DRAWDOWN_PCT       = 0.35    # flag liquidity this far below the rolling peak ...
+DRAWDOWN_NOISE_K   = 1.0     # ... widened by K x the market's own coefficient of variation
+PEAK_WINDOW_HOURS  = 72      # peak older than this is reset
+MIN_OBS            = 6       # observations before z-score / drawdown are trusted
+STATE_MAX_AGE_DAYS = 10
+
+MEAN, VAR, PEAK, PEAK_TS, N, LAST_TS = range(6)
+
+
+def load_state() -> dict:
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state):
+    """Atomic compact write; markets without an update for STATE_MAX_AGE_DAYS are dropped."""
+    cutoff = time.time() - STATE_MAX_AGE_DAYS * 86400
+    live   = {cid: st for cid, st in state.items() if st[LAST_TS] >= cutoff}
+    try:
+        tmp = STATE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(live, f, separators=(",", ":"))
+        os.replace(tmp, STATE_FILE)
+    except Exception as e:
+        print(f"  [x] Liquidity detector save failed: {e}")
+
+
+def update(state, cid, liq, prev_liq=None, drop_pct_fallback=0.20, ts=None):
+    """
+    Score `liq` against the market's state, then fold it in. O(1).
+    Returns (shock, reason, z, drawdown); reason is "zscore", "drawdown", "drop" or "".
+    """
+    ts = int(ts if ts is not None else time.time())
+    st = state.get(cid)
+    if st is None or liq <= 0:
+        # no detector state yet (new, or dropped when idle): the drop rule alone still applies
+        dropped = liq > 0 and prev_liq and prev_liq > 0 and (prev_liq - liq) / prev_liq >= drop_pct_fallback
+        if st is None and liq > 0:
+            state[cid] = [liq, 0.0, liq, ts, 1, ts]
+        return (True, "drop", 0.0, 0.0) if dropped else (False, "", 0.0, 0.0)
+
+    std      = math.sqrt(st[VAR])
+    z        = (liq - st[MEAN]) / std if std > 0 else 0.0
+    peak     = st[PEAK] if ts - st[PEAK_TS] <= PEAK_WINDOW_HOURS * 3600 else max(st[MEAN], liq)
+    drawdown = (peak - liq) / peak if peak > 0 else 0.0
+
+    reason = ""
+    if st[N] >= MIN_OBS:
+        if z <= -Z_THRESHOLD:
+            reason = "zscore"
+        elif drawdown >= DRAWDOWN_PCT + DRAWDOWN_NOISE_K * std / st[MEAN]:
+            reason = "drawdown"
+    if not reason and prev_liq and prev_liq > 0 and (prev_liq - liq) / prev_liq >= drop_pct_fallback:
+        reason = "drop"
+
+    diff      = liq - st[MEAN]
+    incr      = EWMA_ALPHA * diff
+    st[MEAN] += incr
+    st[VAR]   = (1 - EWMA_ALPHA) * (st[VAR] + diff * incr)
+    if liq >= peak or ts - st[PEAK_TS] > PEAK_WINDOW_HOURS * 3600:
+        st[PEAK], st[PEAK_TS] = max(peak, liq), ts
+    st[N]      += 1
+    st[LAST_TS] = ts
+    return bool(reason), reason, z, drawdown
+
+
+def describe(cid, st) -> str:
+    std = math.sqrt(st[VAR])
+    dd  = (st[PEAK] - st[MEAN]) / st[PEAK] if st[PEAK] else 0.0
+    return (f"{cid[:14]}  mean ${st[MEAN]:>12,.0f}  std ${std:>10,.0f}  peak ${st[PEAK]:>12,.0f}  "
+            f"mean-vs-peak {dd*100:5.1f}%  n={st[N]}")
+
+
+if __name__ == "__main__":
+    import sys
+    state = load_state()
+    if sys.argv[1:]:
+        for cid in sys.argv[1:]:
+            print(describe(cid, state[cid]) if cid in state else f"{cid}: no detector state")
+    else:
+        print(f"[LIQUIDITY DETECTOR] {len(state):,} markets | alpha={EWMA_ALPHA} z<=-{Z_THRESHOLD} drawdown>={DRAWDOWN_PCT:.0%}")
+        ranked = sorted(state.items(), key=lambda kv: -(kv[1][PEAK] - kv[1][MEAN]) / kv[1][PEAK] if kv[1][PEAK] else 0)
+        for cid, st in ranked[:25]:
+            print("  " + describe(cid, st))
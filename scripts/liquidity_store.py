@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+liquidity_store.py - Memory-mapped per-market liquidity time series (ring buffers)
+Location: ~/.openclaw/workspace/scripts/liquidity_store.py
+Version: 1.0 | Built: 2026-10-18
+
+liquidity_history.json kept only the last {liq, ts} per conditionId, was rewritten
+with indent=2 every scan and never evicted markets that left the universe. This store
+keeps RING_SIZE samples per market in one fixed-layout binary file that is mmap'ed:
+
+    header   <4sHHII   magic "LIQS", version, ring size, slot capacity, reserved
+    slot     <32sHHI   key (conditionId bytes), head, count, last_ts (0 = free slot)
+             + RING_SIZE x <Id   (u32 epoch seconds, f64 liquidity)
+
+    latest(store, cid)         O(1) -- one dict lookup + one 12-byte read
+    window(store, cid, since)  samples in [since, until), oldest first
+    compact(store)             frees slots idle > RETENTION_DAYS; rewrites the file
+                               smaller when most of it is free
+
+Opening reads only the slot headers, so load time and disk stay flat (a few MB for
+thousands of markets). The file grows by doubling when all slots are taken.
+
+Storage: paper_trading/liquidity_store.bin
+Migration: migrate_json() seeds an empty store from the old liquidity_history.json.
+
+CLI:
+    python scripts/liquidity_store.py stats
+    python scripts/liquidity_store.py market <conditionId> [--hours 48]
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+from datetime import datetime
+
+STORE_FILE     = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'liquidity_store.bin')
+RING_SIZE      = 128     # samples kept per market (~10 days at one scan every 2h)
+RETENTION_DAYS = 10      # markets without a sample for this long are evicted
+MIN_CAPACITY   = 256     # slots allocated in a new file
+
+MAGIC     = b"LIQS"
+VERSION   = 1
+HEADER    = struct.Struct("<4sHHII")
+SLOT_HEAD = struct.Struct("<32sHHI")
+SAMPLE    = struct.Struct("<Id")
+
+
+class Store:
+    """Open store: file handle, mmap and the key -> slot index. Use the module functions."""
+    def __init__(self, path, fh, mm, ring, capacity):
+        self.path, self.fh, self.mm = path, fh, mm
+        self.ring, self.capacity    = ring, capacity
+        self.slot_size = SLOT_HEAD.size + ring * SAMPLE.size
+        self.index     = {}   # key -> slot number
+        self.free      = []   # empty slot numbers
+
+    def slot_offset(self, slot):
+        return HEADER.size + slot * self.slot_size
+
+
+def _key(cid) -> bytes:
+    h = str(cid)[2:] if str(cid).startswith("0x") else str(cid)
+    if len(h) == 64:
+        try:
+            return bytes.fromhex(h)
+        except ValueError:
+            pass
+    return hashlib.sha256(str(cid).encode()).digest()
+
+
+def _create(path, ring, capacity):
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, ring, capacity, 0))
+        f.truncate(HEADER.size + capacity * (SLOT_HEAD.size + ring * SAMPLE.size))
+
+
+def open_store(path=STORE_FILE, ring=RING_SIZE) -> Store:
+    """Open (and create if needed) the store. Reads only slot headers."""
+    if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+        _create(path, ring, MIN_CAPACITY)
+    fh = open(path, "r+b")
+    mm = mmap.mmap(fh.fileno(), 0)
+    magic, version, ring, capacity, _ = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != VERSION:
+        mm.close(); fh.close()
+        raise ValueError(f"{path}: not a liquidity store (magic={magic!r} version={version})")
+    store = Store(path, fh, mm, ring, capacity)
+    for slot in range(capacity):
+        key, _, _, last_ts = SLOT_HEAD.unpack_from(mm, store.slot_offset(slot))
+        if not last_ts:  # a used slot always has a sample, so last_ts > 0
+            store.free.append(slot)
+        else:
+            store.index[key] = slot
+    store.free.reverse()  # pop() hands out low slots first
+    return store
+
+
+def close_store(store):
+    store.mm.flush()
+    store.mm.close()
+    store.fh.close()
+
+
+def _grow(store):
+    """Double the slot capacity (new slots are zeroed = empty)."""
+    new_cap = max(MIN_CAPACITY, store.capacity * 2)
+    store.mm.flush(); store.mm.close()
+    store.fh.truncate(HEADER.size + new_cap * store.slot_size)
+    store.mm = mmap.mmap(store.fh.fileno(), 0)
+    HEADER.pack_into(store.mm, 0, MAGIC, VERSION, store.ring, new_cap, 0)
+    store.free = list(range(new_cap - 1, store.capacity - 1, -1)) + store.free
+    store.capacity = new_cap
+
+
+def append(store, cid, liq, ts=None):
+    """Add one sample to the market's ring (allocating a slot for a new market)."""
+    key  = _key(cid)
+    ts   = max(1, int(ts if ts is not None else time.time()))
+    slot = store.index.get(key)
+    if slot is None:
+        if not store.free:
+            _grow(store)
+        slot = store.free.pop()
+        store.index[key] = slot
+        SLOT_HEAD.pack_into(store.mm, store.slot_offset(slot), key, 0, 0, 0)
+    off = store.slot_offset(slot)
+    _, head, count, _ = SLOT_HEAD.unpack_from(store.mm, off)
+    SAMPLE.pack_into(store.mm, off + SLOT_HEAD.size + head * SAMPLE.size, ts, float(liq))
+    SLOT_HEAD.pack_into(store.mm, off, key, (head + 1) % store.ring, min(count + 1, store.ring), ts)
+
+
+def append_samples(store, samples) -> int:
+    """Append [(cid, liq, ts), ...]. Returns the number written."""
+    n = 0
+    for cid, liq, ts in samples:
+        append(store, cid, liq, ts); n += 1
+    store.mm.flush()
+    return n
+
+
+def latest(store, cid):
+    """(ts, liq) of the newest sample, or None. O(1)."""
+    slot = store.index.get(_key(cid))
+    if slot is None:
+        return None
+    off = store.slot_offset(slot)
+    _, head, count, _ = SLOT_HEAD.unpack_from(store.mm, off)
+    if not count:
+        return None
+    return SAMPLE.unpack_from(store.mm, off + SLOT_HEAD.size + ((head - 1) % store.ring) * SAMPLE.size)
+
+
+def window(store, cid, since=None, until=None) -> list:
+    """[(ts, liq), ...] oldest first, restricted to since <= ts < until."""
+    slot = store.index.get(_key(cid))
+    if slot is None:
+        return []
+    off = store.slot_offset(slot)
+    _, head, count, _ = SLOT_HEAD.unpack_from(store.mm, off)
+    out = []
+    for i in range(count):
+        pos    = (head - count + i) % store.ring
+        ts, lq = SAMPLE.unpack_from(store.mm, off + SLOT_HEAD.size + pos * SAMPLE.size)
+        if (since is None or ts >= since) and (until is None or ts < until):
+            out.append((ts, lq))
+    return out
+
+
+def markets(store) -> list:
+    """conditionIds held in the store (ids that were not 32-byte hex come back hashed)."""
+    return ["0x" + key.hex() for key in store.index]
+
+
+def compact(store, max_age_days=RETENTION_DAYS) -> int:
+    """
+    Evict markets whose newest sample is older than max_age_days. When fewer than a
+    quarter of the slots stay in use the file is rewritten packed (atomic replace).
+    Returns the number of markets evicted.
+    """
+    cutoff  = time.time() - max_age_days * 86400
+    evicted = 0
+    for key, slot in list(store.index.items()):
+        off = store.slot_offset(slot)
+        if SLOT_HEAD.unpack_from(store.mm, off)[3] < cutoff:
+            store.mm[off:off + store.slot_size] = bytes(store.slot_size)
+            del store.index[key]
+            store.free.append(slot)
+            evicted += 1
+    if store.capacity > MIN_CAPACITY and len(store.index) < store.capacity // 4:
+        _rewrite_packed(store)
+    store.mm.flush()
+    return evicted
+
+
+def _rewrite_packed(store):
+    new_cap = max(MIN_CAPACITY, 2 * len(store.index))
+    tmp     = store.path + ".tmp"
+    _create(tmp, store.ring, new_cap)
+    with open(tmp, "r+b") as f:
+        for i, slot in enumerate(sorted(store.index.values())):
+            off = store.slot_offset(slot)
+            f.seek(HEADER.size + i * store.slot_size)
+            f.write(store.mm[off:off + store.slot_size])
+    store.mm.close(); store.fh.close()
+    os.replace(tmp, store.path)
+    fresh = open_store(store.path, store.ring)
+    store.__dict__.update(fresh.__dict__)
+
+
+def store_stats(store) -> dict:
+    samples = sum(SLOT_HEAD.unpack_from(store.mm, store.slot_offset(s))[2] for s in store.index.values())
+    return {"markets": len(store.index), "capacity": store.capacity, "samples": samples,
+            "ring": store.ring, "bytes": os.path.getsize(store.path)}
+
+
+def migrate_json(store, path) -> int:
+    """Seed the store from the old liquidity_history.json ({cid: {"liq", "ts"}}). Returns markets added."""
+    try:
+        with open(path) as f:
+            history = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return 0
+    n = 0
+    for cid, snap in history.items():
+        try:
+            ts = datetime.fromisoformat(snap["ts"]).timestamp()
+            append(store, cid, float(snap.get("liq", 0)), ts)
+            n += 1
+        except Exception:
+            continue
+    store.mm.flush()
+    return n
+
+
+# --- CLI ----------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import argparse
+    from datetime import timezone
+    parser = argparse.ArgumentParser(description="Liquidity time-series store")
+    parser.add_argument("command", choices=["stats", "market"])
+    parser.add_argument("cid",     nargs="?", default=None)
+    parser.add_argument("--hours", type=float, default=48.0)
+    args = parser.parse_args()
+
+    store = open_store()
+    if args.command == "stats":
+        st = store_stats(store)
+        print(f"[LIQUIDITY STORE] {st['markets']:,} markets / {st['capacity']:,} slots | {st['samples']:,} samples "
+              f"(ring {st['ring']}) | {st['bytes']/1024:,.0f} KB")
+    else:
+        if not args.cid:
+            parser.error("market needs a conditionId")
+        for ts, lq in window(store, args.cid, since=time.time() - args.hours * 3600):
+            print(f"  {datetime.fromtimestamp(ts, timezone.utc).strftime('%m-%d %H:%M')}  ${lq:>14,.2f}")
+    close_store(store)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+market_index.py - Persistent id index: conditionId <-> Gamma id <-> slug <-> CLOB token ids
+Location: ~/.openclaw/workspace/scripts/market_index.py
+Version: 1.0 | Built: 2026-10-18
+
+Positions, signals and reports carry market ids in different forms (hex conditionId
+from the tracker, numeric Gamma id from manual trades, slugs, CLOB token ids). This
+index maps every form to the market's conditionId, so any of them can be priced with
+one targeted Gamma query (see price_oracle.py) instead of scanning listings.
+
+Filled as a side effect of whale_tracker listing scans (index_markets) and of every
+oracle fetch. resolve() refreshes lazily: an unknown id costs one targeted request.
+
+Storage: paper_trading/market_index.json
+    {"markets": {conditionId: {"id": "613835", "slug": "...", "tokens": ["...", "..."], "seen": epoch}}}
+Entries not seen for INDEX_MAX_AGE_DAYS are dropped on save.
+"""
+
+import json
+import os
+import threading
+import time
+
+import http_client
+
+INDEX_FILE         = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'market_index.json')
+INDEX_MAX_AGE_DAYS = 60
+GAMMA_API          = "https://gamma-api.polymarket.com"
+
+# id form -> Gamma /markets multi-value query parameter
+GAMMA_PARAM = {"condition_id": "condition_ids", "id": "id", "slug": "slug", "token": "clob_token_ids"}
+
+_records = None    # conditionId -> record
+_alias   = {}      # any id form -> conditionId
+_dirty   = False
+_lock    = threading.RLock()
+
+
+def norm(any_id) -> str:
+    s = str(any_id).strip()
+    return s.lower() if s.startswith("0x") else s
+
+
+def id_kind(any_id) -> str:
+    """condition_id (0x...), id (short numeric), token (long numeric CLOB token id) or slug."""
+    s = norm(any_id)
+    if s.startswith("0x"):
+        return "condition_id"
+    if s.isdigit():
+        return "id" if len(s) <= 12 else "token"
+    return "slug"
+
+
+def _tokens(market) -> list:
+    raw = market.get("clobTokenIds") or []
+    try:
+        toks = json.loads(raw) if isinstance(raw, str) else raw
+        return [str(t) for t in toks or []]
+    except Exception:
+        return []
+
+
+def market_keys(market) -> dict:
+    """{id form: value} for one Gamma market payload."""
+    keys = {"condition_id": norm(market.get("conditionId") or market.get("condition_id") or "")}
+    if market.get("id") not in (None, ""):
+        keys["id"] = str(market["id"])
+    if market.get("slug"):
+        keys["slug"] = market["slug"]
+    toks = _tokens(market)
+    if toks:
+        keys["token"] = toks
+    return keys
+
+
+def _load():
+    global _records
+    if _records is None:
+        _records = {}
+        if os.path.exists(INDEX_FILE):
+            try:
+                with open(INDEX_FILE) as f:
+                    _records = json.load(f).get("markets", {})
+            except Exception:
+                _records = {}
+        for cid, rec in _records.items():
+            _link(cid, rec)
+    return _records
+
+
+def _link(cid, rec):
+    _alias[cid] = cid
+    if rec.get("id"):
+        _alias[rec["id"]] = cid
+    if rec.get("slug"):
+        _alias[rec["slug"]] = cid
+    for t in rec.get("tokens", []):
+        _alias[t] = cid
+
+
+def index_markets(markets) -> int:
+    """Add/refresh Gamma market payloads. Returns the number of conditionIds not indexed before."""
+    global _dirty
+    now, added = int(time.time()), 0
+    with _lock:
+        records = _load()
+        for m in markets:
+            keys = market_keys(m)
+            cid  = keys["condition_id"]
+            if not cid.startswith("0x"):
+                continue
+            rec = {"id": keys.get("id", ""), "slug": keys.get("slug", ""), "tokens": keys.get("token", []), "seen": now}
+            if cid not in records:
+                added += 1
+            records[cid] = rec
+            _link(cid, rec)
+            _dirty = True
+    return added
+
+
+def condition_id(any_id):
+    """conditionId for any id form, from the index only (None if unknown)."""
+    with _lock:
+        _load()
+        return _alias.get(norm(any_id))
+
+
+def get(any_id):
+    """{"condition_id", "id", "slug", "tokens"} for any id form, from the index only."""
+    with _lock:
+        cid = condition_id(any_id)
+        rec = _records.get(cid) if cid else None
+        return dict(rec, condition_id=cid) if rec else None
+
+
+def resolve(any_id):
+    """get(), refreshing the index with one targeted Gamma query on a miss."""
+    rec = get(any_id)
+    if rec:
+        return rec
+    kind = id_kind(any_id)
+    try:
+        r = http_client.get(f"{GAMMA_API}/markets", params={GAMMA_PARAM[kind]: norm(any_id)}, timeout=10)
+        r.raise_for_status()
+        data = r.json()
+        index_markets(data if isinstance(data, list) else [data])
+    except Exception as e:
+        print(f"  [WARN] Market index refresh failed for {any_id}: {e}")
+        return None
+    save()
+    return get(any_id)
+
+
+def size() -> int:
+    with _lock:
+        return len(_load())
+
+
+def save():
+    """Persist (atomic write) if anything changed; drops entries idle for INDEX_MAX_AGE_DAYS."""
+    global _dirty
+    with _lock:
+        if not _dirty or _records is None:
+            return
+        cutoff = time.time() - INDEX_MAX_AGE_DAYS * 86400
+        for cid in [c for c, rec in _records.items() if rec.get("seen", 0) < cutoff]:
+            del _records[cid]
+        _alias.clear()
+        for cid, rec in _records.items():
+            _link(cid, rec)
+        tmp = INDEX_FILE + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"markets": _records}, f)
+            os.replace(tmp, INDEX_FILE)
+            _dirty = False
+        except Exception as e:
+            print(f"  [x] Market index save failed: {e}")
+
+
+if __name__ == "__main__":
+    import sys
+    for q in sys.argv[1:]:
+        print(q, "->", resolve(q))
+    if not sys.argv[1:]:
+        print(f"[MARKET INDEX] {size():,} markets -> {INDEX_FILE}")
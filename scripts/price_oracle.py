@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+price_oracle.py - Batched multi-market price lookups with a short TTL cache
+Location: ~/.openclaw/workspace/scripts/price_oracle.py
+Version: 1.0 | Built: 2026-10-18
+
+Open positions used to be priced with one Gamma call per position in paper_engine
+(status), paper_signal_bridge (portfolio value) and daily_monitor (paper + Oscar
+reports) -- and paper_engine scanned 1,000 listed markets to find one hex id.
+This module resolves a whole list of (market_id, side) pairs with the fewest requests:
+
+    hex conditionIds -> GET /markets?condition_ids=a&condition_ids=b...   (chunks of BATCH_SIZE)
+    numeric ids      -> GET /markets?id=1&id=2...                          (chunks of BATCH_SIZE)
+    slugs / tokens   -> GET /markets?slug=... / ?clob_token_ids=...
+
+Ids already in the market index (market_index.py) are looked up by conditionId, so
+every id form of one market shares a cache entry; each fetch feeds the index.
+
+Market payloads are cached for CACHE_TTL seconds (misses too, so a dead id is not
+re-queried inside the window). Concurrent callers asking for an id that is already
+being fetched wait for that request instead of sending their own (coalescing).
+
+Usage:
+    import price_oracle
+    prices = price_oracle.get_prices([(pos["market_id"], pos["side"]) for pos in open_pos])
+    prices[(market_id, "YES")] -> float or None
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+import http_client
+import market_index
+
+GAMMA_API  = "https://gamma-api.polymarket.com"
+CACHE_TTL  = 30      # seconds a fetched market payload stays fresh
+BATCH_SIZE = 50      # ids per Gamma query (keeps the query string well under URL limits)
+
+_cache    = {}       # _key(market_id) -> (fetched_at, market dict or None)
+_inflight = {}       # _key(market_id) -> Future resolving to market dict or None
+_lock     = threading.Lock()
+
+
+def _key(market_id) -> str:
+    """Cache key: the conditionId when the index knows it, else the normalised id as given."""
+    return market_index.condition_id(market_id) or market_index.norm(market_id)
+
+
+def _query(kind, ids, **extra) -> dict:
+    """GET /markets for ids of one id form. Returns {id: market} for the ids in the response."""
+    r = http_client.get(f"{GAMMA_API}/markets", params={market_index.GAMMA_PARAM[kind]: ids, "limit": len(ids), **extra},
+                        timeout=15)
+    r.raise_for_status()
+    data  = r.json()
+    found = {}
+    for m in data if isinstance(data, list) else []:
+        value = market_index.market_keys(m).get(kind)
+        for key in (value if isinstance(value, list) else [value]):
+            if key in ids:
+                found[key] = m
+    return found
+
+
+def _fetch_chunk(kind, ids) -> dict:
+    """One Gamma query for up to BATCH_SIZE ids of one id form (+ a closed-market fallback). Returns {id: market}."""
+    found   = _query(kind, ids)
+    missing = [k for k in ids if k not in found]
+    if missing and kind == "id":
+        # the batched listing can leave out closed markets; /markets/{id} still serves them
+        for mid in missing:
+            try:
+                r = http_client.get(f"{GAMMA_API}/markets/{mid}", timeout=10)
+                if r.status_code == 200:
+                    found[mid] = r.json()
+            except Exception:
+                pass
+    elif missing:
+        # other id forms: one more batched query for the leftovers, asking for closed markets
+        try:
+            found.update(_query(kind, missing, closed="true"))
+        except Exception:
+            pass
+    return found
+
+
+def get_markets(market_ids) -> dict:
+    """
+    {market_id: Gamma market dict or None} for any mix of id forms (conditionId, numeric id, slug, token id).
+    Keys are the ids as passed in. Fresh cache hits cost nothing; the rest are fetched
+    in batched queries, each id at most once across concurrent callers.
+    """
+    wanted  = {mid: _key(mid) for mid in market_ids}
+    now     = time.monotonic()
+    result  = {}
+    waiting = {}
+    claimed = []
+    with _lock:
+        for key in set(wanted.values()):
+            hit = _cache.get(key)
+            if hit and now - hit[0] < CACHE_TTL:
+                result[key] = hit[1]
+            elif key in _inflight:
+                waiting[key] = _inflight[key]
+            else:
+                _inflight[key] = Future()
+                claimed.append(key)
+
+    if claimed:
+        by_kind = {}
+        for key in claimed:
+            by_kind.setdefault(market_index.id_kind(key), []).append(key)
+        for kind, ids in by_kind.items():
+            for i in range(0, len(ids), BATCH_SIZE):
+                chunk = ids[i:i + BATCH_SIZE]
+                try:
+                    found, ok = _fetch_chunk(kind, chunk), True
+                except Exception as e:
+                    print(f"  [WARN] Price oracle: {kind} batch of {len(chunk)} failed: {e}")
+                    found, ok = {}, False
+                fetched_at = time.monotonic()
+                market_index.index_markets(found.values())
+                with _lock:
+                    for key in chunk:
+                        market = found.get(key)
+                        if ok:  # failed batches are not cached, the next call retries them
+                            _cache[key] = (fetched_at, market)
+                        _inflight.pop(key).set_result(market)
+                        result[key] = market
+
+        market_index.save()
+
+    for key, fut in waiting.items():
+        result[key] = fut.result()
+    return {mid: result.get(key) for mid, key in wanted.items()}
+
+
+def outcome_price(market, side="YES"):
+    """Price of `side` from a Gamma market payload (YES = index 0 fallback, then lastTradePrice)."""
+    if not market:
+        return None
+    try:
+        outcomes_raw = market.get("outcomes", [])
+        prices_raw   = market.get("outcomePrices", [])
+        outcomes = json.loads(outcomes_raw) if isinstance(outcomes_raw, str) else outcomes_raw
+        prices   = json.loads(prices_raw)   if isinstance(prices_raw,   str) else prices_raw
+        if outcomes and prices:
+            for i, outcome in enumerate(outcomes):
+                if outcome.strip().upper() == side.upper():
+                    return float(prices[i])
+            return float(prices[0])
+        ltp = market.get("lastTradePrice")
+        if ltp is not None:
+            return float(ltp)
+    except Exception:
+        pass
+    return None
+
+
+def get_prices(pairs) -> dict:
+    """{(market_id, side): price or None} for a list of (market_id, side) pairs, batched."""
+    pairs   = list(pairs)
+    markets = get_markets([mid for mid, _ in pairs])
+    return {(mid, side): outcome_price(markets.get(mid), side) for mid, side in pairs}
+
+
+def get_price(market_id, side="YES"):
+    """Single lookup (still served from the shared cache / batches)."""
+    return get_prices([(market_id, side)])[(market_id, side)]
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+scan_scheduler.py - Per-market adaptive scan schedule with a request budget
+Location: ~/.openclaw/workspace/scripts/scan_scheduler.py
+Version: 1.0 | Built: 2026-10-18
+
+Cron ran whale_tracker.py every 2 hours over the whole filtered universe, so a market
+about to resolve with a whale in it waited as long as one nobody had traded for a week.
+This module gives every market its own next-scan time, and whale_tracker --scheduled
+drains the markets that are due, most overdue first, within a per-minute request budget:
+
+    interval  STAGE_INTERVAL_MIN[stage]            Stage 1 TACTICAL most often
+              x HOT_FACTOR                         >= HOT_TRADES new trades last fetch
+              x IDLE_BACKOFF ** idle               consecutive fetches with no new trades
+              / (1 + surge score)                  listing surge score (whale_tracker)
+              capped at SHOCK_INTERVAL_MIN         recent liquidity shock
+              capped at EXPOSURE_INTERVAL_MIN      open paper position in the market
+              clamped to [MIN_INTERVAL_MIN, MAX_INTERVAL_MIN]
+
+    budget    token bucket: REQUESTS_PER_MINUTE refill, BURST_MINUTES cap. Every request a
+              tick really made (listing, evals, /trades pages) is spent, so overruns are
+              paid back by later ticks.
+
+The default rate matches the old sweep (~500 /trades + listing per 2h), so total request
+cost stays the same. Hot markets come round in minutes, dead ones once or twice a day.
+
+State: paper_trading/scan_schedule.json
+    {"tokens", "tokens_ts", "backlog", "markets": {cid: [next_ts, last_ts, idle, shock_until]}}
+
+CLI (inspect the queue):
+    python scripts/scan_scheduler.py
+"""
+
+import heapq
+import json
+import os
+import time
+
+import market_index
+
+SCHEDULE_FILE         = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'scan_schedule.json')
+LEDGER_FILE           = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'ledger.json')
+REQUESTS_PER_MINUTE   = 4.5    # ~ old 2h sweep: 500 /trades + listing pages per 120 min
+BURST_MINUTES         = 30     # token bucket cap (also the budget of the first tick)
+STAGE_INTERVAL_MIN    = {1: 20, 2: 60, 3: 120, 4: 240}   # stage -> base minutes (4 = EXTREME / Open Horizon)
+HOT_TRADES            = 25     # new trades in one fetch that make a market hot
+HOT_FACTOR            = 0.25
+IDLE_BACKOFF          = 2.0    # interval multiplier per consecutive empty fetch
+SHOCK_INTERVAL_MIN    = 5
+SHOCK_HOLD_MIN        = 60     # a shock keeps the market on SHOCK_INTERVAL_MIN this long
+EXPOSURE_INTERVAL_MIN = 10
+MIN_INTERVAL_MIN      = 5
+MAX_INTERVAL_MIN      = 720    # dead markets: twice a day
+
+NEXT_TS, LAST_TS, IDLE, SHOCK_UNTIL = range(4)
+
+
+def load_schedule() -> dict:
+    try:
+        with open(SCHEDULE_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"tokens": REQUESTS_PER_MINUTE * BURST_MINUTES, "tokens_ts": time.time(), "markets": {}}
+
+
+def save_schedule(schedule):
+    try:
+        tmp = SCHEDULE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(schedule, f, separators=(",", ":"))
+        os.replace(tmp, SCHEDULE_FILE)
+    except Exception as e:
+        print(f"  [x] Scan schedule save failed: {e}")
+
+
+def open_exposure() -> set:
+    """
+    conditionIds with an open paper position (empty if there is no ledger). Ledger ids
+    come in any form (conditionId, Gamma id, slug) and are mapped through the market
+    index, which the listing scan fills for every market that can be scheduled.
+    """
+    try:
+        with open(LEDGER_FILE) as f:
+            ledger = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return set()
+    ids = {str(p.get("market_id") or "") for p in ledger.get("open_positions", [])} - {""}
+    return {market_index.condition_id(mid) or market_index.norm(mid) for mid in ids}
+
+
+# --- Request budget -------------------------------------------------------------
+
+def refill(schedule, now_ts) -> float:
+    """Add REQUESTS_PER_MINUTE tokens per elapsed minute (capped). Returns the balance."""
+    elapsed = max(0.0, now_ts - schedule.get("tokens_ts", now_ts))
+    cap     = REQUESTS_PER_MINUTE * BURST_MINUTES
+    schedule["tokens"]    = min(cap, schedule.get("tokens", cap) + elapsed / 60 * REQUESTS_PER_MINUTE)
+    schedule["tokens_ts"] = now_ts
+    return schedule["tokens"]
+
+
+def spend(schedule, requests):
+    """Charge the requests a tick made; the balance may go negative (paid back by refills)."""
+    schedule["tokens"] = schedule.get("tokens", 0.0) - requests
+
+
+# --- Queue ----------------------------------------------------------------------
+
+def take_due(schedule, cids, now_ts, budget, priority=None) -> list:
+    """
+    Up to `budget` of `cids` whose next scan time has passed, most overdue first (ties:
+    higher `priority` score first). Markets never scheduled are due at once. Entries for
+    markets no longer in `cids` are dropped.
+    """
+    entries = schedule.setdefault("markets", {})
+    live    = set(cids)
+    for cid in [c for c in entries if c not in live]:
+        del entries[cid]
+    priority = priority or {}
+    heap = [(entries[cid][NEXT_TS] if cid in entries else 0, -priority.get(cid, 0), cid) for cid in live]
+    heapq.heapify(heap)
+    due = []
+    while heap and len(due) < budget and heap[0][0] <= now_ts:
+        due.append(heapq.heappop(heap)[2])
+    schedule["backlog"] = sum(1 for next_ts, _, _ in heap if next_ts <= now_ts)
+    return due
+
+
+def note_shock(schedule, cid, now_ts):
+    """A liquidity shock makes the market due now and keeps it on the shock interval."""
+    st = schedule.setdefault("markets", {}).setdefault(cid, [0, 0, 0, 0])
+    st[NEXT_TS]     = min(st[NEXT_TS], now_ts)
+    st[SHOCK_UNTIL] = now_ts + SHOCK_HOLD_MIN * 60
+
+
+def interval_minutes(stage, new_trades, idle, shock, exposed, surge=0.0) -> float:
+    minutes = STAGE_INTERVAL_MIN.get(stage, STAGE_INTERVAL_MIN[4])
+    if new_trades >= HOT_TRADES:
+        minutes *= HOT_FACTOR
+    elif not new_trades:
+        minutes *= IDLE_BACKOFF ** idle
+    minutes /= 1 + max(surge, 0.0)
+    if shock:
+        minutes = min(minutes, SHOCK_INTERVAL_MIN)
+    if exposed:
+        minutes = min(minutes, EXPOSURE_INTERVAL_MIN)
+    return max(MIN_INTERVAL_MIN, min(MAX_INTERVAL_MIN, minutes))
+
+
+def reschedule(schedule, cid, now_ts, stage, new_trades, exposed=False, surge=0.0) -> float:
+    """Set the market's next scan time after a fetch. Returns the interval in minutes."""
+    st = schedule.setdefault("markets", {}).setdefault(cid, [0, 0, 0, 0])
+    st[IDLE]    = 0 if new_trades else min(st[IDLE] + 1, 10)
+    minutes     = interval_minutes(stage, new_trades, st[IDLE], now_ts < st[SHOCK_UNTIL], exposed, surge)
+    st[NEXT_TS] = now_ts + minutes * 60
+    st[LAST_TS] = now_ts
+    return minutes
+
+
+if __name__ == "__main__":
+    schedule = load_schedule()
+    entries  = schedule.get("markets", {})
+    now      = time.time()
+    due      = sum(1 for st in entries.values() if st[NEXT_TS] <= now)
+    print(f"[SCAN SCHEDULE] {len(entries):,} markets | {due} due now | tokens {schedule.get('tokens', 0):.1f} "
+          f"(+{REQUESTS_PER_MINUTE}/min, cap {REQUESTS_PER_MINUTE * BURST_MINUTES:.0f})")
+    for cid, st in sorted(entries.items(), key=lambda kv: kv[1][NEXT_TS])[:25]:
+        every = (st[NEXT_TS] - st[LAST_TS]) / 60 if st[LAST_TS] else 0
+        print(f"  {cid[:14]}  in {(st[NEXT_TS] - now) / 60:>7.1f} min  every {every:>5.0f} min  "
+              f"idle={st[IDLE]}{'  SHOCK' if st[SHOCK_UNTIL] > now else ''}")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+signal_engine.py - Vectorized whale signal engine (NumPy)
+Location: ~/.openclaw/workspace/scripts/signal_engine.py
+Version: 1.0 | Built: 2026-10-18
+
+find_whale_trades() + calculate_signal() walk trades one dict at a time. This module
+loads ALL trades of a scan into NumPy columns once and applies the same rules as
+array operations:
+
+    size threshold    usd >= whale_min[market]                (per-market broadcast)
+    impact ratio      usd / max(liquidity, 1) >= min_impact
+    manip guard       usd > 0.5 * liquidity  -> skipped (logged, same message)
+    whale prob        price, or 1 - price on NO-side buys     (direction-adjusted)
+    divergence        |whale_prob - market_prob[market]|
+    tier              1 if div >= t1, 2 if div >= 0.65 * t1, else 0
+
+Per-market inputs (liquidity, whale_min, t1, market_prob, is_sports) come from
+whale_tracker's scalar helpers and are broadcast through the market-index column.
+Outputs are the same whale dicts find_whale_trades() builds, in the same order, with
+the calculate_signal() fields attached under "_signal". Rounding of reported values is
+done with Python round() on the (few) hit rows so results match the scalar path exactly.
+
+Used by: whale_tracker.py --batch-signals (and offline backtests over the trade tape).
+"""
+
+import time
+
+import numpy as np
+
+
+def _to_float_array(values) -> np.ndarray:
+    """float64 column; entries that float() would reject become NaN (the scalar path skips them)."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        out = np.empty(len(values), dtype=np.float64)
+        for i, v in enumerate(values):
+            try:
+                out[i] = float(v)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+        return out
+
+
+def build_trade_columns(market_trades) -> dict:
+    """
+    Flatten [[trade, ...] per market] into columns:
+      usd, price, is_no, ts (float64 / bool), market (int32 market index), row (index in its market)
+    plus "trades" -- the flat list of source dicts, aligned with the columns.
+    """
+    flat, market_idx, row_idx = [], [], []
+    for mi, trades in enumerate(market_trades):
+        flat.extend(trades)
+        market_idx.extend([mi] * len(trades))
+        row_idx.extend(range(len(trades)))
+    return {
+        "trades": flat,
+        "usd":    _to_float_array([t.get("usdcSize") or t.get("size", 0) or 0 for t in flat]),
+        "price":  _to_float_array([t.get("price", 0.5) for t in flat]),
+        "is_no":  np.fromiter((t.get("outcome", "Yes") == "No" for t in flat), dtype=bool, count=len(flat)),
+        "ts":     _to_float_array([t.get("timestamp", 0) or 0 for t in flat]),
+        "market": np.asarray(market_idx, dtype=np.int32),
+        "row":    np.asarray(row_idx,    dtype=np.int32),
+    }
+
+
+def detect_whales_batch(market_trades, market_meta, min_impact, verbose=True) -> list:
+    """
+    market_trades: list (one entry per market) of Data API trade lists
+    market_meta:   list of dicts aligned with market_trades, keys:
+                   liquidity, whale_min, t1, market_prob, is_sports
+    Returns a list aligned with market_trades; each entry is the whale list
+    find_whale_trades() would return, every whale carrying "_signal".
+    """
+    t0   = time.monotonic()
+    cols = build_trade_columns(market_trades)
+    out  = [[] for _ in market_trades]
+    if not cols["trades"]:
+        return out
+
+    liq_m   = np.maximum(np.asarray([m["liquidity"]   for m in market_meta], dtype=np.float64), 1.0)
+    thr_m   = np.asarray([m["whale_min"]   for m in market_meta], dtype=np.float64)
+    t1_m    = np.asarray([m["t1"]          for m in market_meta], dtype=np.float64)
+    mprob_m = np.asarray([m["market_prob"] for m in market_meta], dtype=np.float64)
+
+    mi     = cols["market"]
+    usd    = cols["usd"]
+    liq    = liq_m[mi]
+    with np.errstate(invalid="ignore"):
+        impact = usd / liq
+        size_ok = usd >= thr_m[mi]                      # NaN compares False -> skipped like the scalar except
+        cand    = size_ok & (impact >= min_impact)
+        manip   = cand & (usd > liq * 0.5)
+        hit     = cand & ~manip & ~np.isnan(cols["price"])
+
+    if verbose:
+        for i in np.flatnonzero(manip):
+            print(f"  [!] Manipulation guard: ${usd[i]:,.0f} vs ${liq[i]:,.0f} liq ({impact[i]*100:.1f}%) -- skip")
+
+    idx = np.flatnonzero(hit)
+    # reported price is rounded to 4dp first (scalar path feeds the rounded price to calculate_signal)
+    price4     = np.asarray([round(float(cols["trades"][i].get("price", 0.5)), 4) for i in idx], dtype=np.float64)
+    whale_prob = np.where(cols["is_no"][idx], 1.0 - price4, price4)
+    hit_m      = mi[idx]
+    divergence = np.abs(whale_prob - mprob_m[hit_m])
+    t1         = t1_m[hit_m]
+    t2         = t1 * 0.65
+    tier       = np.where(divergence >= t1, 1, np.where(divergence >= t2, 2, 0))
+
+    for k, i in enumerate(idx):
+        trade = cols["trades"][i]
+        m     = int(hit_m[k])
+        try:
+            whale = {
+                "wallet":       trade.get("proxyWallet","unknown"),
+                "direction":    trade.get("side","BUY").upper(),
+                "size_usd":     round(float(usd[i]), 2),
+                "price":        float(price4[k]),
+                "outcome":      trade.get("outcome","Yes"),
+                "impact_ratio": round(float(impact[i]), 5),
+            }
+        except Exception:
+            continue
+        whale["_signal"] = {
+            "tier":         int(tier[k]),
+            "divergence":   round(float(divergence[k]), 4),
+            "whale_prob":   round(float(whale_prob[k]), 4),
+            "market_prob":  round(float(mprob_m[m]), 4),
+            "threshold_t1": round(float(t1[k]), 4),
+            "threshold_t2": round(float(t2[k]), 4),
+            "impact_ratio": whale["impact_ratio"],
+            "is_sports":    market_meta[m]["is_sports"],
+        }
+        out[m].append(whale)
+
+    if verbose:
+        print(f"[+] Batch signal engine: {len(cols['trades'])} trades x {len(market_trades)} markets "
+              f"-> {len(idx)} whale rows in {(time.monotonic()-t0)*1000:.1f}ms")
+    return out
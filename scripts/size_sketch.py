@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+size_sketch.py - Per-market streaming trade-size quantiles (P-square sketches)
+Location: ~/.openclaw/workspace/scripts/size_sketch.py
+Version: 1.0 | Built: 2026-10-18
+
+get_whale_min_for_days() uses one fixed dollar cutoff per horizon bucket, so thin
+markets flood with "whales" and deep markets never clear the bar on size alone. This
+module keeps one P-square sketch (Jain & Chlamtac, 1985) of trade USD size per
+market, estimating QUANTILE (p99) in constant memory: 5 marker heights + 5 marker
+positions, updated in O(1) per trade from trades the scan already fetched.
+
+    whale min   max(static floor, p99 of the market's recent trades)
+                once the sketch has MIN_OBS trades (the floor alone before that)
+
+Recency: once a sketch has seen HALVE_AT trades its marker positions are halved. The
+marker heights are kept, and new trades then move them twice as fast. This is a cheap
+exponential forgetting, so the estimate follows the market's current flow.
+
+Storage: paper_trading/size_sketch.bin (rewritten atomically each scan)
+    header   <4sHHd      magic "P2SK", version, reserved, quantile
+    record   <32sII5I5d  conditionId bytes, last_ts, count, positions, heights  (100 B)
+Markets without a trade for STATE_MAX_AGE_DAYS are dropped on save.
+
+CLI:
+    python scripts/size_sketch.py                  # summary + widest p99 markets
+    python scripts/size_sketch.py <conditionId>    # one market
+"""
+
+import os
+import struct
+import time
+
+STATE_FILE         = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'size_sketch.bin')
+QUANTILE           = 0.99
+MIN_OBS            = 200     # trades before the p99 is trusted
+HALVE_AT           = 4000    # marker positions halved past this count (recency)
+STATE_MAX_AGE_DAYS = 30
+
+MAGIC   = b"P2SK"
+VERSION = 1
+HEADER  = struct.Struct("<4sHHd")
+RECORD  = struct.Struct("<32sII5I5d")
+
+COUNT, LAST_TS, POS, HEIGHT = range(4)
+_DP = (0.0, QUANTILE / 2, QUANTILE, (1 + QUANTILE) / 2, 1.0)   # desired-position increments
+
+
+def load_state() -> dict:
+    """{cid: [count, last_ts, positions(5), heights(5)]}; empty on a missing or foreign file."""
+    try:
+        with open(STATE_FILE, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return {}
+    if len(data) < HEADER.size:
+        return {}
+    magic, version, _, q = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or q != QUANTILE:
+        print(f"  [!] {os.path.basename(STATE_FILE)}: different format or quantile -- sketches reset")
+        return {}
+    state = {}
+    for off in range(HEADER.size, len(data) - RECORD.size + 1, RECORD.size):
+        rec = RECORD.unpack_from(data, off)
+        state["0x" + rec[0].hex()] = [rec[1 + COUNT], rec[1 + LAST_TS], list(rec[3:8]), list(rec[8:13])]
+    return state
+
+
+def save_state(state):
+    """Atomic write; sketches idle for STATE_MAX_AGE_DAYS (or with non-hex ids) are dropped."""
+    cutoff = time.time() - STATE_MAX_AGE_DAYS * 86400
+    parts  = [HEADER.pack(MAGIC, VERSION, 0, QUANTILE)]
+    for cid, st in state.items():
+        if st[LAST_TS] < cutoff: continue
+        try:
+            key = bytes.fromhex(cid[2:] if cid.startswith("0x") else cid)
+        except ValueError:
+            continue
+        if len(key) != 32: continue
+        parts.append(RECORD.pack(key, st[COUNT], st[LAST_TS], *st[POS], *st[HEIGHT]))
+    try:
+        tmp = STATE_FILE + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"".join(parts))
+        os.replace(tmp, STATE_FILE)
+    except Exception as e:
+        print(f"  [x] Size sketch save failed: {e}")
+
+
+def _add(st, x):
+    """Fold one observation into a sketch (P-square update)."""
+    n, q = st[POS], st[HEIGHT]
+    if st[COUNT] < 5:
+        q[st[COUNT]] = x
+        st[COUNT] += 1
+        if st[COUNT] == 5:
+            q.sort()
+            n[:] = [1, 2, 3, 4, 5]
+        return
+    if x < q[0]:
+        q[0], k = x, 0
+    elif x >= q[4]:
+        q[4], k = x, 3
+    else:
+        k = next(i for i in range(1, 5) if x < q[i]) - 1
+    for i in range(k + 1, 5):
+        n[i] += 1
+    st[COUNT] += 1
+    count = st[COUNT]
+    for i in (1, 2, 3):
+        d = 1 + (count - 1) * _DP[i] - n[i]
+        if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+            s  = 1 if d > 0 else -1
+            qp = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+            if not q[i - 1] < qp < q[i + 1]:   # parabola overshoots -- linear step instead
+                qp = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+            q[i]  = qp
+            n[i] += s
+    if count >= HALVE_AT:
+        for i in range(1, 5):
+            n[i] = max(1 + round((n[i] - 1) / 2), n[i - 1] + 1)
+        st[COUNT] = n[4]
+
+
+def update(state, cid, sizes, ts=None) -> int:
+    """Fold trade sizes (USD, > 0) into the market's sketch. Returns the number added."""
+    st = state.get(cid)
+    if st is None:
+        st = state[cid] = [0, 0, [0, 0, 0, 0, 0], [0.0] * 5]
+    added = 0
+    for x in sizes:
+        if x > 0:
+            _add(st, float(x)); added += 1
+    if added:
+        st[LAST_TS] = int(ts if ts is not None else time.time())
+    return added
+
+
+def quantile(state, cid, min_obs=MIN_OBS):
+    """The market's QUANTILE trade size, or None until it has min_obs trades."""
+    st = state.get(cid)
+    if st is None or st[COUNT] < max(min_obs, 5):
+        return None
+    return st[HEIGHT][2]
+
+
+def describe(cid, st) -> str:
+    q = st[HEIGHT]
+    return (f"{cid[:14]}  n={st[COUNT]:>5}  min ${q[0]:>10,.0f}  p{QUANTILE*50:.1f} ${q[1]:>10,.0f}  "
+            f"p{QUANTILE*100:.0f} ${q[2]:>10,.0f}  max ${q[4]:>10,.0f}")
+
+
+if __name__ == "__main__":
+    import sys
+    state = load_state()
+    if sys.argv[1:]:
+        for cid in sys.argv[1:]:
+            print(describe(cid, state[cid]) if cid in state else f"{cid}: no sketch")
+    else:
+        ready = {cid: st for cid, st in state.items() if st[COUNT] >= MIN_OBS}
+        print(f"[SIZE SKETCH] {len(state):,} markets ({len(ready):,} with >= {MIN_OBS} trades) | "
+              f"p{QUANTILE*100:.0f} | {HEADER.size + len(state) * RECORD.size:,} bytes")
+        for cid, st in sorted(ready.items(), key=lambda kv: -kv[1][HEIGHT][2])[:25]:
+            print("  " + describe(cid, st))
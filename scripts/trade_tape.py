@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+trade_tape.py - Local append-only tape of every trade the whale tracker sees
+Location: ~/.openclaw/workspace/scripts/trade_tape.py
+Version: 1.0 | Built: 2026-10-18
+
+scan_markets() used to throw trades away after detection. Now every fetched trade is
+appended here once per scan (one transaction), so detectors, wallet scoring and replays
+can read locally instead of hitting the Data API again.
+
+Storage: SQLite (stdlib, WAL mode) at paper_trading/trade_tape.db
+  trades(trade_key PK, tx_hash, condition_id, ts, wallet, side, outcome, asset, size, usd, price, seen_at)
+  trade_key = tx hash + wallet + asset + size (whale_tracker.trade_key) -- a transaction
+  can carry several fills, so dedup is on the fill, keyed by its transaction hash.
+  Indexes: (condition_id, ts), (wallet, ts), (ts)
+
+query_trades() returns rows in Data API shape (proxyWallet, outcome, size, price,
+timestamp, ...) so find_whale_trades / find_whale_clusters run on them unchanged.
+
+CLI:
+    python scripts/trade_tape.py stats
+    python scripts/trade_tape.py market <conditionId> [--hours 24]
+    python scripts/trade_tape.py wallet <address>     [--hours 24]
+"""
+
+import os
+import sqlite3
+import time
+
+TAPE_DB = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'trade_tape.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    trade_key    TEXT PRIMARY KEY,
+    tx_hash      TEXT,
+    condition_id TEXT    NOT NULL,
+    ts           INTEGER NOT NULL,
+    wallet       TEXT,
+    side         TEXT,
+    outcome      TEXT,
+    asset        TEXT,
+    size         REAL,
+    usd          REAL,
+    price        REAL,
+    seen_at      INTEGER
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_trades_market_ts ON trades(condition_id, ts);
+CREATE INDEX IF NOT EXISTS idx_trades_wallet_ts ON trades(wallet, ts);
+CREATE INDEX IF NOT EXISTS idx_trades_ts        ON trades(ts);
+"""
+
+COLUMNS = ("trade_key", "tx_hash", "condition_id", "ts", "wallet", "side",
+           "outcome", "asset", "size", "usd", "price", "seen_at")
+
+
+def open_tape(path=TAPE_DB) -> sqlite3.Connection:
+    """Open (and create if needed) the tape database."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _num(v, default=0.0):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return default
+
+
+def tape_row(cid, trade, key, seen_at=None) -> tuple:
+    """Flatten one Data API trade into a tape row. `key` is whale_tracker.trade_key(trade)."""
+    size = _num(trade.get("size"))
+    return (
+        key,
+        trade.get("transactionHash", ""),
+        cid,
+        int(_num(trade.get("timestamp"))),
+        trade.get("proxyWallet", "unknown"),
+        str(trade.get("side", "")).upper(),
+        trade.get("outcome", ""),
+        str(trade.get("asset", "")),
+        size,
+        _num(trade.get("usdcSize") or trade.get("size") or 0),   # same USD value the detectors use
+        _num(trade.get("price"), 0.5),
+        int(seen_at if seen_at is not None else time.time()),
+    )
+
+
+def append_trades(conn, rows) -> int:
+    """Insert rows in ONE transaction, ignoring fills already on the tape. Returns rows added."""
+    if not rows:
+        return 0
+    before = conn.total_changes
+    with conn:
+        conn.executemany(
+            f"INSERT OR IGNORE INTO trades ({','.join(COLUMNS)}) VALUES ({','.join('?' * len(COLUMNS))})",
+            rows)
+    return conn.total_changes - before
+
+
+def query_trades(conn, market=None, wallet=None, since=None, until=None, limit=None) -> list:
+    """
+    Trades filtered by market / wallet / [since, until) epoch seconds, newest first,
+    in Data API shape. Each filter uses its own index.
+    """
+    where, args = [], []
+    if market:
+        where.append("condition_id = ?"); args.append(market)
+    if wallet:
+        where.append("wallet = ?");       args.append(wallet)
+    if since is not None:
+        where.append("ts >= ?");          args.append(int(since))
+    if until is not None:
+        where.append("ts < ?");           args.append(int(until))
+    sql = ("SELECT condition_id, ts, wallet, side, outcome, asset, size, usd, price, tx_hash FROM trades"
+           + (" WHERE " + " AND ".join(where) if where else "")
+           + " ORDER BY ts DESC"
+           + (f" LIMIT {int(limit)}" if limit else ""))
+    out = []
+    for cid, ts, w, side, outcome, asset, size, usd, price, tx in conn.execute(sql, args):
+        out.append({
+            "conditionId":     cid,
+            "timestamp":       ts,
+            "proxyWallet":     w,
+            "side":            side,
+            "outcome":         outcome,
+            "asset":           asset,
+            "size":            size,
+            "usdcSize":        usd,
+            "price":           price,
+            "transactionHash": tx,
+        })
+    return out
+
+
+def whale_wallets(conn, min_usd, since=None) -> list:
+    """Wallets with at least one trade of >= min_usd (since epoch seconds), biggest trade first."""
+    sql, args = "SELECT wallet, MAX(usd) AS top FROM trades WHERE usd >= ?", [float(min_usd)]
+    if since is not None:
+        sql += " AND ts >= ?"; args.append(int(since))
+    sql += " AND wallet IS NOT NULL AND wallet != 'unknown' GROUP BY wallet ORDER BY top DESC"
+    return [w for w, _ in conn.execute(sql, args)]
+
+
+def tape_stats(conn) -> dict:
+    n, markets, wallets, lo, hi = conn.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT condition_id), COUNT(DISTINCT wallet), MIN(ts), MAX(ts) FROM trades"
+    ).fetchone()
+    return {"trades": n, "markets": markets, "wallets": wallets, "first_ts": lo, "last_ts": hi}
+
+
+# --- CLI ----------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import argparse
+    from datetime import datetime, timezone
+    parser = argparse.ArgumentParser(description="Whale tracker trade tape")
+    parser.add_argument("command", choices=["stats", "market", "wallet"])
+    parser.add_argument("key",     nargs="?", default=None, help="conditionId or wallet address")
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--limit", type=int,   default=50)
+    args = parser.parse_args()
+
+    conn = open_tape()
+    if args.command == "stats":
+        st = tape_stats(conn)
+        fmt = lambda ts: datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M") if ts else "-"
+        print(f"[TRADE TAPE] {st['trades']:,} trades | {st['markets']:,} markets | {st['wallets']:,} wallets "
+              f"| {fmt(st['first_ts'])} -> {fmt(st['last_ts'])} UTC")
+    else:
+        if not args.key:
+            parser.error(f"{args.command} needs a key")
+        since = time.time() - args.hours * 3600
+        rows  = query_trades(conn, since=since, limit=args.limit,
+                             **({"market": args.key} if args.command == "market" else {"wallet": args.key}))
+        for t in rows:
+            when = datetime.fromtimestamp(t["timestamp"], timezone.utc).strftime("%m-%d %H:%M")
+            print(f"  {when} {t['proxyWallet'][:10]} {t['side']:4} {t['outcome']:3} "
+                  f"${t['usdcSize']:>10,.2f} @ {t['price']:.3f} {t['conditionId'][:12]}")
+        print(f"[{len(rows)} trade(s) in last {args.hours:g}h]")
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+wallet_backfill.py - Bootstrap Phase 4 wallet reputation from historical trades
+Location: ~/.openclaw/workspace/scripts/wallet_backfill.py
+Version: 1.0 | Built: 2026-10-18
+
+A wallet stays "unknown" until MIN_TRADES_SCORING of its whale trades have been
+evaluated live, which takes weeks. This job scores the wallets' past trades instead:
+
+  1. wallets   whale-size (>= WHALE_MIN_SIZE) traders on the trade tape in the last
+               SOURCE_DAYS, or --wallet
+  2. history   GET data-api /trades?user=<wallet>, BACKFILL_WORKERS wallets in flight,
+               paged back to the wallet's resume point (backfill.scored_until)
+  3. prices    one CLOB /prices-history request per outcome token traded (1h / 6h / 24h
+               checkpoints); resolutions from batched Gamma lookups (price_oracle)
+  4. scoring   every whale-size BUY older than MIN_AGE_HOURS is folded in at each
+               EVAL_HORIZONS checkpoint it has a price for, with whale_tracker's rules
+               ("res" only for markets that have already closed)
+  5. store     wallet + wallet_horizons + progress rows, ONE transaction per wallet,
+               then one vectorized rescore of the population (wallet_scoring.py)
+
+Every response is cached in paper_trading/backfill_cache.db (trade pages for
+CACHE_TTL_HOURS, price windows that ended a day ago for good), so re-runs and
+interrupted runs only fetch what is new. A wallet is revisited after REFRESH_HOURS.
+
+Trades in markets the wallet has live evals for (queued or completed) are skipped --
+the live eval counts those. Buys only: that is the side a wallet's prediction is read from.
+
+CLI:
+    python scripts/wallet_backfill.py run [--limit 200] [--workers 8] [--days 30]
+    python scripts/wallet_backfill.py run --wallet 0xabc...
+    python scripts/wallet_backfill.py status
+"""
+
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import http_client
+import price_oracle
+import trade_tape
+import wallet_store
+import whale_tracker as wt
+
+CLOB_API         = "https://clob.polymarket.com"
+CACHE_DB         = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'backfill_cache.db')
+BACKFILL_WORKERS = 8       # wallets / price windows in flight
+PAGE_SIZE        = 500     # /trades?user= page size
+MAX_PAGES        = 10      # pages walked back per wallet per run
+SOURCE_DAYS      = 30      # tape window the wallets are taken from
+MIN_AGE_HOURS    = 24      # younger trades wait for a later run (longest fixed checkpoint)
+REFRESH_HOURS    = 24      # a backfilled wallet is revisited after this long
+CACHE_TTL_HOURS  = 12      # trade pages are re-fetched after this long
+PRICE_FIDELITY   = 60      # minutes between prices-history points
+PRICE_TOLERANCE  = 2 * 3600  # first price point after a checkpoint must be this close
+
+_cache_lock = threading.Lock()
+
+
+# --- Response cache -----------------------------------------------------------
+
+def open_cache(path=CACHE_DB) -> sqlite3.Connection:
+    """Open (and create if needed) the response cache. Shared by the worker threads."""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, fetched_at INTEGER NOT NULL, "
+                 "body TEXT NOT NULL) WITHOUT ROWID")
+    return conn
+
+
+def cached_get(cache, url, params, ttl=None):
+    """JSON body of GET url?params, from the cache while younger than ttl seconds (None = forever)."""
+    key = url + "?" + json.dumps(params, sort_keys=True)
+    with _cache_lock:
+        row = cache.execute("SELECT fetched_at, body FROM responses WHERE key = ?", (key,)).fetchone()
+    if row and (ttl is None or time.time() - row[0] < ttl):
+        return json.loads(row[1])
+    r = http_client.get(url, params=params, timeout=15)
+    r.raise_for_status()
+    data = r.json()
+    with _cache_lock, cache:
+        cache.execute("INSERT OR REPLACE INTO responses (key, fetched_at, body) VALUES (?, ?, ?)",
+                      (key, int(time.time()), json.dumps(data)))
+    return data
+
+
+# --- Fetching -----------------------------------------------------------------
+
+def _ts(trade) -> int:
+    try:
+        return int(trade.get("timestamp", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def fetch_wallet_trades(cache, wallet, since_ts=0) -> list:
+    """The wallet's trades newer than since_ts, newest first (paged, cached)."""
+    out = []
+    for page in range(MAX_PAGES):
+        data  = cached_get(cache, f"{wt.DATA_API}/trades",
+                           {"user": wallet, "limit": PAGE_SIZE, "offset": page * PAGE_SIZE},
+                           CACHE_TTL_HOURS * 3600)
+        batch = data if isinstance(data, list) else data.get("data", [])
+        out.extend(t for t in batch if _ts(t) > since_ts)
+        if len(batch) < PAGE_SIZE or _ts(batch[-1]) <= since_ts:
+            break
+    return out
+
+
+def fetch_price_history(cache, token, start, end) -> list:
+    """[(ts, price)] of one outcome token over [start, end + PRICE_TOLERANCE], widened to whole UTC days."""
+    start = int(start) // 86400 * 86400
+    end   = (int(end) + PRICE_TOLERANCE) // 86400 * 86400 + 86400
+    ttl   = None if end < time.time() - 86400 else CACHE_TTL_HOURS * 3600  # a finished window never changes
+    data  = cached_get(cache, f"{CLOB_API}/prices-history",
+                       {"market": token, "startTs": start, "endTs": end, "fidelity": PRICE_FIDELITY}, ttl)
+    hist  = data.get("history", []) if isinstance(data, dict) else []
+    return sorted((int(p["t"]), float(p["p"])) for p in hist if "t" in p and "p" in p)
+
+
+def price_at(history, ts):
+    """First price at or after ts, if it lies within PRICE_TOLERANCE."""
+    if not history:
+        return None
+    i = bisect.bisect_left(history, (int(ts), float("-inf")))
+    if i < len(history) and history[i][0] - ts <= PRICE_TOLERANCE:
+        return history[i][1]
+    return None
+
+
+def _try(fn, *args):
+    try:
+        return fn(*args)
+    except Exception as e:
+        print(f"  [x] {fn.__name__}{tuple(str(a)[:12] for a in args[1:])}: {e}")
+        return None
+
+
+# --- Scoring ------------------------------------------------------------------
+
+def scorable_trades(trades, cutoff_ts, skip_markets, min_usd) -> list:
+    """Whale-size BUYs at or before cutoff_ts outside skip_markets."""
+    out = []
+    for t in trades:
+        try:
+            usd = float(t.get("usdcSize") or t.get("size", 0) or 0)
+            if (str(t.get("side", "")).upper() != "BUY" or usd < min_usd or not t.get("asset")
+                    or _ts(t) > cutoff_ts or t.get("conditionId") in skip_markets):
+                continue
+            float(t["price"])
+            out.append(t)
+        except (TypeError, ValueError, KeyError):
+            continue
+    return out
+
+
+def checkpoint_moves(trade, history, market) -> dict:
+    """{horizon: price move of the bought outcome} for every checkpoint with a known price."""
+    ts, entry, moves = _ts(trade), float(trade["price"]), {}
+    for horizon, hours in wt.EVAL_HORIZONS.items():
+        if hours is None:
+            closed = market and str(market.get("closed", "")).lower() == "true"
+            price  = price_oracle.outcome_price(market, trade.get("outcome", "Yes")) if closed else None
+        else:
+            price = price_at(history, ts + hours * 3600)
+        if price is not None:
+            moves[horizon] = price - entry
+    return moves
+
+
+def backfill_wallet(db, wallet, trades, histories, markets, prev_until, cutoff_ts, now) -> int:
+    """Fold the wallet's scorable trades into its stats and save with its progress. Returns trades scored."""
+    ws      = wallet_store.get_wallet(db, wallet)
+    hstats  = wallet_store.wallet_horizons(db, wallet)
+    touched = set()
+    scored  = 0
+    for t in trades:
+        moves = checkpoint_moves(t, histories.get(t["asset"]), markets.get(t.get("conditionId")))
+        for horizon, move in moves.items():
+            is_win = move >= wt.MIN_PRICE_MOVE
+            hstats[horizon] = wt.fold_eval(hstats.get(horizon) or wt.blank_wallet_stats(), move, is_win, now, _ts(t))
+            touched.add(horizon)
+            if horizon == wt.EVAL_HORIZON:
+                ws = wt.fold_eval(ws or wt.blank_wallet_stats(), move, is_win, now, _ts(t))
+        scored += bool(moves)
+    wallet_store.save_backfill(db, wallet, ws if wt.EVAL_HORIZON in touched else None,
+                               {(wallet, h): hstats[h] for h in touched},
+                               max(prev_until, cutoff_ts), scored, now.timestamp())
+    return scored
+
+
+def run(wallets=None, limit=200, workers=BACKFILL_WORKERS, days=SOURCE_DAYS):
+    """Backfill up to `limit` wallets that are due. Safe to interrupt and re-run."""
+    now = datetime.now(timezone.utc)
+    db  = wallet_store.open_store(wt.WALLET_DB)
+    if wallets is None:
+        tape    = trade_tape.open_tape(wt.TRADE_TAPE_DB)
+        wallets = trade_tape.whale_wallets(tape, wt.WHALE_MIN_SIZE, now.timestamp() - days * 86400)
+        tape.close()
+    progress = wallet_store.get_backfill(db, wallets)
+    todo     = [w for w in wallets
+                if now.timestamp() - progress.get(w, {}).get("updated_at", 0) >= REFRESH_HOURS * 3600][:limit]
+    print(f"[+] Backfill: {len(todo)} wallets due ({len(wallets) - len(todo)} fresh or over --limit)")
+    if not todo:
+        return 0
+    cache  = open_cache()
+    cutoff = int(now.timestamp() - MIN_AGE_HOURS * 3600)
+    since  = {w: progress.get(w, {}).get("scored_until", 0) for w in todo}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fetched = dict(zip(todo, pool.map(lambda w: _try(fetch_wallet_trades, cache, w, since[w]), todo)))
+        trades  = {w: scorable_trades(tr, cutoff, wallet_store.live_markets(db, w), wt.WHALE_MIN_SIZE)
+                   for w, tr in fetched.items() if tr is not None}
+        windows = {}
+        for tr in trades.values():
+            for t in tr:
+                lo, hi = windows.get(t["asset"], (_ts(t), _ts(t)))
+                windows[t["asset"]] = (min(lo, _ts(t)), max(hi, _ts(t)))
+        longest   = max(h for h in wt.EVAL_HORIZONS.values() if h is not None) * 3600
+        tokens    = list(windows)
+        histories = dict(zip(tokens, pool.map(
+            lambda tok: _try(fetch_price_history, cache, tok, windows[tok][0], windows[tok][1] + longest), tokens)))
+    markets = price_oracle.get_markets({t["conditionId"] for tr in trades.values() for t in tr if t.get("conditionId")})
+    print(f"[+] Backfill: {sum(len(tr) for tr in trades.values())} whale buys over {len(tokens)} tokens "
+          f"({sum(h is None for h in histories.values())} price windows failed)")
+
+    done = scored = 0
+    for w in todo:
+        if w not in trades or any(histories.get(t["asset"]) is None for t in trades[w]):
+            continue  # a fetch failed: no progress row, retried next run
+        scored += backfill_wallet(db, w, trades[w], histories, markets, since[w], cutoff, now)
+        done   += 1
+    wt.rescore_wallets(db, now)
+    tiers = " | ".join(f"{t}: {n}" for t, n in sorted(wallet_store.tier_counts(db).items()))
+    print(f"[+] Backfill: {done}/{len(todo)} wallets, {scored} trades scored | {tiers}")
+    cache.close(); db.close()
+    return done
+
+
+# --- CLI ----------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Backfill Phase 4 wallet reputation from historical trades")
+    parser.add_argument("command",   nargs="?", default="run", choices=["run", "status"])
+    parser.add_argument("--wallet",  action="append", default=None, help="backfill this wallet (repeatable)")
+    parser.add_argument("--limit",   type=int, default=200)
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS)
+    parser.add_argument("--days",    type=int, default=SOURCE_DAYS)
+    args = parser.parse_args()
+
+    if args.command == "status":
+        conn = wallet_store.open_store(wt.WALLET_DB)
+        st   = wallet_store.backfill_stats(conn)
+        size = os.path.getsize(CACHE_DB) if os.path.exists(CACHE_DB) else 0
+        print(f"[BACKFILL] {st['wallets']:,} wallets backfilled | {st['trades_scored']:,} trades scored | "
+              f"cache {size/1024:,.0f} KB")
+    else:
+        run(args.wallet, args.limit, args.workers, args.days)
+        http_client.print_stats()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+wallet_scoring.py - Vectorized Phase 4 wallet scoring with time decay (NumPy)
+Location: ~/.openclaw/workspace/scripts/wallet_scoring.py
+Version: 1.0 | Built: 2026-10-18
+
+Wallets used to be scored one at a time, only when one of their evals completed, from
+all-time counters -- a wallet that was good a year ago stayed "elite" forever. This
+module rescores a whole table (wallets or wallet_horizons) in one pass over NumPy
+columns, so whale_tracker can rescore every scan:
+
+    decay       f = 0.5 ** (age / half_life)      age = now - decay_ts
+                n = w_trades * f,  wins = w_wins * f,  move = w_move * f
+    accuracy    (wins + prior_a) / (n + prior_a + prior_b)     Beta prior shrinkage
+    score       accuracy * 0.6 + min(move / n / 0.15, 1) * 0.3 + min(n / 20, 1) * 0.1
+    tier        unknown if trades < min_trades (raw sample), else
+                market_maker  trades >= mm_min_trades and accuracy < mm_max_accuracy
+                elite / smart score >= elite / smart, else known
+
+The decayed counters (w_trades, w_wins, w_move as of decay_ts) are folded in per eval
+by whale_tracker.fold_eval(); this pass only reads them, so nothing but score and tier
+is written, and only for rows where either changed.
+
+Used by: whale_tracker.py (every scan, after evals) and wallet_backfill.py.
+"""
+
+import time
+
+import numpy as np
+
+import wallet_store
+
+TIERS = np.array(["unknown", "known", "smart", "elite", "market_maker"], dtype=object)
+
+
+def score_arrays(trades, w_trades, w_wins, w_move, decay_ts, now_ts, params):
+    """(score float64 rounded to 4 dp, tier object array) for aligned counter columns."""
+    trades   = np.asarray(trades,   dtype=np.float64)
+    w_trades = np.asarray(w_trades, dtype=np.float64)
+    w_wins   = np.asarray(w_wins,   dtype=np.float64)
+    w_move   = np.asarray(w_move,   dtype=np.float64)
+    age      = np.maximum(now_ts - np.asarray(decay_ts, dtype=np.float64), 0.0)
+
+    f        = np.exp2(-age / (params["half_life_days"] * 86400.0))
+    n        = w_trades * f
+    wins     = w_wins * f
+    move     = w_move * f
+    accuracy = (wins + params["prior_a"]) / (n + params["prior_a"] + params["prior_b"])
+    avg_move = np.divide(move, n, out=np.zeros_like(move), where=n > 0)
+    score    = np.round(accuracy * 0.6
+                        + np.minimum(avg_move / 0.15, 1.0) * 0.3
+                        + np.minimum(n / 20.0, 1.0) * 0.1, 4)
+
+    code = np.select(
+        [trades < params["min_trades"],
+         (trades >= params["mm_min_trades"]) & (accuracy < params["mm_max_accuracy"]),
+         score >= params["elite"],
+         score >= params["smart"]],
+        [0, 4, 3, 2], default=1)
+    return score, TIERS[code]
+
+
+def rescore(conn, table, now_ts, params):
+    """
+    Rescore every row of `table` ("wallets" / "wallet_horizons") and write back, in one
+    transaction, the rows whose score or tier changed.
+    Returns {"rows", "changed", "ms"}.
+    """
+    t0   = time.monotonic()
+    cols = wallet_store.scoring_columns(conn, table)
+    if not cols["keys"]:
+        return {"rows": 0, "changed": 0, "ms": 0.0}
+    score, tier = score_arrays(cols["trades"], cols["w_trades"], cols["w_wins"], cols["w_move"],
+                               cols["decay_ts"], now_ts, params)
+    old_score = np.asarray(cols["score"], dtype=np.float64)
+    old_tier  = np.asarray(cols["tier"],  dtype=object)
+    changed   = np.flatnonzero((np.abs(score - old_score) >= 5e-5) | (tier != old_tier))
+    wallet_store.write_scores(conn, table, [(cols["keys"][i], score[i], tier[i]) for i in changed])
+    return {"rows": len(cols["keys"]), "changed": len(changed), "ms": (time.monotonic() - t0) * 1000}
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+wallet_store.py - SQLite wallet reputation store (Phase 4 wallet intelligence)
+Location: ~/.openclaw/workspace/scripts/wallet_store.py
+Version: 1.0 | Built: 2026-10-18
+
+whale_tracker used to load wallet_stats.json whole, look wallets up in the dict and
+rewrite the file with indent=2 every scan. With tens of thousands of wallets that is
+most of the scan's disk work. Here each scan reads only the wallets it needs and
+writes the wallets it re-scored in one transaction.
+
+Storage: SQLite (stdlib, WAL mode) at paper_trading/wallet_stats.db
+  wallets(wallet PK, trades, wins, losses, accuracy, total_move, avg_move, score, tier, last_seen,
+          w_trades, w_wins, w_move, decay_ts)   -- w_* = time-decayed counters as of decay_ts
+  Indexes: (tier, score DESC), (score DESC)
+  evals(id PK, wallet, market_id, horizon, market_name, entry_price, outcome, due_at, recorded_at)
+  Indexes: UNIQUE (wallet, market_id, horizon) -- dedup, (due_at) -- the eval queue
+  wallet_horizons(wallet, horizon, <wallets counters>)  PK (wallet, horizon)
+                   -- the same stats per eval checkpoint (1h / 6h / 24h / res)
+  backfill(wallet PK, scored_until, trades_scored, updated_at)
+                   -- wallet_backfill.py progress (resume point per wallet)
+  eval_markets(wallet, market_id) PK -- every market a live eval was queued for, kept
+                   after the eval completes (the backfill leaves those trades alone)
+  meta(key PK, value) -- one-off migration markers
+
+The eval queue is ordered by due_at: due_evals() reads only the rows that are due
+through the index, so a scan pays for the evals it resolves, not the queue length.
+
+Rows come back as the same dicts wallet_stats.json held (avg_move_after_trade etc.),
+so scoring code did not change shape. migrate_json() seeds an empty store from the JSON.
+scoring_columns() / write_scores() feed the batch rescoring in wallet_scoring.py.
+
+CLI:
+    python scripts/wallet_store.py stats
+    python scripts/wallet_store.py top [--tier elite] [--limit 50]
+    python scripts/wallet_store.py wallet <address>
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+WALLET_DB = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'wallet_stats.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wallets (
+    wallet     TEXT PRIMARY KEY,
+    trades     INTEGER NOT NULL DEFAULT 0,
+    wins       INTEGER NOT NULL DEFAULT 0,
+    losses     INTEGER NOT NULL DEFAULT 0,
+    accuracy   REAL    NOT NULL DEFAULT 0,
+    total_move REAL    NOT NULL DEFAULT 0,
+    avg_move   REAL    NOT NULL DEFAULT 0,
+    score      REAL    NOT NULL DEFAULT 0,
+    tier       TEXT    NOT NULL DEFAULT 'unknown',
+    last_seen  TEXT,
+    w_trades   REAL    NOT NULL DEFAULT 0,
+    w_wins     REAL    NOT NULL DEFAULT 0,
+    w_move     REAL    NOT NULL DEFAULT 0,
+    decay_ts   INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_wallets_tier_score ON wallets(tier, score DESC);
+CREATE INDEX IF NOT EXISTS idx_wallets_score      ON wallets(score DESC);
+CREATE TABLE IF NOT EXISTS evals (
+    id          INTEGER PRIMARY KEY,
+    wallet      TEXT    NOT NULL,
+    market_id   TEXT    NOT NULL,
+    horizon     TEXT    NOT NULL DEFAULT '6h',
+    market_name TEXT,
+    entry_price REAL    NOT NULL,
+    outcome     TEXT    NOT NULL,
+    due_at      INTEGER NOT NULL,
+    recorded_at TEXT,
+    UNIQUE (wallet, market_id, horizon)
+);
+CREATE INDEX IF NOT EXISTS idx_evals_due ON evals(due_at);
+CREATE TABLE IF NOT EXISTS wallet_horizons (
+    wallet     TEXT    NOT NULL,
+    horizon    TEXT    NOT NULL,
+    trades     INTEGER NOT NULL DEFAULT 0,
+    wins       INTEGER NOT NULL DEFAULT 0,
+    losses     INTEGER NOT NULL DEFAULT 0,
+    accuracy   REAL    NOT NULL DEFAULT 0,
+    total_move REAL    NOT NULL DEFAULT 0,
+    avg_move   REAL    NOT NULL DEFAULT 0,
+    score      REAL    NOT NULL DEFAULT 0,
+    tier       TEXT    NOT NULL DEFAULT 'unknown',
+    last_seen  TEXT,
+    w_trades   REAL    NOT NULL DEFAULT 0,
+    w_wins     REAL    NOT NULL DEFAULT 0,
+    w_move     REAL    NOT NULL DEFAULT 0,
+    decay_ts   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (wallet, horizon)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS backfill (
+    wallet        TEXT PRIMARY KEY,
+    scored_until  INTEGER NOT NULL DEFAULT 0,
+    trades_scored INTEGER NOT NULL DEFAULT 0,
+    updated_at    INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS eval_markets (
+    wallet    TEXT NOT NULL,
+    market_id TEXT NOT NULL,
+    PRIMARY KEY (wallet, market_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+WALLET_COLUMNS = ("wallet", "trades", "wins", "losses", "accuracy", "total_move", "avg_move", "score", "tier", "last_seen",
+                  "w_trades", "w_wins", "w_move", "decay_ts")
+DECAY_COLUMNS  = {"w_trades": "trades", "w_wins": "wins", "w_move": "total_move"}   # decayed counter -> raw seed
+SCORED_TABLES  = ("wallets", "wallet_horizons")
+EVAL_COLUMNS   = ("id", "wallet", "market_id", "horizon", "market_name", "entry_price", "outcome", "due_at", "recorded_at")
+
+
+def open_store(path=WALLET_DB) -> sqlite3.Connection:
+    """Open (and create if needed) the wallet store."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    _add_decay_columns(conn)
+    return conn
+
+
+def _add_decay_columns(conn):
+    """Stores created before the decayed counters: add them, seeded from the raw counters as of last_seen."""
+    for table in SCORED_TABLES:
+        have = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+        if "decay_ts" in have:
+            continue
+        with conn:
+            for col, seed in DECAY_COLUMNS.items():
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} REAL NOT NULL DEFAULT 0")
+                conn.execute(f"UPDATE {table} SET {col} = {seed}")
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN decay_ts INTEGER NOT NULL DEFAULT 0")
+            conn.execute(f"UPDATE {table} SET decay_ts = COALESCE(CAST(strftime('%s', substr(last_seen, 1, 19)) AS INTEGER), "
+                         f"CAST(strftime('%s', 'now') AS INTEGER))")
+
+
+def _to_dict(row) -> dict:
+    w, trades, wins, losses, acc, total_move, avg_move, score, tier, last_seen, w_trades, w_wins, w_move, decay_ts = row
+    return {"trades": trades, "wins": wins, "losses": losses, "accuracy": acc,
+            "total_move": total_move, "avg_move_after_trade": avg_move,
+            "score": score, "tier": tier, "last_seen": last_seen,
+            "w_trades": w_trades, "w_wins": w_wins, "w_move": w_move, "decay_ts": decay_ts}
+
+
+def _to_row(wallet, ws) -> tuple:
+    """Dicts without decayed counters (old JSON) are seeded with the raw ones, decayed from now."""
+    return (wallet, int(ws.get("trades", 0)), int(ws.get("wins", 0)), int(ws.get("losses", 0)),
+            float(ws.get("accuracy", 0.0)), float(ws.get("total_move", 0.0)),
+            float(ws.get("avg_move_after_trade", 0.0)), float(ws.get("score", 0.0)),
+            ws.get("tier", "unknown"), ws.get("last_seen"),
+            float(ws.get("w_trades", ws.get("trades", 0))), float(ws.get("w_wins", ws.get("wins", 0))),
+            float(ws.get("w_move", ws.get("total_move", 0.0))), int(ws.get("decay_ts") or time.time()))
+
+
+def get_wallet(conn, wallet):
+    """One wallet's stats dict (wallet_stats.json shape) or None. Primary-key lookup."""
+    row = conn.execute(f"SELECT {','.join(WALLET_COLUMNS)} FROM wallets WHERE wallet = ?", (wallet,)).fetchone()
+    return _to_dict(row) if row else None
+
+
+def get_wallets(conn, wallets) -> dict:
+    """{wallet: stats} for the given addresses that exist, in chunked IN (...) lookups."""
+    wallets, out = list(set(wallets)), {}
+    for i in range(0, len(wallets), 500):
+        chunk = wallets[i:i + 500]
+        sql   = f"SELECT {','.join(WALLET_COLUMNS)} FROM wallets WHERE wallet IN ({','.join('?' * len(chunk))})"
+        for row in conn.execute(sql, chunk):
+            out[row[0]] = _to_dict(row)
+    return out
+
+
+def upsert_wallets(conn, stats) -> int:
+    """Write {wallet: stats} in ONE transaction (insert or replace). Returns rows written."""
+    if not stats:
+        return 0
+    with conn:
+        _upsert(conn, stats)
+    return len(stats)
+
+
+def _upsert(conn, stats):
+    conn.executemany(
+        f"INSERT OR REPLACE INTO wallets ({','.join(WALLET_COLUMNS)}) VALUES ({','.join('?' * len(WALLET_COLUMNS))})",
+        [_to_row(w, ws) for w, ws in stats.items()])
+
+
+def top_wallets(conn, tier=None, limit=50) -> list:
+    """[(wallet, stats)] best score first, optionally for one tier (uses the tier/score index)."""
+    sql  = f"SELECT {','.join(WALLET_COLUMNS)} FROM wallets"
+    args = []
+    if tier:
+        sql += " WHERE tier = ?"; args.append(tier)
+    sql += " ORDER BY score DESC LIMIT ?"; args.append(int(limit))
+    return [(row[0], _to_dict(row)) for row in conn.execute(sql, args)]
+
+
+def wallet_count(conn) -> int:
+    return conn.execute("SELECT COUNT(*) FROM wallets").fetchone()[0]
+
+
+def tier_counts(conn) -> dict:
+    return dict(conn.execute("SELECT tier, COUNT(*) FROM wallets GROUP BY tier"))
+
+
+# --- Eval queue ---------------------------------------------------------------
+
+_QUEUE_SQL = ("INSERT OR IGNORE INTO evals (wallet, market_id, horizon, market_name, entry_price, outcome, due_at, recorded_at) "
+              "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+_EVAL_MARKET_SQL = "INSERT OR IGNORE INTO eval_markets (wallet, market_id) VALUES (?, ?)"
+
+
+def queue_evals(conn, rows) -> int:
+    """
+    Queue several evals in ONE transaction (one executemany) -- a signal's checkpoints cost
+    one commit, not one per horizon. rows: [(wallet, market_id, horizon, market_name,
+    entry_price, outcome, due_at, recorded_at)]. Already-pending ones are skipped. Returns evals added.
+    """
+    rows = [(w, m, h, name, float(px), oc, int(due), rec) for w, m, h, name, px, oc, due, rec in rows]
+    if not rows:
+        return 0
+    with conn:
+        before = conn.total_changes
+        conn.executemany(_QUEUE_SQL, rows)
+        added  = conn.total_changes - before
+        conn.executemany(_EVAL_MARKET_SQL, {(r[0], r[1]) for r in rows})
+    return added
+
+
+def due_evals(conn, now_ts, limit=None) -> list:
+    """Evals with due_at <= now_ts, oldest first (index range scan). List of dicts."""
+    sql  = f"SELECT {','.join(EVAL_COLUMNS)} FROM evals WHERE due_at <= ? ORDER BY due_at"
+    args = [int(now_ts)]
+    if limit:
+        sql += " LIMIT ?"; args.append(int(limit))
+    return [dict(zip(EVAL_COLUMNS, row)) for row in conn.execute(sql, args)]
+
+
+def get_horizon_stats(conn, wallets) -> dict:
+    """{(wallet, horizon): stats} for every checkpoint horizon the given wallets have."""
+    wallets, out = list(set(wallets)), {}
+    for i in range(0, len(wallets), 500):
+        chunk = wallets[i:i + 500]
+        sql   = (f"SELECT horizon, {','.join(WALLET_COLUMNS)} FROM wallet_horizons "
+                 f"WHERE wallet IN ({','.join('?' * len(chunk))})")
+        for row in conn.execute(sql, chunk):
+            out[(row[1], row[0])] = _to_dict(row[1:])
+    return out
+
+
+def wallet_horizons(conn, wallet) -> dict:
+    """{horizon: stats} for one wallet."""
+    return {h: ws for (_, h), ws in get_horizon_stats(conn, [wallet]).items()}
+
+
+def _upsert_horizons(conn, horizon_stats):
+    cols = ("horizon",) + WALLET_COLUMNS
+    conn.executemany(
+        f"INSERT OR REPLACE INTO wallet_horizons ({','.join(cols)}) VALUES ({','.join('?' * len(cols))})",
+        [(h,) + _to_row(w, ws) for (w, h), ws in horizon_stats.items()])
+
+
+def complete_evals(conn, stats, eval_ids, horizon_stats=None, reschedule=None) -> int:
+    """
+    ONE transaction: write re-scored wallets ({wallet: stats}) and per-horizon stats
+    ({(wallet, horizon): stats}), drop the evaluated queue rows and move the
+    not-yet-resolved ones to a new due time (reschedule: [(eval_id, due_at)]).
+    """
+    with conn:
+        if stats:
+            _upsert(conn, stats)
+        if horizon_stats:
+            _upsert_horizons(conn, horizon_stats)
+        conn.executemany("INSERT OR IGNORE INTO eval_markets (wallet, market_id) "
+                         "SELECT wallet, market_id FROM evals WHERE id = ?", [(i,) for i in eval_ids])
+        conn.executemany("DELETE FROM evals WHERE id = ?", [(i,) for i in eval_ids])
+        conn.executemany("UPDATE evals SET due_at = ? WHERE id = ?", [(int(d), i) for i, d in reschedule or ()])
+    return len(eval_ids)
+
+
+def live_markets(conn, wallet) -> set:
+    """market_ids the wallet has live evals for, queued or completed (their trades are scored live)."""
+    return {r[0] for r in conn.execute("SELECT market_id FROM eval_markets WHERE wallet = ? "
+                                       "UNION SELECT market_id FROM evals WHERE wallet = ?", (wallet, wallet))}
+
+
+def eval_count(conn) -> int:
+    return conn.execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+
+
+# --- Backfill progress --------------------------------------------------------
+
+def get_backfill(conn, wallets) -> dict:
+    """{wallet: {"scored_until", "trades_scored", "updated_at"}} for wallets already backfilled."""
+    wallets, out = list(set(wallets)), {}
+    for i in range(0, len(wallets), 500):
+        chunk = wallets[i:i + 500]
+        sql   = (f"SELECT wallet, scored_until, trades_scored, updated_at FROM backfill "
+                 f"WHERE wallet IN ({','.join('?' * len(chunk))})")
+        for w, until, n, upd in conn.execute(sql, chunk):
+            out[w] = {"scored_until": until, "trades_scored": n, "updated_at": upd}
+    return out
+
+
+def save_backfill(conn, wallet, stats, horizon_stats, scored_until, trades_scored, now_ts):
+    """
+    ONE transaction per wallet: its re-scored wallet row (stats may be None), its
+    wallet_horizons rows and its progress row -- an interrupted run resumes cleanly.
+    """
+    with conn:
+        if stats:
+            _upsert(conn, {wallet: stats})
+        if horizon_stats:
+            _upsert_horizons(conn, horizon_stats)
+        conn.execute(
+            "INSERT INTO backfill (wallet, scored_until, trades_scored, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(wallet) DO UPDATE SET scored_until = excluded.scored_until, "
+            "trades_scored = backfill.trades_scored + excluded.trades_scored, updated_at = excluded.updated_at",
+            (wallet, int(scored_until), int(trades_scored), int(now_ts)))
+
+
+def backfill_stats(conn) -> dict:
+    n, scored = conn.execute("SELECT COUNT(*), COALESCE(SUM(trades_scored), 0) FROM backfill").fetchone()
+    return {"wallets": n, "trades_scored": scored}
+
+
+# --- Batch rescoring ----------------------------------------------------------
+
+def _table_keys(table) -> tuple:
+    if table not in SCORED_TABLES:
+        raise ValueError(f"not a scored table: {table}")
+    return ("wallet", "horizon") if table == "wallet_horizons" else ("wallet",)
+
+
+def scoring_columns(conn, table="wallets") -> dict:
+    """Whole-table column lists for batch rescoring: keys, trades, w_trades, w_wins, w_move, decay_ts, score, tier."""
+    keys = _table_keys(table)
+    cols = ("trades", "w_trades", "w_wins", "w_move", "decay_ts", "score", "tier")
+    rows = conn.execute(f"SELECT {','.join(keys + cols)} FROM {table}").fetchall()
+    data = list(zip(*rows)) or [()] * (len(keys) + len(cols))
+    out  = {"keys": list(zip(*data[:len(keys)]))}
+    out.update(zip(cols, data[len(keys):]))
+    return out
+
+
+def write_scores(conn, table, updates) -> int:
+    """Write [(key tuple, score, tier)] in ONE transaction. Returns rows written."""
+    keys = _table_keys(table)
+    if not updates:
+        return 0
+    where = " AND ".join(f"{k} = ?" for k in keys)
+    with conn:
+        conn.executemany(f"UPDATE {table} SET score = ?, tier = ? WHERE {where}",
+                         [(float(score), tier) + tuple(key) for key, score, tier in updates])
+    return len(updates)
+
+
+def get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_meta(conn, key, value):
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def migrate_json(conn, path) -> int:
+    """Seed the store from the old wallet_stats.json ({wallet: stats}). Returns wallets added."""
+    try:
+        with open(path) as f:
+            stats = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return 0
+    return upsert_wallets(conn, {w: ws for w, ws in stats.items() if isinstance(ws, dict)})
+
+
+def migrate_evals_json(conn, path, horizon="6h") -> int:
+    """Queue the old pending_wallet_evals.json entries (eval_at -> due_at). Returns evals added."""
+    from datetime import datetime, timezone
+    try:
+        with open(path) as f:
+            pending = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return 0
+    rows = []
+    for ev in pending:
+        try:
+            due = datetime.fromisoformat(ev["eval_at"])
+            if due.tzinfo is None:
+                due = due.replace(tzinfo=timezone.utc)
+            rows.append((ev["wallet"], ev["market_id"], horizon, ev.get("market_name", ""), float(ev["entry_price"]),
+                         ev.get("outcome", "Yes"), int(due.timestamp()), ev.get("recorded_at")))
+        except Exception:
+            continue
+    before = conn.total_changes
+    with conn:
+        conn.executemany(_QUEUE_SQL, rows)
+    return conn.total_changes - before
+
+
+# --- CLI ----------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Wallet reputation store")
+    parser.add_argument("command", choices=["stats", "top", "wallet"])
+    parser.add_argument("address", nargs="?", default=None)
+    parser.add_argument("--tier",  default=None)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    conn = open_store()
+    if args.command == "stats":
+        tiers = " | ".join(f"{t}: {n:,}" for t, n in sorted(tier_counts(conn).items()))
+        print(f"[WALLET STORE] {wallet_count(conn):,} wallets | {tiers or 'empty'} | {eval_count(conn):,} evals queued")
+    elif args.command == "top":
+        for w, ws in top_wallets(conn, args.tier, args.limit):
+            print(f"  {w[:12]} {ws['tier']:12} score={ws['score']:.3f} acc={ws['accuracy']*100:5.1f}% "
+                  f"trades={ws['trades']:<4} avg_move={ws['avg_move_after_trade']:.3f}")
+    else:
+        if not args.address:
+            parser.error("wallet needs an address")
+        print(json.dumps({"wallet": get_wallet(conn, args.address),
+                          "horizons": wallet_horizons(conn, args.address)}, indent=2))
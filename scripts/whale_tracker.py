@@ -1,7 +1,211 @@
 #!/usr/bin/env python3
 """
 whale_tracker.py - Polymarket Whale Signal Detection
-Last Updated: 2026-03-10 (v6.3 - Phase 4: informed wallet detection + smart/elite tiers)
+Last Updated: 2026-10-18 (v6.26 - adaptive scan scheduler)
+
+Changes v6.25 -> v6.26:
+  --scheduled runs continuously instead of the 2h cron sweep. Every market gets its
+  own next-scan time (scripts/scan_scheduler.py), set from:
+    - its stage (Stage 1 TACTICAL most often)
+    - new trades in its last fetch (hot markets faster, idle ones back off to twice a day)
+    - the listing surge score
+    - a recent liquidity shock
+    - an open paper position
+  Every SCHEDULE_TICK_MINUTES a tick takes the due markets from a priority queue,
+  most overdue first. It takes only as many as the token-bucket request budget allows
+  (REQUESTS_PER_MINUTE, sized to the old sweep's cost). Each tick is charged every
+  request it really made. The listing, the surge scoring and the Phase 3 liquidity
+  sample are refreshed every LISTING_REFRESH_MINUTES and reused in between. The
+  change filter only looks at due markets. build_scan_list() is the listing half of
+  scan_markets(), split out so ticks can reuse it. Without --scheduled a scan
+  behaves as before. With --json, each tick merges its signals into
+  whale_signals.json, which keeps the last SIGNALS_KEEP_HOURS of them (quiet ticks
+  no longer wipe the file). The paper bridge runs on its own cron over that file.
+  "markets_scanned" now counts the markets whose trades were fetched, and
+  "markets_listed" counts the scan list.
+
+Changes v6.24 -> v6.25:
+  Listing-only surge scoring (score_listing_surges): every listed market is scored
+  for volume surge and price velocity from volume / volume24hr / lastTradePrice /
+  oneHourPriceChange. It compares against the previous scan's listing, kept under
+  listing_snapshot.json "listing" with a per-market EWMA baseline of USD/hour. This
+  needs no API calls. The scores set the /trades submission order (hottest markets
+  first; yield order and signals unchanged). Markets past VOLUME_SURGE_RATIO or
+  PRICE_VELOCITY_MIN on VOLUME_SURGE_MIN_USD of new volume are reported as
+  "Volume Surge" candidates, in the log and in the --json "candidates" key. They
+  are pre-trade leads, not signals, so the paper bridge does not read them.
+
+Changes v6.23 -> v6.24:
+  Whale size bar per market: market_whale_min() = max(get_whale_min_for_days() floor,
+  p99 of the market's recent trade sizes). The p99 comes from a P-square sketch per
+  market (scripts/size_sketch.py: 5 markers, 100 bytes on disk) fed with each scan's
+  cursor-fetched trades and kept in paper_trading/size_sketch.bin. A market uses the
+  floor alone until it has size_sketch.MIN_OBS trades. Bars are set from the state
+  as of the previous scan, so a burst of large fills cannot raise its own bar. Thin,
+  small-ticket markets keep the floor; busy markets where floor-sized trades are
+  routine need a trade in their own top 1%. Clusters and swarms keep their
+  combined-USD bars.
+
+Changes v6.22 -> v6.23:
+  Event index: markets from /events now carry _parent_event_id, and each scan
+  groups the scan list by parent event (build_event_index: members and aggregate
+  liquidity). While the per-market loop runs, add_event_flow() folds each sibling's
+  trades into a per-wallet signed YES-exposure flow. This reuses the trades already
+  fetched, so it makes no extra API calls. find_event_accumulation() then reports a
+  wallet whose net flow across EVENT_MIN_MARKETS+ siblings reaches EVENT_MIN_TOTAL
+  with no sibling above EVENT_MAX_LEG_PCT (ladders and date brackets split to stay
+  under the per-market bars). Event signals are not tradeable single markets. They
+  go to Telegram and to a separate "event_signals" key in --json output, so the
+  paper bridge does not pick them up.
+
+Changes v6.21 -> v6.22:
+  Phase 6 COORDINATED ENTRY, per the draft spec in docs/PHASE6_SWARM_DETECTION_DRAFT.md
+  (its validation gate is still open): find_swarm_activity() runs next to
+  find_whale_clusters() on the same trade list. It flags >= SWARM_MIN_WALLETS wallets
+  BUYING >= SWARM_MIN_TOTAL of one outcome within SWARM_WINDOW seconds (SELLs are
+  exits, not entries, and are ignored), with no wallet above SWARM_DOMINANCE_PCT of
+  the volume (above that it is Phase 2's accumulation). Each outcome gets one
+  sliding window.
+  Per-wallet totals and the running total are updated as trades enter and leave, and
+  the largest wallet comes from a lazy max-heap. Swarm signals (signal_type "Swarm")
+  are Tier 2 alone and Tier 1 when a Phase 1/2 whale in the same market backs the
+  outcome. A backed swarm plus a liquidity shock is reported as EXTREME.
+
+Changes v6.20 -> v6.21:
+  Wallet scores are no longer computed per wallet when an eval completes. Every
+  scan rescores the whole wallets and wallet_horizons tables at once in NumPy
+  (scripts/wallet_scoring.py) from exponentially decayed counters
+  (WALLET_DECAY_HALF_LIFE_DAYS), with a Beta(WALLET_PRIOR_A, WALLET_PRIOR_B) prior on
+  accuracy. Tiers and the market-maker filter are applied as array masks, and only
+  rows whose score or tier changed are written. A wallet that stops being right now
+  fades out of elite/smart instead of keeping the tier forever.
+
+Changes v6.19 -> v6.20:
+  Every recorded whale trade is queued at several checkpoints (EVAL_HORIZONS:
+  1h / 6h / 24h / resolution) instead of one 6h check. All checkpoints due in a scan
+  share the batched price lookup, so the extra horizons cost only the markets they
+  add. Per-horizon stats live in wallet_store's wallet_horizons table; the main
+  wallet tier still comes from EVAL_HORIZON (6h). The resolution checkpoint waits for
+  the market to close, rechecking every RESOLUTION_RECHECK_HOURS.
+  get_wallet_info() boosts with the BOOST_HORIZON tier (24h, our usual holding
+  period) once that horizon has MIN_TRADES_SCORING evals, else the main tier.
+
+Changes v6.18 -> v6.19:
+  Pending wallet evals moved from pending_wallet_evals.json into the wallet store's
+  evals table, indexed by due time and unique per (wallet, market, horizon).
+  process_pending_evals() reads only the due rows, prices each due market once via
+  price_oracle (batched condition_ids queries) and deletes the evaluated rows in the
+  same transaction that writes the wallets. record_wallet_trade() dedups with
+  INSERT OR IGNORE instead of scanning the queue. The JSON queue is imported once.
+
+Changes v6.17 -> v6.18:
+  Wallet reputation lives in scripts/wallet_store.py (SQLite, paper_trading/
+  wallet_stats.db, indexed by address and tier/score) instead of wallet_stats.json.
+  process_pending_evals() loads only the wallets with due evals and writes the
+  re-scored rows in one transaction; get_wallet_info() is a primary-key lookup.
+  An empty store is seeded once from wallet_stats.json.
+
+Changes v6.16 -> v6.17:
+  Liquidity shocks come from scripts/liquidity_detector.py: an O(1)-per-scan EWMA
+  mean/variance + rolling-peak state per market. A shock is a z-score drop
+  (Z_THRESHOLD std-devs below the market's own mean) or a drawdown from the 72h peak;
+  the old LIQUIDITY_SHOCK_PCT drop vs the previous scan is kept as the fallback rule,
+  during warm-up and after it. Signals carry liq_shock_reason
+  (zscore / drawdown / drop). Inspect state: python scripts/liquidity_detector.py
+
+Changes v6.15 -> v6.16:
+  Phase 3 liquidity snapshots moved from liquidity_history.json (last value only,
+  rewritten with indent=2 every scan, never evicted) to scripts/liquidity_store.py:
+  an mmap'ed file of per-market ring buffers (paper_trading/liquidity_store.bin).
+  check_liquidity_shock() reads the newest sample in O(1); markets idle for
+  RETENTION_DAYS are compacted away. The JSON is migrated once into an empty store.
+
+Changes v6.14 -> v6.15:
+  Full scans compare each market's listing fields (volume, lastTradePrice,
+  liquidityNum, updatedAt) with the state recorded the last time its trades were
+  fetched (paper_trading/listing_snapshot.json). Unchanged markets skip the /trades
+  call; they still get the liquidity shock check. Every FULL_REFRESH_EVERY scans (or
+  with --full-refresh) all markets are fetched. Saved fetches are logged per scan.
+
+Changes v6.13 -> v6.14:
+  Listing pulls push filters to Gamma: /markets?liquidity_num_min=..&order=liquidityNum
+  and /events?liquidity_min=..&order=liquidity (descending), so pages hold only
+  markets that can pass filter_liquid_markets() and the target count keeps the most
+  liquid ones. The end-date window (end_date_min/max) is available behind
+  LISTING_END_DATE_PUSHDOWN but off: it would drop the null-date Open Horizon markets.
+  Each page is projected to MARKET_FIELDS / EVENT_FIELDS right after decode (drops
+  descriptions, images, nested series, ...). The scan logs listing KB vs markets kept.
+
+Changes v6.12 -> v6.13:
+  Every merged listing feeds scripts/market_index.py (conditionId <-> numeric id <->
+  slug <-> CLOB token ids, persisted in paper_trading/market_index.json), so the paper
+  engine, bridge and daily monitor can price a position under any id form with one
+  targeted Gamma query.
+
+Changes v6.11 -> v6.12:
+  Category detection moved to scripts/category_classifier.py, shared with the paper
+  bridge and engine (one taxonomy, one precompiled word-boundary regex, scored by
+  keywords matched with CATEGORY_PRIORITY breaking ties). Categories are memoised by
+  conditionId in paper_trading/category_cache.json. "war" no longer tags Warriors
+  games as geopolitics.
+
+Changes v6.10 -> v6.11:
+  --batch-signals drains the /trades fan-out first, then runs single-trade whale
+  detection and divergence/tier scoring for ALL markets in one NumPy pass
+  (scripts/signal_engine.py). Per-market liquidity, whale min, T1 and market price
+  are broadcast over trade columns; results match find_whale_trades() +
+  calculate_signal() exactly. NumPy is imported only in batch mode. Default
+  (streaming) mode is unchanged.
+
+Changes v6.9 -> v6.10:
+  find_whale_clusters() uses a two-pointer sliding window per wallet with running
+  USD total and outcome counts: O(n) after the sort instead of rebuilding and
+  re-summing a window from every start index. Output is identical to v6.9 (the
+  reported total/avg price are still summed left-to-right over the window).
+  all_windows=True returns every qualifying window, not just the first per wallet.
+
+Changes v6.8 -> v6.9:
+  bucket_by_resolution() replaces the five filter_by_resolution() passes in
+  run_stage_expansion(). Each end date is parsed once, _days_to_resolve is written
+  once, and markets land in stage bins 1-4 or Open Horizon. Stage escalation is
+  now a lookup over bucket sizes.
+
+Changes v6.7 -> v6.8:
+  Every trade fetched in scan_markets() is appended to the SQLite trade tape
+  (scripts/trade_tape.py -> paper_trading/trade_tape.db) in one batched write at
+  the end of the scan. Rows dedupe on the fill (transaction hash + wallet + asset +
+  size) and are indexed by market, wallet and time for local replays.
+  The tape is also the lookback of the windowed detectors: a cursor scan only has
+  the new trades, so Phase 2 clusters and Phase 6 swarms run on them plus the
+  market's last CLUSTER_WINDOW / SWARM_WINDOW of tape, and event flow on every
+  member's last EVENT_FLOW_WINDOW. Only windows ending on a new trade count, and
+  alerted windows are kept in paper_trading/emitted_windows.json so one cluster,
+  swarm or event flow is reported once. Phase 1 single trades stay new-only.
+
+Changes v6.6 -> v6.7:
+  Full scans keep a cursor per market (newest trade timestamp + the fills seen at
+  that timestamp) in trade_cursors.json. Each scan pulls only trades newer than the
+  cursor, paging back up to TRADE_MAX_PAGES when a market had more than one page of
+  new activity. Busy markets no longer drop whale trades that fell outside the
+  latest 100, and a whale trade is evaluated once instead of on every scan.
+  Single-market mode (--market-id) still reads the latest page without a cursor.
+
+Changes v6.5 -> v6.6:
+  All Gamma / Data API / Telegram calls go through scripts/http_client.py (one
+  keep-alive Session, gzip, shared timeout + retry-with-jitter policy). The scan
+  ends with a per-endpoint request/byte summary.
+
+Changes v6.4 -> v6.5:
+  /trades fetches for the scan list run in a TRADE_FETCH_WORKERS thread pool
+  (iter_market_trades). Results are yielded in market order as soon as they land,
+  so detection overlaps the network and signal order stays deterministic.
+  --trade-workers N sets the in-flight limit (1 = old sequential loop).
+
+Changes v6.3 -> v6.4:
+  /markets and /events now really are fetched in parallel (fetch_listing_sources).
+  Each endpoint prefetches up to LISTING_WORKERS offset pages at a time and stops
+  at the first short page. Per-page timing is logged. --listing-workers N sets the
+  pool size (1 = old sequential behaviour).
 
 Changes v5.2 -> v6.0:
   BUG-021 FIX: Now fetches BOTH /markets AND /events endpoints in parallel.
@@ -29,9 +233,20 @@ Changes v5.1 -> v5.2:
 Changes v5.0 -> v5.1:
   4-STAGE SYSTEM, DYNAMIC DIVERGENCE, MANIPULATION GUARDRAIL, WHALE_MIN SCALES
 """
-import os, sys, json, requests, argparse
-from datetime import datetime, timezone
+import os, sys, json, time, argparse, heapq
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
+import category_classifier
+import http_client
+import liquidity_detector
+import liquidity_store
+import market_index
+import price_oracle
+import scan_scheduler
+import size_sketch
+import trade_tape
+import wallet_store
 
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
@@ -57,9 +272,51 @@ CLUSTER_WINDOW        = 1800   # 30 minutes in seconds
 MIN_TRADES_IN_CLUSTER = 3
 MIN_CLUSTER_TOTAL     = 900    # USDC
 
+# Phase 6 -- Swarm Detection (coordinated entry across wallets, v6.22)
+SWARM_WINDOW          = 600    # 10 minutes in seconds
+SWARM_MIN_WALLETS     = 3      # minimum unique wallets
+SWARM_MIN_TOTAL       = 2500   # combined USDC across all wallets
+SWARM_DOMINANCE_PCT   = 0.60   # single wallet cap (above = Phase 2 territory)
+
+# Event aggregation (v6.23) -- one wallet's flow across sibling markets of an /events container
+EVENT_FLOW_WINDOW     = 6 * 3600  # only trades this recent count (bounds first / full-refresh scans)
+EVENT_MIN_MARKETS     = 2      # sibling markets the wallet must have traded in the flow direction
+EVENT_MIN_TOTAL       = 2000   # USDC net directional flow across the siblings
+EVENT_MAX_LEG_PCT     = 0.80   # one sibling above this share = a single-market move, not an event one
+
 # Phase 3 -- Liquidity Shock Detection
 LIQUIDITY_SHOCK_PCT    = 0.20  # 20% drop from last scan triggers shock flag
-LIQUIDITY_HISTORY_FILE = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'liquidity_history.json')
+LIQUIDITY_HISTORY_FILE = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'liquidity_history.json')  # pre-v6.16, migration source
+LIQUIDITY_STORE_FILE   = liquidity_store.STORE_FILE
+
+# Incremental trade fetch (v6.7)
+TRADE_PAGE_SIZE       = 100    # /trades page size
+TRADE_MAX_PAGES       = 10     # max pages walked back per market per scan
+CURSOR_MAX_AGE_DAYS   = 30     # drop cursors for markets idle this long
+TRADE_CURSOR_FILE     = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'trade_cursors.json')
+TRADE_TAPE_DB         = trade_tape.TAPE_DB
+EMITTED_WINDOWS_FILE  = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'emitted_windows.json')
+EMITTED_MAX_AGE_HOURS = 24     # alerted cluster / swarm / event windows remembered this long
+
+# Change-detection prefilter (v6.15)
+CHANGE_MIN_VOLUME     = 1.0    # USD of new volume that counts as trading
+CHANGE_MIN_PRICE      = 0.001  # lastTradePrice move
+CHANGE_MIN_LIQ_PCT    = 0.02   # liquidity move vs last fetch
+CHANGE_USE_UPDATED_AT = True   # any updatedAt bump counts as a change
+FULL_REFRESH_EVERY    = 12     # scans between forced full refreshes (12 x 2h = daily)
+LISTING_SNAPSHOT_FILE = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'listing_snapshot.json')
+
+# Listing-only surge scoring (v6.25) -- volume / price velocity from listing fields vs last scan
+SURGE_EWMA_ALPHA      = 0.3    # weight of the newest volume rate in the per-market baseline
+SURGE_MAX_GAP_HOURS   = 12     # previous listing older than this is not compared against
+VOLUME_SURGE_RATIO    = 3.0    # volume rate this many x the baseline ...
+VOLUME_SURGE_MIN_USD  = 5000   # ... and at least this much new volume since the last scan
+PRICE_VELOCITY_MIN    = 0.03   # lastTradePrice move per hour that counts as fast
+SURGE_TOP_N           = 10     # candidates printed per scan
+
+# Scheduled mode (v6.26) -- per-market next-scan times, see scripts/scan_scheduler.py
+SCHEDULE_TICK_MINUTES   = 2    # --scheduled: one tick (due markets within the budget) this often
+LISTING_REFRESH_MINUTES = 60   # --scheduled: listing + Phase 3 liquidity sample at most this often
 
 # Phase 4 -- Informed Wallet Detection
 EVAL_DELAY_HOURS      = 6      # hours after trade to evaluate price movement
@@ -69,8 +326,18 @@ ELITE_WALLET_SCORE    = 0.80   # score threshold for Elite Wallet tier
 MIN_PRICE_MOVE        = 0.04   # minimum price move to count as meaningful win
 MM_MIN_TRADES         = 50     # market maker detection: trade count threshold
 MM_MAX_ACCURACY       = 0.55   # market maker detection: accuracy ceiling
-WALLET_STATS_FILE     = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'wallet_stats.json')
-PENDING_EVALS_FILE    = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'pending_wallet_evals.json')
+WALLET_DECAY_HALF_LIFE_DAYS = 90   # an eval's weight halves every 90 days (v6.21)
+WALLET_PRIOR_A        = 2.0    # Beta prior on accuracy: 2 pseudo-wins ...
+WALLET_PRIOR_B        = 2.0    # ... and 2 pseudo-losses (shrinks small samples toward 50%)
+WALLET_STATS_FILE     = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'wallet_stats.json')  # pre-v6.18, migration source
+WALLET_DB             = wallet_store.WALLET_DB
+PENDING_EVALS_FILE    = os.path.join(os.path.dirname(__file__), '..', 'paper_trading', 'pending_wallet_evals.json')  # pre-v6.19, migration source
+EVAL_HORIZON          = f"{EVAL_DELAY_HOURS}h"   # checkpoint that drives the main wallet tier
+EVAL_HORIZONS         = {"1h": 1, "6h": 6, "24h": 24, "res": None}   # checkpoint -> hours after trade (None = resolution)
+BOOST_HORIZON         = "24h"  # checkpoint whose tier boosts signals (None = main tier only)
+RESOLUTION_RECHECK_HOURS = 24  # "res" checkpoint of a still-open market is retried this much later
+RESOLUTION_MAX_DAYS   = 120    # ... and dropped once the trade is this old
+EVAL_PRICE_GRACE_HOURS = 24    # a 1h/6h/24h checkpoint still unpriced this long after it fell due is dropped
 
 STAGE_CONFIG = {
     1: {"min_days": 1,  "max_days": 7,  "whale_min": 400,  "label": "TACTICAL"},
@@ -82,9 +349,20 @@ STAGE_CONFIG = {
 TOTAL_MARKETS_TARGET = 500
 TOTAL_EVENTS_TARGET  = 1000
 PAGE_SIZE            = 100
+LISTING_WORKERS      = 4      # offset pages in flight per listing endpoint
+# v6.14: listing filters pushed to Gamma + fields kept after decode
+LISTING_MIN_LIQUIDITY     = min(MIN_LIQUIDITY, NULL_DATE_MIN_LIQ)  # exact per-market bar still in filter_liquid_markets
+LISTING_END_DATE_PUSHDOWN = False  # end_date_min/max would also drop null-date (Open Horizon) markets
+MARKET_FIELDS = ("id","conditionId","condition_id","question","slug","outcomes","outcomePrices","clobTokenIds",
+                 "liquidity","liquidityNum","volume","volumeNum","volume24hr","lastTradePrice","bestBid","bestAsk",
+                 "oneHourPriceChange","oneDayPriceChange","updatedAt","endDate","endDateIso","end_date","end_date_iso",
+                 "negRisk","acceptingOrders","active","closed")
+EVENT_FIELDS  = ("id","title","slug","liquidity","endDate","markets")
+TRADE_FETCH_WORKERS  = 8      # /trades requests in flight during the market scan
 TELEGRAM_BOT_TOKEN   = os.getenv("TEMEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID     = os.getenv("TELEGRAM_CHAT_ID")
 SIGNALS_OUTPUT       = os.path.join(os.path.dirname(__file__), "whale_signals.json")
+SIGNALS_KEEP_HOURS   = 2        # --scheduled --json: signals stay in SIGNALS_OUTPUT this long (old cron cadence)
 
 def get_divergence_threshold(days, is_sports=False):
     if days <= 7:    base = 0.08
@@ -101,70 +379,112 @@ def get_whale_min_for_days(days, is_sports=False):
     elif days <= 60: return 3500
     else:            return 7000
 
-CATEGORY_KEYWORDS = {
-    "geopolitics":   ["war","iran","russia","ukraine","israel","gaza","nato","sanction","nuclear","ceasefire","conflict","military","attack","strike","invasion","troops","missile","hormuz","regime","forces enter"],
-    "economics":     ["fed","interest rate","inflation","gdp","recession","unemployment","tariff","trade","debt","deficit","treasury","cpi","pce","shutdown","budget","federal reserve"],
-    "entertainment": ["oscar","academy award","grammy","emmy","golden globe","box office","film","movie","album","award"],
-    "sports":        ["nba","nfl","nhl","mlb","tennis","soccer","football","basketball","baseball","hockey","mls","ufc","f1","formula","match","game","series","championship","playoff","tournament","wimbledon","bnp","open","cup","league","warriors","lakers","celtics","masters","pga"],
-    "crypto":        ["bitcoin","btc","ethereum","eth","crypto","coin","token","blockchain","defi","solana","base"],
-    "politics":      ["election","president","congress","senate","vote","poll","democrat","republican","trump","biden","harris"],
-}
-CATEGORY_PRIORITY = {"geopolitics":1,"economics":2,"entertainment":3,"sports":4,"politics":5,"crypto":6,"other":7}
+CATEGORY_KEYWORDS = category_classifier.CATEGORY_KEYWORDS
+CATEGORY_PRIORITY = category_classifier.CATEGORY_PRIORITY
 
 def detect_category(q):
-    q = q.lower()
-    for cat, kws in CATEGORY_KEYWORDS.items():
-        if any(kw in q for kw in kws): return cat
-    return "other"
+    return category_classifier.classify(q)
 
 # --- DATA FETCHING (v6.0: TWOsources) ---
 
-def fetch_markets(total=TOTAL_MARKETS_TARGET, page_size=PAGE_SIZE):
-    """Original /markets endpoint fetch."""
-    markets, offset, page = [], 0, 1
-    while len(markets) < total:
-        try:
-            resp  = requests.get(f"{GAMMA_API}/markets", params={"active":"true","closed":"false","limit":page_size,"offset":offset}, timeout=10)
-            resp.raise_for_status()
-            data  = resp.json()
-            batch = data if isinstance(data, list) else data.get("data", [])
-            if not batch: print(f"[+] /markets stopped page {page}"); break
-            markets.extend(batch)
-            print(f"[+] Page {page}: {len(batch)} markets (total: {len(markets)})")
+def _project(item, fields):
+    return {k: item[k] for k in fields if k in item}
+
+def project_event(event):
+    """Keep EVENT_FIELDS, with nested markets cut down to MARKET_FIELDS."""
+    ev = _project(event, EVENT_FIELDS)
+    ev["markets"] = [_project(m, MARKET_FIELDS) for m in event.get("markets") or []]
+    return ev
+
+def listing_params(endpoint):
+    """v6.14: server-side filters for a Gamma listing endpoint."""
+    params = {"active":"true","closed":"false","ascending":"false"}
+    if endpoint == "markets":
+        params.update({"liquidity_num_min": LISTING_MIN_LIQUIDITY, "order": "liquidityNum"})
+    else:
+        params.update({"liquidity_min": LISTING_MIN_LIQUIDITY, "order": "liquidity"})  # event liquidity >= any sub-market's
+    if LISTING_END_DATE_PUSHDOWN:
+        now = datetime.now(timezone.utc)
+        params.update({"end_date_min": now.isoformat(), "end_date_max": (now + timedelta(days=MAX_HORIZON_DAYS + 1)).isoformat()})
+    return params
+
+def listing_bytes():
+    """Bytes pulled so far from the Gamma listing endpoints (http_client stats)."""
+    host = GAMMA_API.split("//", 1)[1]
+    return sum(v["bytes"] for k, v in http_client.stats().items() if k in (f"{host}/markets", f"{host}/events"))
+
+def _fetch_listing_pages(endpoint, total, page_size, workers, project=None):
+    """
+    Walk the offset pages of a Gamma listing endpoint with up to `workers` pages in flight.
+    Pages are consumed strictly in offset order, so the output matches a sequential walk.
+    The first empty/short/failed page ends the walk; prefetched pages past it are discarded.
+    `project` is applied to every item right after decode.
+    """
+    max_pages = -(-total // page_size)
+    params    = listing_params(endpoint)
+    def fetch_page(page):
+        t0   = time.monotonic()
+        resp = http_client.get(f"{GAMMA_API}/{endpoint}", params=dict(params, limit=page_size, offset=(page - 1) * page_size), timeout=10)
+        resp.raise_for_status()
+        data = resp.json()
+        data = data if isinstance(data, list) else data.get("data", [])
+        return ([project(d) for d in data] if project else data), time.monotonic() - t0
+
+    items, page_secs, inflight = [], [], {}
+    t_start, next_page, page = time.monotonic(), 1, 1
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        while page <= max_pages and len(items) < total:
+            while next_page <= max_pages and len(inflight) < max(1, workers):
+                inflight[next_page] = pool.submit(fetch_page, next_page); next_page += 1
+            try:
+                batch, secs = inflight.pop(page).result()
+            except Exception as e:
+                print(f"[x] /{endpoint} page {page} failed: {e}"); break
+            page_secs.append(secs)
+            if not batch: print(f"[+] /{endpoint} stopped page {page}"); break
+            items.extend(batch)
+            print(f"[+] /{endpoint} page {page}: {len(batch)} in {secs*1000:.0f}ms (total: {len(items)})")
             if len(batch) < page_size: break
-            offset += page_size; page += 1
-        except Exception as e:
-            print(f"[x] /markets page {page} failed: {e}"); break
+            page += 1
+    finally:
+        for fut in inflight.values(): fut.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+    if page_secs:
+        print(f"[+] /{endpoint} listing: {len(page_secs)} page(s) in {time.monotonic()-t_start:.2f}s "
+              f"(avg {sum(page_secs)/len(page_secs)*1000:.0f}ms/page, max {max(page_secs)*1000:.0f}ms, {workers} worker(s))")
+    return items
+
+def fetch_markets(total=TOTAL_MARKETS_TARGET, page_size=PAGE_SIZE, workers=LISTING_WORKERS):
+    """Original /markets endpoint fetch."""
+    markets = _fetch_listing_pages("markets", total, page_size, workers, lambda m: _project(m, MARKET_FIELDS))
     print(f"[+] /markets total: {len(markets)}")
     return markets[:total]
 
-def fetch_events(total=TOTAL_EVENTS_TARGET, page_size=PAGE_SIZE):
+def fetch_events(total=TOTAL_EVENTS_TARGET, page_size=PAGE_SIZE, workers=LISTING_WORKERS):
     """NEW v6.0: /events endpoint -- source for Iran, Hormuz, ceasefire, geopolitics markets."""
-    all_events, offset, page = [], 0, 1
-    while len(all_events) < total:
-        try:
-            resp  = requests.get(f"{GAMMA_API}/events", params={"active":"true","closed":"false","limit":page_size,"offset":offset}, timeout=10)
-            resp.raise_for_status()
-            data  = resp.json()
-            batch = data if isinstance(data, list) else data.get("data", [])
-            if not batch: print(f"[+] /events stopped page {page}"); break
-            all_events.extend(batch)
-            if len(batch) < page_size: break
-            offset += page_size; page += 1
-        except Exception as e:
-            print(f"[x] /events page {page} failed: {e}"); break
+    all_events = _fetch_listing_pages("events", total, page_size, workers, project_event)
 
     flat = []
     for event in all_events:
         event_title = event.get("title", "")
+        event_id    = str(event.get("id") or "")
         for m in event.get("markets", []):
             m["_parent_event_title"] = event_title
+            m["_parent_event_id"]    = event_id
             m["_from_events_api"]    = True
             flat.append(m)
 
     print(f"[+] /events total: {len(all_events)} events -> {len(flat)} sub-markets flattened")
     return flat
 
+def fetch_listing_sources(workers=LISTING_WORKERS):
+    """v6.4: fetch /markets and /events at the same time. Returns (markets_flat, events_flat)."""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        markets_fut = pool.submit(fetch_markets, workers=workers)
+        events_fut  = pool.submit(fetch_events,  workers=workers)
+        return markets_fut.result(), events_fut.result()
+
 def merge_market_sources(markets_flat, events_flat):
     """Merge /markets + /events by conditionId. /markets canonical for price/liquidity."""
     merged = {}
@@ -189,6 +509,7 @@ def merge_market_sources(markets_flat, events_flat):
                 existing["liquidityNum"] = events_liq
             if not existing.get("_parent_event_title") and m.get("_parent_event_title"):
                 existing["_parent_event_title"] = m["_parent_event_title"]
+                existing["_parent_event_id"]    = m.get("_parent_event_id", "")
             events_enriched += 1
 
     result = list(merged.values())
@@ -210,54 +531,66 @@ def filter_liquid_markets(markets):
             end_str = m.get("endDateIso") or m.get("endDate") or ""
             min_liq = NULL_DATE_MIN_LIQ if not end_str else MIN_LIQUIDITY
             if liq < min_liq: sk_liq += 1; continue
-            m["_category"] = detect_category(m.get("question",""))
+            m["_category"] = category_classifier.classify_market(m.get("conditionId"), m.get("question",""))
             liquid.append(m)
         except: continue
+    category_classifier.save_cache()
     print(f"[+] {len(liquid)} markets passed filters (skipped: {sk_negrisk} negRisk | {sk_notaccept} not accepting | {sk_nullprice} null price | {sk_liq} low liq)")
     return liquid
 
-def filter_by_resolution(markets, min_days, max_days):
-    """Filter by resolution window. Returns (dated_markets, null_date_markets)."""
-    filtered = []
-    null_date = []
+# day -> stage lookup for every day covered by STAGE_CONFIG (stage windows are contiguous)
+_STAGE_BY_DAY = {d: sn for sn, cfg in STAGE_CONFIG.items() for d in range(cfg["min_days"], cfg["max_days"] + 1)}
+
+def bucket_by_resolution(markets):
+    """
+    v6.9: One pass over `markets`: parse each end date once, tag it, and bucket it.
+    Returns {1: [...], 2: [...], 3: [...], 4: [...], "open": [...]} where 1-4 are the
+    STAGE_CONFIG day windows and "open" holds null-date (Open Horizon) markets.
+    Expired, beyond-horizon and unparseable markets are dropped (counted in the log line).
+    """
+    buckets = {sn: [] for sn in STAGE_CONFIG}
+    buckets["open"] = []
     now = datetime.now(timezone.utc)
-    sp = sf = sn = 0
+    sp = sf = sb = 0
     for m in markets:
         end_str = m.get("endDateIso") or m.get("end_date_iso") or m.get("endDate") or m.get("end_date") or ""
         if not end_str:
             m["_days_to_resolve"] = 999
             m["_end_date_iso"]    = ""
             m["_null_date"]       = True
-            null_date.append(m)
-            sn += 1
+            buckets["open"].append(m)
             continue
         try:
             end_dt = datetime.fromisoformat(end_str.replace("Z","+00:00"))
             if end_dt.tzinfo is None: end_dt = end_dt.replace(tzinfo=timezone.utc)
             d = (end_dt - now).days
-            if d < min_days: sp += 1; continue
-            if d > max_days: sf += 1; continue
-            m["_days_to_resolve"] = d
-            m["_end_date_iso"]    = end_str
-            m["_null_date"]       = False
-            filtered.append(m)
-        except: sn += 1
-    print(f"[+] Resolution ({min_days}-{max_days}d): {len(filtered)} pass (skip: {sp} expired, {sf} too far, {sn} no date -> {len(null_date)} Open Horizon)")
-    return filtered, null_date
+        except: sb += 1; continue
+        sn = _STAGE_BY_DAY.get(d)
+        if sn is None:
+            if d < STAGE_CONFIG[1]["min_days"]: sp += 1
+            else:                               sf += 1
+            continue
+        m["_days_to_resolve"] = d
+        m["_end_date_iso"]    = end_str
+        m["_null_date"]       = False
+        buckets[sn].append(m)
+    sizes = " | ".join(f"S{sn} {len(buckets[sn])}" for sn in STAGE_CONFIG)
+    print(f"[+] Resolution index: {sizes} | Open Horizon {len(buckets['open'])} (skip: {sp} expired, {sf} too far, {sb} bad date)")
+    return buckets
 
 def run_stage_expansion(liquid_markets, force_stage=None):
     """Stage expansion. Null-date Open Horizon markets always appended to scan list."""
-    _, all_null_date = filter_by_resolution(liquid_markets, -9999, 9999)
+    buckets       = bucket_by_resolution(liquid_markets)
+    all_null_date = buckets["open"]
 
     if force_stage is not None:
         cfg = STAGE_CONFIG[force_stage]
-        dated, _ = filter_by_resolution(liquid_markets, cfg["min_days"], cfg["max_days"])
         print(f"[i] Stage {force_stage} ({cfg['label']}) FORCED | +{len(all_null_date)} Open Horizon")
-        return dated + all_null_date, force_stage
+        return buckets[force_stage] + all_null_date, force_stage
 
     for sn in [1,2,3,4]:
         cfg     = STAGE_CONFIG[sn]
-        dated,_ = filter_by_resolution(liquid_markets, cfg["min_days"], cfg["max_days"])
+        dated   = buckets[sn]
         trigger = {1:STAGE2_TRIGGER, 2:STAGE3_TRIGGER, 3:STAGE4_TRIGGER, 4:0}[sn]
         if len(dated) >= trigger or sn == 4:
             print(f"[+] Stage {sn} {cfg['label']}: {len(dated)} markets | +{len(all_null_date)} Open Horizon")
@@ -265,19 +598,326 @@ def run_stage_expansion(liquid_markets, force_stage=None):
         print(f"[!] Stage {sn}: only {len(dated)} (< {trigger}) -- escalating")
     return all_null_date, 4
 
+# --- CHANGE DETECTION (v6.15) ---
+
+def _num(v):
+    try: return float(v)
+    except (TypeError, ValueError): return None
+
+def listing_state(market):
+    """Listing-level fields compared between scans."""
+    return {"vol": _num(market.get("volumeNum") or market.get("volume")),
+            "ltp": _num(market.get("lastTradePrice")),
+            "liq": _num(market.get("liquidityNum") or market.get("liquidity")),
+            "upd": market.get("updatedAt") or ""}
+
+def market_changed(prev, cur):
+    """True if `cur` moved past any CHANGE_* threshold since `prev` (the state at the last fetch)."""
+    if not prev: return True
+    if cur["vol"] is None or prev.get("vol") is None or cur["vol"] - prev["vol"] >= CHANGE_MIN_VOLUME: return True
+    if cur["ltp"] is not None and (prev.get("ltp") is None or abs(cur["ltp"] - prev["ltp"]) >= CHANGE_MIN_PRICE): return True
+    if cur["liq"] is not None and prev.get("liq"):
+        if abs(cur["liq"] - prev["liq"]) / prev["liq"] >= CHANGE_MIN_LIQ_PCT: return True
+    if CHANGE_USE_UPDATED_AT and cur["upd"] != prev.get("upd", ""): return True
+    return False
+
+def load_listing_snapshot():
+    """{"scan": n, "markets": {cid: listing_state at last trade fetch}}"""
+    try:
+        with open(LISTING_SNAPSHOT_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"scan": 0, "markets": {}}
+
+def save_listing_snapshot(snapshot):
+    try:
+        tmp = LISTING_SNAPSHOT_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, LISTING_SNAPSHOT_FILE)
+    except Exception as e:
+        print(f"  [x] Listing snapshot save failed: {e}")
+
+def score_listing_surges(markets, snapshot, now_ts):
+    """
+    v6.25: Score every listed market for volume surge and price velocity from listing
+    fields alone (no API calls). snapshot["listing"] holds, per market, the previous
+    scan's [volume, lastTradePrice, ts, baseline USD/hour]:
+
+        rate      (volume - prev volume) / hours since the previous scan
+        surge     rate / baseline   (baseline: EWMA of past rates, seeded from volume24hr / 24)
+        velocity  |lastTradePrice - prev| / hours   (oneHourPriceChange on first sight)
+        score     min(surge / VOLUME_SURGE_RATIO, 3) + min(velocity / PRICE_VELOCITY_MIN, 3)
+
+    A market is a "Volume Surge" candidate when surge >= VOLUME_SURGE_RATIO with at least
+    VOLUME_SURGE_MIN_USD new volume, or velocity >= PRICE_VELOCITY_MIN on that much volume.
+    Returns ({cid: score}, candidates sorted by score); snapshot["listing"] is rewritten
+    to this scan's listing.
+    """
+    prev_all = snapshot.get("listing", {})
+    listing, scores, candidates = {}, {}, []
+    for m in markets:
+        cid = m.get("conditionId") or m.get("condition_id") or m.get("id","")
+        vol = _num(m.get("volumeNum") or m.get("volume"))
+        if not cid or vol is None: continue
+        ltp  = _num(m.get("lastTradePrice"))
+        prev = prev_all.get(cid)
+        base = prev[3] if prev else (_num(m.get("volume24hr")) or 0.0) / 24
+        if not prev or not 0 < now_ts - prev[2] <= SURGE_MAX_GAP_HOURS * 3600:
+            listing[cid] = [vol, ltp, now_ts, base]
+            if prev is None and abs(_num(m.get("oneHourPriceChange")) or 0.0) >= PRICE_VELOCITY_MIN:
+                scores[cid] = min(abs(_num(m.get("oneHourPriceChange"))) / PRICE_VELOCITY_MIN, 3)
+            continue
+        hours    = (now_ts - prev[2]) / 3600
+        dvol     = max(vol - prev[0], 0.0)
+        rate     = dvol / hours
+        surge    = rate / max(base, VOLUME_SURGE_MIN_USD / 24)   # floor keeps dead markets from "surging" on one fill
+        velocity = abs(ltp - prev[1]) / hours if ltp is not None and prev[1] is not None else 0.0
+        score    = min(surge / VOLUME_SURGE_RATIO, 3) + min(velocity / PRICE_VELOCITY_MIN, 3)
+        listing[cid] = [vol, ltp, now_ts, base + SURGE_EWMA_ALPHA * (rate - base)]
+        if score <= 0: continue
+        scores[cid] = round(score, 3)
+        if dvol >= VOLUME_SURGE_MIN_USD and (surge >= VOLUME_SURGE_RATIO or velocity >= PRICE_VELOCITY_MIN):
+            candidates.append({
+                "market_id":       cid,
+                "market_name":     m.get("question", "Unknown"),
+                "market_slug":     m.get("slug", ""),
+                "parent_event":    m.get("_parent_event_title", ""),
+                "market_category": m.get("_category", "other"),
+                "volume_delta":    round(dvol, 2),
+                "volume_rate_hr":  round(rate, 2),
+                "baseline_hr":     round(base, 2),
+                "surge_ratio":     round(surge, 2),
+                "price_move":      round(ltp - prev[1], 4) if velocity else 0.0,
+                "price_velocity":  round(velocity, 4),
+                "hours":           round(hours, 2),
+                "score":           round(score, 3),
+                "signal_type":     "Volume Surge",
+            })
+    snapshot["listing"] = listing
+    candidates.sort(key=lambda c: -c["score"])
+    return scores, candidates
+
+def select_changed_markets(markets, snapshot, full_refresh=False, among=None):
+    """
+    v6.15: Markets whose trades need fetching this scan, as {conditionId: current listing
+    state}. The caller stores a market's state in snapshot["markets"] once its fetch has
+    succeeded (unchanged markets keep the state of their last fetch, so slow drifts still
+    add up to a change, and a failed fetch is retried next scan). Advances the scan counter.
+    v6.26: with `among` (a set of conditionIds) only those markets are considered.
+    """
+    scan   = snapshot.get("scan", 0) + 1
+    states = snapshot.setdefault("markets", {})
+    full   = full_refresh or scan % FULL_REFRESH_EVERY == 0
+    fetch  = {}
+    for m in markets:
+        cid = m.get("conditionId") or m.get("condition_id") or m.get("id","")
+        if not cid or (among is not None and cid not in among): continue
+        cur = listing_state(m)
+        if full or market_changed(states.get(cid), cur):
+            fetch[cid] = cur
+    snapshot["scan"] = scan
+    live = {m.get("conditionId") or m.get("condition_id") or m.get("id","") for m in markets}
+    for cid in [c for c in states if c not in live]:
+        del states[c]
+    saved = len((live if among is None else live & among) - {""}) - len(fetch)
+    if full:
+        print(f"[+] Change filter: full refresh (scan {scan}) -- fetching all {len(fetch)} markets")
+    else:
+        print(f"[+] Change filter: {len(fetch)} changed -> {saved} /trades fetches saved "
+              f"(full refresh in {FULL_REFRESH_EVERY - scan % FULL_REFRESH_EVERY} scan(s))")
+    return fetch
+
 # --- SIGNAL DETECTION (unchanged from v5.2) ---
 
 def get_recent_trades(cid, limit=100):
     try:
-        resp = requests.get(f"{DATA_API}/trades", params={"market":cid,"limit":limit,"offset":0}, timeout=10)
+        resp = http_client.get(f"{DATA_API}/trades", params={"market":cid,"limit":limit,"offset":0}, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         return data if isinstance(data, list) else data.get("data",[])
     except Exception as e:
         print(f"  [x] Trades failed {cid[:12]}: {e}"); return []
 
-def find_whale_trades(trades, market_liquidity, days_to_resolve, is_sports=False):
-    size_threshold = get_whale_min_for_days(days_to_resolve, is_sports)
+def trade_key(trade):
+    """Identity of one fill. A transaction can carry several fills, so the hash alone is not enough."""
+    return f"{trade.get('transactionHash','')}|{trade.get('proxyWallet','')}|{trade.get('asset') or trade.get('outcome','')}|{trade.get('size','')}"
+
+def load_trade_cursors():
+    """v6.7: Load per-market trade cursors {cid: {"ts": int, "keys": [...]}}."""
+    try:
+        with open(TRADE_CURSOR_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}  # first run -- every market starts with one page, as before
+
+def save_trade_cursors(cursors):
+    """v6.7: Atomically persist trade cursors, evicting markets idle > CURSOR_MAX_AGE_DAYS."""
+    try:
+        cutoff = time.time() - CURSOR_MAX_AGE_DAYS * 86400
+        live   = {cid: c for cid, c in cursors.items() if c.get("ts", 0) >= cutoff}
+        tmp = TRADE_CURSOR_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(live, f)
+        os.replace(tmp, TRADE_CURSOR_FILE)
+    except Exception as e:
+        print(f"  [x] Trade cursor save failed: {e}")
+
+def load_emitted_windows():
+    """Alerted windows {cid: {"A|wallet|outcome" | "S|outcome": window_end}, "event:<key>": {"E|wallet|dir": ts}}."""
+    try:
+        with open(EMITTED_WINDOWS_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_emitted_windows(emitted):
+    """Atomically persist alerted windows, dropping those older than EMITTED_MAX_AGE_HOURS."""
+    try:
+        cutoff = time.time() - EMITTED_MAX_AGE_HOURS * 3600
+        live   = {}
+        for cid, done in emitted.items():
+            done = {k: ts for k, ts in done.items() if ts >= cutoff}
+            if done: live[cid] = done
+        tmp = EMITTED_WINDOWS_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(live, f)
+        os.replace(tmp, EMITTED_WINDOWS_FILE)
+    except Exception as e:
+        print(f"  [x] Emitted windows save failed: {e}")
+
+def get_new_trades(cid, cursor, page_size=TRADE_PAGE_SIZE, max_pages=TRADE_MAX_PAGES):
+    """
+    v6.7: Fetch trades newer than `cursor`, newest first, paging back until the cursor is
+    reached, a short page arrives, or max_pages is hit. Without a cursor only the latest
+    page is read (same as get_recent_trades). Returns (new_trades, next_cursor).
+    On a fetch error (None, cursor) is returned: no trades and the old cursor, so the whole
+    unread range is retried next scan (partial pages would be processed twice).
+    """
+    cur_ts = int(cursor.get("ts", 0)) if cursor else 0
+    seen   = set(cursor.get("keys", [])) if cursor else set()
+    new, got, reached = [], set(), False
+    pages = max_pages if cursor else 1
+    for page in range(pages):
+        try:
+            resp = http_client.get(f"{DATA_API}/trades", params={"market":cid,"limit":page_size,"offset":page * page_size}, timeout=10)
+            resp.raise_for_status()
+            data  = resp.json()
+            batch = data if isinstance(data, list) else data.get("data",[])
+        except Exception as e:
+            print(f"  [x] Trades failed {cid[:12]} page {page + 1}: {e}")
+            return None, cursor  # drop the partial pages too: the whole range is re-read next scan
+        for t in batch:
+            try: ts = int(t.get("timestamp", 0))
+            except (TypeError, ValueError): continue
+            key = trade_key(t)
+            if ts < cur_ts or (ts == cur_ts and key in seen):
+                reached = True; continue
+            if key in got: continue   # offsets shift while new fills arrive
+            got.add(key); new.append(t)
+        if reached or len(batch) < page_size: break
+    else:
+        if cursor:
+            print(f"  [!] {cid[:12]}: >{pages * page_size} new trades since last scan -- oldest not fetched")
+    if not new:
+        return new, cursor
+    top_ts = max(int(t.get("timestamp", 0)) for t in new)
+    keys   = {trade_key(t) for t in new if int(t.get("timestamp", 0)) == top_ts}
+    if top_ts == cur_ts: keys |= seen
+    return new, {"ts": top_ts, "keys": sorted(keys)}
+
+def iter_market_trades(markets, workers=TRADE_FETCH_WORKERS, cursors=None, only=None, priority=None, failed=None):
+    """
+    v6.5: Fan trade fetches out over `markets` with at most `workers` requests in flight.
+    Yields (market, cid, trades) in the original market order as soon as that market has
+    arrived, so detection runs while later fetches are still on the wire. Markets without
+    a conditionId are skipped, same as the old loop.
+    v6.7: with `cursors` only trades newer than each market's cursor are fetched, and the
+    advanced cursor is written back into `cursors` as each market is yielded.
+    v6.15: with `only` (a set of conditionIds) other markets are yielded with no trades
+    and no request.
+    v6.25: with `priority` ({cid: score}) requests are submitted highest score first, so
+    the hottest markets reach the wire first. Yield order is still market order.
+    With `failed` (a set), conditionIds whose cursor fetch failed are added to it before
+    they are yielded (with no trades).
+    """
+    jobs = []
+    for market in markets:
+        cid = market.get("conditionId") or market.get("condition_id") or market.get("id","")
+        if cid: jobs.append((market, cid))
+    t0   = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures = [None] * len(jobs)
+    order   = range(len(jobs))
+    if priority:
+        order = sorted(order, key=lambda j: -priority.get(jobs[j][1], 0))  # stable: ties keep market order
+    for j in order:
+        cid = jobs[j][1]
+        if only is not None and cid not in only:
+            continue
+        elif cursors is None:
+            futures[j] = pool.submit(get_recent_trades, cid)
+        else:
+            futures[j] = pool.submit(get_new_trades, cid, cursors.get(cid))
+    n_trades = 0
+    n_fetch  = sum(1 for f in futures if f is not None)
+    try:
+        for (market, cid), fut in zip(jobs, futures):
+            if fut is None:
+                yield market, cid, []
+                continue
+            trades = fut.result()
+            if cursors is not None:
+                trades, cursor = trades
+                if trades is None:
+                    trades = []
+                    if failed is not None: failed.add(cid)
+                elif cursor: cursors[cid] = cursor
+            n_trades += len(trades)
+            yield market, cid, trades
+        mode = "new since cursor" if cursors is not None else "latest page"
+        print(f"[+] Trades: {n_fetch} markets fetched in {time.monotonic()-t0:.1f}s ({workers} worker(s)) | {n_trades} trades ({mode})")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _fill_id(trade):
+    """trade_key() with the size normalised, so an API fill and its tape row compare equal."""
+    try: size = round(float(trade.get("size") or 0), 6)
+    except (TypeError, ValueError): size = trade.get("size")
+    return (trade.get("transactionHash", ""), trade.get("proxyWallet", ""),
+            str(trade.get("asset") or trade.get("outcome", "")), size)
+
+def with_tape_lookback(tape, cid, trades, since):
+    """
+    `trades` plus the market's tape trades from `since` on (fills already in `trades`
+    dropped). Cursor scans only fetch new trades, so the windowed detectors (Phase 2,
+    Phase 6, event flow) take their lookback from the tape. Without a tape: `trades`.
+    """
+    if tape is None:
+        return trades
+    try:
+        older = trade_tape.query_trades(tape, market=cid, since=since)
+    except Exception as e:
+        print(f"  [x] Tape lookback failed {cid[:12]}: {e}")
+        return trades
+    seen = {_fill_id(t) for t in trades}
+    return trades + [t for t in older if _fill_id(t) not in seen]
+
+def _trade_usd(trade):
+    try: return float(trade.get("usdcSize") or trade.get("size", 0) or 0)
+    except (TypeError, ValueError): return 0.0
+
+def market_whale_min(sketches, cid, days_to_resolve, is_sports=False):
+    """
+    v6.24: Per-market whale bar -- max(static floor, p99 of the market's recent trade
+    sizes) once its size sketch has size_sketch.MIN_OBS trades; the floor alone before.
+    """
+    floor = get_whale_min_for_days(days_to_resolve, is_sports)
+    p99   = size_sketch.quantile(sketches, cid) if sketches is not None else None
+    return max(floor, p99) if p99 else floor
+
+def find_whale_trades(trades, market_liquidity, days_to_resolve, is_sports=False, whale_min=None):
+    size_threshold = whale_min if whale_min is not None else get_whale_min_for_days(days_to_resolve, is_sports)
     whales = []
     for trade in trades:
         try:
@@ -300,12 +940,21 @@ def find_whale_trades(trades, market_liquidity, days_to_resolve, is_sports=False
         except: continue
     return whales
 
-def find_whale_clusters(trades, market_liquidity, days_to_resolve, is_sports=False):
+def find_whale_clusters(trades, market_liquidity, days_to_resolve, is_sports=False, all_windows=False,
+                        min_end_ts=None, emitted=None):
     """
     Phase 2: Accumulation clustering.
     Groups trades by proxyWallet within CLUSTER_WINDOW seconds.
     Fires when a wallet makes >= MIN_TRADES_IN_CLUSTER trades totalling >= MIN_CLUSTER_TOTAL
     in the same direction within 30 minutes.
+    v6.10: two-pointer window -- each trade enters and leaves once, running USD total and
+    outcome counts screen every window in O(1). Windows that pass (or sit within float noise
+    of a threshold) are re-summed exactly so results match the old O(n^2) scan bit for bit.
+    all_windows=True: every qualifying window per wallet instead of the first one.
+    Lookback (cursor scans pass the tape's last CLUSTER_WINDOW as context): windows whose
+    last trade is older than min_end_ts were already seen by an earlier scan and are
+    skipped, as are windows starting at or before the end of an alerted cluster of the
+    same wallet/outcome (emitted: {"A|wallet|outcome": window_end}).
     """
     from collections import defaultdict
     wallet_trades = defaultdict(list)
@@ -330,203 +979,397 @@ def find_whale_clusters(trades, market_liquidity, days_to_resolve, is_sports=Fal
     for wallet, wtrades in wallet_trades.items():
         if len(wtrades) < MIN_TRADES_IN_CLUSTER: continue
         wtrades.sort(key=lambda t: t["ts"])
-        n = len(wtrades)
+        n   = len(wtrades)
+        ts  = [t["ts"] for t in wtrades]
+        usd = [t["usd"] for t in wtrades]
+        tol = 1e-9 * sum(usd)            # bound on running-sum drift for this wallet
+        end, run_usd, outcome_n = 0, 0.0, {}
         for start in range(n):
-            window = [wtrades[start]]
-            for end in range(start + 1, n):
-                if wtrades[end]["ts"] - wtrades[start]["ts"] <= CLUSTER_WINDOW:
-                    window.append(wtrades[end])
-                else:
-                    break
-            if len(window) < MIN_TRADES_IN_CLUSTER: continue
-            outcomes = set(t["outcome"] for t in window)
-            if len(outcomes) > 1: continue  # mixed direction -- not coordinated
-            total_usd = sum(t["usd"] for t in window)
-            if total_usd < MIN_CLUSTER_TOTAL: continue
+            while end < n and ts[end] - ts[start] <= CLUSTER_WINDOW:
+                run_usd += usd[end]
+                oc = wtrades[end]["outcome"]
+                outcome_n[oc] = outcome_n.get(oc, 0) + 1
+                end += 1
+            try:
+                if end - start < MIN_TRADES_IN_CLUSTER: continue
+                if len(outcome_n) > 1: continue  # mixed direction -- not coordinated
+                if min_end_ts is not None and ts[end - 1] < min_end_ts: continue  # no new trade in it
+                if emitted and ts[start] <= emitted.get(f"A|{wallet}|{next(iter(outcome_n))}", -1): continue
+                if run_usd < MIN_CLUSTER_TOTAL - tol: continue
+                if run_usd <= liq * 0.5 - tol and run_usd / liq < MIN_IMPACT_RATIO - tol / liq: continue
+                window    = wtrades[start:end]
+                total_usd = sum(t["usd"] for t in window)
+                if total_usd < MIN_CLUSTER_TOTAL: continue
+                impact = total_usd / liq
+                if total_usd > liq * 0.5:
+                    print(f"  [!] Cluster manip guard: ${total_usd:,.0f} vs ${liq:,.0f} liq ({impact*100:.1f}%) -- skip")
+                    continue
+                if impact < MIN_IMPACT_RATIO: continue
+                outcome   = window[0]["outcome"]
+                avg_price = sum(t["price"] for t in window) / len(window)
+                span_mins = (window[-1]["ts"] - window[0]["ts"]) / 60
+                clusters.append({
+                    "wallet":       wallet,
+                    "direction":    "BUY",
+                    "size_usd":     round(total_usd, 2),
+                    "price":        round(avg_price, 4),
+                    "outcome":      outcome,
+                    "impact_ratio": round(impact, 5),
+                    "trade_count":  len(window),
+                    "span_mins":    round(span_mins, 1),
+                    "window_start": window[0]["ts"],
+                    "window_end":   window[-1]["ts"],
+                    "signal_type":  "Whale Accumulation",
+                })
+                if not all_windows: break  # one cluster per wallet per market
+            finally:
+                run_usd -= usd[start]
+                oc = wtrades[start]["outcome"]
+                outcome_n[oc] -= 1
+                if not outcome_n[oc]: del outcome_n[oc]
+    return clusters
+
+def find_swarm_activity(trades, market_liquidity, min_end_ts=None, emitted=None):
+    """
+    Phase 6: Swarm detection (COORDINATED ENTRY).
+    Fires when >= SWARM_MIN_WALLETS distinct wallets BUY >= SWARM_MIN_TOTAL of the same
+    outcome within SWARM_WINDOW seconds and no wallet holds more than SWARM_DOMINANCE_PCT
+    of that volume (above it the move is one wallet's -- Phase 2 reports it instead).
+    One sliding window per outcome: each trade enters and leaves once, per-wallet totals
+    and the running total are updated in O(1), and the largest wallet is read from a lazy
+    max-heap (entries whose total has since changed are dropped as they surface).
+    Qualifying windows are re-summed exactly, as in find_whale_clusters().
+    Returns at most one swarm per outcome (the first qualifying window).
+    min_end_ts / emitted ("S|outcome": window_end) skip already-seen and already-alerted
+    windows, as in find_whale_clusters().
+    """
+    by_outcome = {}
+    for trade in trades:
+        try:
+            wallet = trade.get("proxyWallet", "unknown")
+            if wallet == "unknown": continue
+            if str(trade.get("side", "BUY")).upper() != "BUY": continue  # a SELL exits, it is not an entry
+            ts  = int(trade.get("timestamp", 0))
+            usd = float(trade.get("usdcSize") or trade.get("size", 0) or 0)
+            if usd <= 0 or ts <= 0: continue
+            by_outcome.setdefault(trade.get("outcome", "Yes"), []).append(
+                (ts, wallet, usd, float(trade.get("price", 0.5))))
+        except: continue
+
+    swarms = []
+    liq = max(market_liquidity, 1)
+    for outcome, rows in by_outcome.items():
+        if len(rows) < SWARM_MIN_WALLETS: continue
+        rows.sort(key=lambda r: r[0])
+        tol = 1e-9 * sum(r[2] for r in rows)   # bound on running-sum drift for this outcome
+        totals, heap, run_usd, start, guarded = {}, [], 0.0, 0, False
+        for end, (ts, wallet, usd, _) in enumerate(rows):
+            totals[wallet] = totals.get(wallet, 0.0) + usd
+            run_usd += usd
+            heapq.heappush(heap, (-totals[wallet], wallet))
+            while ts - rows[start][0] > SWARM_WINDOW:
+                _, w_old, u_old, _ = rows[start]
+                totals[w_old] -= u_old
+                run_usd -= u_old
+                if totals[w_old] <= tol: del totals[w_old]
+                else: heapq.heappush(heap, (-totals[w_old], w_old))
+                start += 1
+            if len(totals) < SWARM_MIN_WALLETS or run_usd < SWARM_MIN_TOTAL - tol: continue
+            if min_end_ts is not None and ts < min_end_ts: continue
+            if emitted and rows[start][0] <= emitted.get(f"S|{outcome}", -1): continue
+            while totals.get(heap[0][1]) != -heap[0][0]:
+                heapq.heappop(heap)   # stale: that wallet's total changed after this entry
+            if -heap[0][0] > SWARM_DOMINANCE_PCT * run_usd + tol: continue
+            window = rows[start:end + 1]
+            by_wallet = {}
+            for _, w, u, _ in window:
+                by_wallet[w] = by_wallet.get(w, 0.0) + u
+            total_usd = sum(by_wallet.values())
+            top_w     = max(by_wallet, key=by_wallet.get)
+            if (len(by_wallet) < SWARM_MIN_WALLETS or total_usd < SWARM_MIN_TOTAL
+                    or by_wallet[top_w] > SWARM_DOMINANCE_PCT * total_usd): continue
             impact = total_usd / liq
             if total_usd > liq * 0.5:
-                print(f"  [!] Cluster manip guard: ${total_usd:,.0f} vs ${liq:,.0f} liq ({impact*100:.1f}%) -- skip")
+                if not guarded:  # once per outcome -- every later window overlaps this one
+                    print(f"  [!] Swarm manip guard: ${total_usd:,.0f} vs ${liq:,.0f} liq ({impact*100:.1f}%) -- skip")
+                    guarded = True
                 continue
-            if impact < MIN_IMPACT_RATIO: continue
-            outcome   = window[0]["outcome"]
-            avg_price = sum(t["price"] for t in window) / len(window)
-            span_mins = (window[-1]["ts"] - window[0]["ts"]) / 60
-            clusters.append({
-                "wallet":       wallet,
-                "direction":    "BUY",
-                "size_usd":     round(total_usd, 2),
-                "price":        round(avg_price, 4),
-                "outcome":      outcome,
-                "impact_ratio": round(impact, 5),
-                "trade_count":  len(window),
-                "span_mins":    round(span_mins, 1),
-                "signal_type":  "Whale Accumulation",
+            avg_price = sum(u * p for _, _, u, p in window) / total_usd
+            swarms.append({
+                "wallet":              top_w,   # largest contributor (Phase 4 lookup)
+                "wallets":             sorted(by_wallet, key=by_wallet.get, reverse=True),
+                "wallet_count":        len(by_wallet),
+                "direction":           "BUY",
+                "size_usd":            round(total_usd, 2),
+                "price":               round(avg_price, 4),
+                "outcome":             outcome,
+                "impact_ratio":        round(impact, 5),
+                "trade_count":         len(window),
+                "window_seconds":      window[-1][0] - window[0][0],
+                "span_mins":           round((window[-1][0] - window[0][0]) / 60, 1),
+                "window_start":        window[0][0],
+                "window_end":          window[-1][0],
+                "dominant_wallet_pct": round(by_wallet[top_w] / total_usd * 100, 1),
+                "signal_type":         "Swarm",
             })
-            break  # one cluster per wallet per market
-    return clusters
+            break  # one swarm per outcome per market
+    return swarms
 
-def load_liquidity_history():
-    """Phase 3: Load persisted liquidity snapshots from previous scan."""
-    try:
-        with open(LIQUIDITY_HISTORY_FILE) as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}  # safe first-run -- no history yet
+def event_key(market):
+    """Grouping key for sibling markets: parent event id, else its title; "" for standalone markets."""
+    return market.get("_parent_event_id") or market.get("_parent_event_title") or ""
 
-def save_liquidity_history(history):
-    """Phase 3: Persist liquidity snapshots for next scan comparison."""
-    try:
-        import tempfile, os as _os
-        tmp = LIQUIDITY_HISTORY_FILE + ".tmp"
-        with open(tmp, "w") as f:
-            json.dump(history, f, indent=2)
-        _os.replace(tmp, LIQUIDITY_HISTORY_FILE)  # atomic write
-    except Exception as e:
-        print(f"  [x] Liq history save failed: {e}")
-
-def check_liquidity_shock(cid, current_liq, history):
+def build_event_index(markets):
     """
-    Phase 3: Compare current liquidity vs stored snapshot.
-    Returns (shock_detected, prev_liq, drop_pct).
-    shock_detected=False on first run (no history) or if drop < threshold.
+    v6.23: Event index, built once per scan over the scan list.
+    {event_key: {"title", "markets": {cid: question}, "liquidity", "flow": {}, "net_flow", "gross_flow"}}
+    Only events with >= 2 scanned members are kept -- a lone sub-market is covered by the
+    per-market phases. flow/net_flow/gross_flow are filled by add_event_flow().
     """
-    if cid not in history:
-        return False, 0.0, 0.0
-    prev = float(history[cid].get("liq", 0))
-    if prev <= 0 or current_liq <= 0:
-        return False, prev, 0.0
-    drop_pct = (prev - current_liq) / prev
-    if drop_pct >= LIQUIDITY_SHOCK_PCT:
-        return True, prev, drop_pct
-    return False, prev, drop_pct
-
-
-# ── Phase 4: Wallet Intelligence ─────────────────────────────────────────────
+    index = {}
+    for m in markets:
+        key = event_key(m)
+        cid = m.get("conditionId") or m.get("condition_id") or m.get("id","")
+        if not key or not cid: continue
+        ev = index.setdefault(key, {"title": m.get("_parent_event_title", ""), "markets": {}, "liquidity": 0.0,
+                                    "flow": {}, "net_flow": 0.0, "gross_flow": 0.0})
+        if cid in ev["markets"]: continue
+        ev["markets"][cid] = m.get("question", "")
+        ev["liquidity"]   += float(m.get("liquidityNum") or m.get("liquidity") or 0)
+    return {k: ev for k, ev in index.items() if len(ev["markets"]) >= 2}
+
+def add_event_flow(ev, cid, trades, since_ts):
+    """
+    Fold one sibling market's trades into its event entry (single pass, O(len(trades))).
+    Flow is signed YES exposure: BUY Yes / SELL No count +usd, BUY No / SELL Yes count -usd.
+    ev["flow"][wallet] = {cid: signed usd}; net_flow / gross_flow cover every wallet.
+    """
+    for trade in trades:
+        try:
+            wallet = trade.get("proxyWallet", "unknown")
+            if wallet == "unknown": continue
+            if int(trade.get("timestamp", 0)) < since_ts: continue
+            usd = float(trade.get("usdcSize") or trade.get("size", 0) or 0)
+            if usd <= 0: continue
+            sign = -1.0 if str(trade.get("outcome", "Yes")).lower() == "no" else 1.0
+            if str(trade.get("side", "BUY")).upper() == "SELL": sign = -sign
+            legs = ev["flow"].setdefault(wallet, {})
+            legs[cid] = legs.get(cid, 0.0) + sign * usd
+            ev["net_flow"]   += sign * usd
+            ev["gross_flow"] += usd
+        except: continue
 
-def load_wallet_stats():
-    """Load persistent wallet reputation database."""
-    try:
-        with open(WALLET_STATS_FILE) as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+def find_event_accumulation(index):
+    """
+    v6.23: Event Accumulation -- one wallet spreading size across sibling markets.
+    Fires when a wallet's net flow across an event is >= EVENT_MIN_TOTAL, comes from
+    >= EVENT_MIN_MARKETS siblings in that direction, and no sibling carries more than
+    EVENT_MAX_LEG_PCT of it (above that the move belongs to one market's Phase 1/2).
+    Impact is measured against the event's aggregate liquidity, with the same
+    MIN_IMPACT_RATIO floor and 50% manipulation guard as the per-market phases.
+    Returns signals sorted by net flow, largest first.
+    """
+    out = []
+    for key, ev in index.items():
+        liq = max(ev["liquidity"], 1)
+        for wallet, legs in ev["flow"].items():
+            net = sum(legs.values())
+            if abs(net) < EVENT_MIN_TOTAL: continue
+            sign    = 1.0 if net > 0 else -1.0
+            with_us = {cid: usd * sign for cid, usd in legs.items() if usd * sign > 0}
+            if len(with_us) < EVENT_MIN_MARKETS: continue
+            if max(with_us.values()) > EVENT_MAX_LEG_PCT * sum(with_us.values()): continue
+            impact = abs(net) / liq
+            if abs(net) > liq * 0.5:
+                print(f"  [!] Event manip guard: ${abs(net):,.0f} vs ${liq:,.0f} event liq ({impact*100:.1f}%) -- skip")
+                continue
+            if impact < MIN_IMPACT_RATIO: continue
+            out.append({
+                "event_id":        key,
+                "event_title":     ev["title"],
+                "wallet":          wallet,
+                "direction":       "YES" if sign > 0 else "NO",
+                "size_usd":        round(abs(net), 2),
+                "gross_usd":       round(sum(abs(u) for u in legs.values()), 2),
+                "market_count":    len(with_us),
+                "legs":            [{"market_id": cid, "market_name": ev["markets"][cid][:60], "usd": round(usd, 2)}
+                                    for cid, usd in sorted(with_us.items(), key=lambda kv: -kv[1])],
+                "impact_ratio":    round(impact, 5),
+                "event_liquidity": round(ev["liquidity"], 2),
+                "event_markets":   len(ev["markets"]),
+                "event_net_flow":  round(ev["net_flow"], 2),
+                "signal_type":     "Event Accumulation",
+            })
+    out.sort(key=lambda s: -s["size_usd"])
+    return out
 
-def save_wallet_stats(stats):
-    """Atomically persist wallet reputation database."""
+def open_liquidity_store():
+    """Phase 3 (v6.16): open the liquidity ring-buffer store, seeding it once from the old JSON."""
     try:
-        tmp = WALLET_STATS_FILE + ".tmp"
-        with open(tmp, "w") as f:
-            json.dump(stats, f, indent=2)
-        import os as _os; _os.replace(tmp, WALLET_STATS_FILE)
-    except Exception as e:
-        print(f"  [x] Wallet stats save failed: {e}")
+        store = liquidity_store.open_store(LIQUIDITY_STORE_FILE)
+    except ValueError as e:
+        print(f"  [x] {e} -- starting a fresh store")
+        os.replace(LIQUIDITY_STORE_FILE, LIQUIDITY_STORE_FILE + ".corrupt")
+        store = liquidity_store.open_store(LIQUIDITY_STORE_FILE)
+    if not store.index and os.path.exists(LIQUIDITY_HISTORY_FILE):
+        n = liquidity_store.migrate_json(store, LIQUIDITY_HISTORY_FILE)
+        print(f"[+] Liq store: migrated {n} markets from {os.path.basename(LIQUIDITY_HISTORY_FILE)}")
+    return store
+
+def check_liquidity_shock(cid, current_liq, store, detector):
+    """
+    Phase 3: Compare current liquidity vs the newest stored sample (O(1) store read) and
+    feed the market's streaming detector (v6.17, O(1) update of `detector` in place).
+    Returns (shock_detected, prev_liq, drop_pct, reason) -- reason: zscore / drawdown / drop / "".
+    Until the detector has MIN_OBS scans the LIQUIDITY_SHOCK_PCT drop rule decides.
+    """
+    last = liquidity_store.latest(store, cid)
+    prev = float(last[1]) if last else 0.0
+    shock, reason, _, _ = liquidity_detector.update(detector, cid, current_liq, prev, LIQUIDITY_SHOCK_PCT)
+    if prev <= 0 or current_liq <= 0:
+        return shock, prev, 0.0, reason
+    return shock, prev, (prev - current_liq) / prev, reason
 
-def load_pending_evals():
-    """Load queue of trades awaiting 6h price-movement evaluation."""
-    try:
-        with open(PENDING_EVALS_FILE) as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
 
-def save_pending_evals(evals):
-    """Atomically persist pending evaluation queue."""
-    try:
-        tmp = PENDING_EVALS_FILE + ".tmp"
-        with open(tmp, "w") as f:
-            json.dump(evals, f, indent=2)
-        import os as _os; _os.replace(tmp, PENDING_EVALS_FILE)
-    except Exception as e:
-        print(f"  [x] Pending evals save failed: {e}")
+# ── Phase 4: Wallet Intelligence ─────────────────────────────────────────────
 
-def fetch_current_yes_price(cid):
-    """Fetch current YES price for a market conditionId (used by eval engine)."""
-    try:
-        resp = requests.get(f"{GAMMA_API}/markets", params={"conditionIds": cid}, timeout=8)
-        resp.raise_for_status()
-        data = resp.json()
-        if isinstance(data, list) and data:
-            prices = data[0].get("outcomePrices", "")
-            return float(json.loads(prices)[0]) if prices else None
-        elif isinstance(data, dict):
-            prices = data.get("outcomePrices", "")
-            return float(json.loads(prices)[0]) if prices else None
-    except Exception:
-        pass
-    return None
-
-def process_pending_evals(pending, wallet_stats, now):
-    """
-    Phase 4: Evaluate trades whose eval_at time has passed.
-    Updates wallet_stats in place. Returns remaining (not yet due) evals.
-    """
-    from datetime import datetime, timezone
-    still_pending = []
-    evaluated = 0
-    for ev in pending:
+def open_wallet_store():
+    """v6.18: open the wallet reputation store, seeding it once from wallet_stats.json."""
+    conn = wallet_store.open_store(WALLET_DB)
+    if not wallet_store.wallet_count(conn) and os.path.exists(WALLET_STATS_FILE):
+        n = wallet_store.migrate_json(conn, WALLET_STATS_FILE)
+        print(f"[+] Wallet DB: migrated {n} wallets from {os.path.basename(WALLET_STATS_FILE)}")
+    if not wallet_store.get_meta(conn, "evals_migrated"):
+        n = wallet_store.migrate_evals_json(conn, PENDING_EVALS_FILE, EVAL_HORIZON)
+        wallet_store.set_meta(conn, "evals_migrated", int(time.time()))
+        if n:
+            print(f"[+] Wallet DB: queued {n} evals from {os.path.basename(PENDING_EVALS_FILE)}")
+    return conn
+
+def blank_wallet_stats(seen=None):
+    """Phase 4: counters of a wallet (or wallet-horizon) with no evaluated trades yet."""
+    return {"trades": 0, "wins": 0, "losses": 0, "accuracy": 0.0,
+            "total_move": 0.0, "avg_move_after_trade": 0.0,
+            "score": 0.0, "tier": "unknown", "last_seen": seen,
+            "w_trades": 0.0, "w_wins": 0.0, "w_move": 0.0, "decay_ts": 0}
+
+def fold_eval(ws, move, is_win, now, at_ts=None):
+    """
+    Phase 4: add one evaluated trade to a wallet's (or wallet-horizon's) counters.
+    The decayed counters (v6.21) weigh it as of at_ts (default now): a newer eval first
+    decays the existing weight to at_ts, an older one (backfill) enters pre-decayed.
+    Score and tier are set by the next rescore_wallets() pass.
+    """
+    ws["trades"]     += 1
+    ws["wins"]       += 1 if is_win else 0
+    ws["losses"]     += 0 if is_win else 1
+    ws["total_move"] = ws.get("total_move", 0.0) + abs(move)
+    ws["accuracy"]   = ws["wins"] / ws["trades"]
+    ws["avg_move_after_trade"] = ws["total_move"] / ws["trades"]
+    t    = int(at_ts if at_ts is not None else now.timestamp())
+    ref  = ws.get("decay_ts") or t
+    life = WALLET_DECAY_HALF_LIFE_DAYS * 86400
+    if t >= ref:
+        k = 0.5 ** ((t - ref) / life)
+        ws["w_trades"], ws["w_wins"], ws["w_move"] = ws["w_trades"] * k, ws["w_wins"] * k, ws["w_move"] * k
+        ws["decay_ts"], w = t, 1.0
+    else:
+        w = 0.5 ** ((ref - t) / life)
+    ws["w_trades"] += w
+    ws["w_wins"]   += w if is_win else 0.0
+    ws["w_move"]   += w * abs(move)
+    ws["last_seen"] = now.isoformat()
+    return ws
+
+def rescore_wallets(wallet_db, now):
+    """Phase 4 (v6.21): rescore every wallet and wallet-horizon row in one vectorized pass."""
+    import wallet_scoring  # NumPy
+    params = {"half_life_days": WALLET_DECAY_HALF_LIFE_DAYS, "prior_a": WALLET_PRIOR_A, "prior_b": WALLET_PRIOR_B,
+              "min_trades": MIN_TRADES_SCORING, "mm_min_trades": MM_MIN_TRADES, "mm_max_accuracy": MM_MAX_ACCURACY,
+              "smart": SMART_WALLET_SCORE, "elite": ELITE_WALLET_SCORE}
+    rows = changed = ms = 0
+    for table in wallet_store.SCORED_TABLES:
+        r = wallet_scoring.rescore(wallet_db, table, now.timestamp(), params)
+        rows, changed, ms = rows + r["rows"], changed + r["changed"], ms + r["ms"]
+    if rows:
+        print(f"[+] Wallet rescore: {rows:,} rows in {ms:.0f}ms ({changed:,} changed)")
+    return changed
+
+def process_pending_evals(wallet_db, now):
+    """
+    Phase 4: Evaluate queued checkpoints whose due time has passed (v6.19 indexed queue,
+    v6.20 horizons). Each due market is priced once (batched price_oracle lookup);
+    wallets are read only if they have due evals. Every checkpoint updates its
+    wallet_horizons row; EVAL_HORIZON also updates the main wallet row. "res"
+    checkpoints of markets that are still open, or that could not be priced, are
+    rescheduled. Fixed checkpoints that cannot be priced are retried each scan for
+    EVAL_PRICE_GRACE_HOURS, then dropped unscored. One transaction.
+    Returns the number of evals completed.
+    """
+    due = wallet_store.due_evals(wallet_db, now.timestamp())
+    if not due:
+        return 0
+    markets = price_oracle.get_markets({ev["market_id"] for ev in due})
+    wallets = {ev["wallet"] for ev in due}
+    stats   = wallet_store.get_wallets(wallet_db, wallets)
+    hstats  = wallet_store.get_horizon_stats(wallet_db, wallets)
+    updated, hupdated, done, later = {}, {}, [], []
+    by_horizon = {}
+    for ev in due:
         try:
-            eval_at = datetime.fromisoformat(ev["eval_at"])
-            if eval_at.tzinfo is None:
-                eval_at = eval_at.replace(tzinfo=timezone.utc)
-            if now < eval_at:
-                still_pending.append(ev); continue
-            # Due for evaluation
-            cid          = ev["market_id"]
-            wallet       = ev["wallet"]
-            entry_price  = float(ev["entry_price"])
-            outcome      = ev["outcome"]      # "Yes" or "No"
-            current_price = fetch_current_yes_price(cid)
+            wallet        = ev["wallet"]
+            horizon       = ev["horizon"]
+            entry_price   = float(ev["entry_price"])
+            outcome       = ev["outcome"]      # "Yes" or "No"
+            market        = markets.get(ev["market_id"])
+            current_price = price_oracle.outcome_price(market, "YES")
+            recorded      = datetime.fromisoformat(ev["recorded_at"]) if ev["recorded_at"] else now
+            if recorded.tzinfo is None: recorded = recorded.replace(tzinfo=timezone.utc)
+            if horizon == "res" and (now - recorded).days >= RESOLUTION_MAX_DAYS:
+                done.append(ev["id"]); continue  # never resolved inside the window: drop unscored
             if current_price is None:
-                still_pending.append(ev); continue  # can't fetch price, retry next scan
+                hours = EVAL_HORIZONS.get(horizon)
+                if hours is None:
+                    later.append((ev["id"], now.timestamp() + RESOLUTION_RECHECK_HOURS * 3600))
+                elif (now - recorded).total_seconds() > (hours + EVAL_PRICE_GRACE_HOURS) * 3600:
+                    done.append(ev["id"])  # the checkpoint's moment is long gone: drop unscored
+                continue  # otherwise retry next scan
+            if horizon == "res" and str(market.get("closed", "")).lower() != "true":
+                later.append((ev["id"], now.timestamp() + RESOLUTION_RECHECK_HOURS * 3600))
+                continue
             move = current_price - entry_price
             if outcome == "No": move = -move   # for NO buys, down is good
             is_win = move >= MIN_PRICE_MOVE
-            # Update wallet stats
-            ws = wallet_stats.get(wallet, {
-                "trades": 0, "wins": 0, "losses": 0, "accuracy": 0.0,
-                "total_move": 0.0, "avg_move_after_trade": 0.0,
-                "score": 0.0, "tier": "unknown", "last_seen": ev["recorded_at"]
-            })
-            ws["trades"]     += 1
-            ws["wins"]       += 1 if is_win else 0
-            ws["losses"]     += 0 if is_win else 1
-            ws["total_move"] = ws.get("total_move", 0.0) + abs(move)
-            ws["accuracy"]   = ws["wins"] / ws["trades"]
-            ws["avg_move_after_trade"] = ws["total_move"] / ws["trades"]
-            # Score: accuracy(60%) + avg_move(30%) + sample_weight(10%)
-            if ws["trades"] >= MIN_TRADES_SCORING:
-                score = (
-                    ws["accuracy"] * 0.6 +
-                    min(ws["avg_move_after_trade"] / 0.15, 1.0) * 0.3 +
-                    min(ws["trades"] / 20, 1.0) * 0.1
-                )
-                ws["score"] = round(score, 4)
-                # Market maker filter
-                if ws["trades"] >= MM_MIN_TRADES and ws["accuracy"] < MM_MAX_ACCURACY:
-                    ws["tier"] = "market_maker"
-                elif score >= ELITE_WALLET_SCORE:
-                    ws["tier"] = "elite"
-                elif score >= SMART_WALLET_SCORE:
-                    ws["tier"] = "smart"
-                else:
-                    ws["tier"] = "known"
-            else:
-                ws["tier"] = "unknown"
-            ws["last_seen"] = now.isoformat()
-            wallet_stats[wallet] = ws
-            evaluated += 1
-        except Exception as ex:
-            still_pending.append(ev)  # keep on error, retry next scan
-    if evaluated:
-        print(f"[+] Wallet evals: {evaluated} evaluated, {len(still_pending)} pending")
-    return still_pending
-
-def get_wallet_info(wallet, wallet_stats):
-    """Return wallet intelligence dict for a given address."""
-    ws = wallet_stats.get(wallet)
+            key = (wallet, horizon)
+            hs  = hstats.get(key) or blank_wallet_stats(ev["recorded_at"])
+            hstats[key] = hupdated[key] = fold_eval(hs, move, is_win, now)
+            if horizon == EVAL_HORIZON:
+                ws = stats.get(wallet) or blank_wallet_stats(ev["recorded_at"])
+                stats[wallet] = updated[wallet] = fold_eval(ws, move, is_win, now)
+            by_horizon[horizon] = by_horizon.get(horizon, 0) + 1
+            done.append(ev["id"])
+        except Exception:
+            continue  # keep on error, retry next scan
+    wallet_store.complete_evals(wallet_db, updated, done, hupdated, later)
+    if done or later:
+        per_h = " ".join(f"{h}={n}" for h, n in sorted(by_horizon.items()))
+        print(f"[+] Wallet evals: {len(done)} evaluated over {len(markets)} markets ({per_h or 'none scored'}), "
+              f"{len(later)} awaiting resolution, {wallet_store.eval_count(wallet_db)} pending")
+    return len(done)
+
+def get_wallet_info(wallet, wallet_db):
+    """
+    Return wallet intelligence dict for a given address (indexed lookups).
+    v6.20: the BOOST_HORIZON checkpoint's stats are used once it has MIN_TRADES_SCORING evals.
+    """
+    ws, horizon = wallet_store.get_wallet(wallet_db, wallet), EVAL_HORIZON
+    if BOOST_HORIZON and BOOST_HORIZON != EVAL_HORIZON:
+        hs = wallet_store.wallet_horizons(wallet_db, wallet).get(BOOST_HORIZON)
+        if hs and hs.get("trades", 0) >= MIN_TRADES_SCORING:
+            ws, horizon = hs, BOOST_HORIZON
     if not ws or ws.get("trades", 0) < MIN_TRADES_SCORING:
         return {"tier": "unknown", "trades": 0, "accuracy": 0.0, "score": 0.0,
-                "avg_move": 0.0, "wallet": wallet}
+                "avg_move": 0.0, "wallet": wallet, "horizon": horizon}
     return {
         "tier":     ws.get("tier", "unknown"),
         "trades":   ws.get("trades", 0),
@@ -534,27 +1377,32 @@ def get_wallet_info(wallet, wallet_stats):
         "score":    ws.get("score", 0.0),
         "avg_move": ws.get("avg_move_after_trade", 0.0),
         "wallet":   wallet,
+        "horizon":  horizon,
     }
 
-def record_wallet_trade(pending, wallet, cid, market_name, entry_price, outcome, now):
-    """Queue a trade for 6h price-movement evaluation. Dedup: one eval per wallet+market per scan."""
+def record_wallet_trade(wallet_db, wallet, cid, market_name, entry_price, outcome, now, end_date_iso=""):
+    """
+    Queue a trade for price-movement evaluation at every EVAL_HORIZONS checkpoint.
+    The "res" checkpoint is due at the market's end date (or RESOLUTION_RECHECK_HOURS
+    if it has none). Dedup: one pending eval per wallet+market+horizon (unique index).
+    All checkpoints are queued in one transaction (wallet_store.queue_evals).
+    """
     if wallet == "unknown": return
-    # Skip if already have a recent pending eval for this wallet+market
-    for ev in pending:
-        if ev["wallet"] == wallet and ev["market_id"] == cid:
-            return
-    from datetime import timedelta
-    eval_at = (now + timedelta(hours=EVAL_DELAY_HOURS)).isoformat()
-    pending.append({
-        "eval_id":    f"{wallet[:10]}_{cid[:10]}_{int(now.timestamp())}",
-        "wallet":     wallet,
-        "market_id":  cid,
-        "market_name": market_name[:50],
-        "entry_price": round(entry_price, 4),
-        "outcome":    outcome,
-        "eval_at":    eval_at,
-        "recorded_at": now.isoformat(),
-    })
+    ts   = now.timestamp()
+    rows = []
+    for horizon, hours in EVAL_HORIZONS.items():
+        if hours is not None:
+            due_at = ts + hours * 3600
+        else:
+            due_at = ts + RESOLUTION_RECHECK_HOURS * 3600
+            try:
+                end_dt = datetime.fromisoformat(end_date_iso.replace("Z", "+00:00"))
+                if end_dt.tzinfo is None: end_dt = end_dt.replace(tzinfo=timezone.utc)
+                due_at = max(due_at, end_dt.timestamp())
+            except (ValueError, AttributeError):
+                pass
+        rows.append((wallet, cid, horizon, market_name[:50], round(entry_price, 4), outcome, due_at, now.isoformat()))
+    wallet_store.queue_evals(wallet_db, rows)   # every checkpoint in one transaction
 
 def boost_signal_tier(base_tier, wallet_tier):
     """
@@ -587,11 +1435,40 @@ def calculate_signal(wt, yes_price, win_rate, count, days_to_resolve, is_sports=
     tier = 1 if divergence >= t1 else (2 if divergence >= t2 else 0)
     return {"tier":tier,"divergence":round(divergence,4),"whale_prob":round(whale_prob,4),"market_prob":round(market_prob,4),"threshold_t1":round(t1,4),"threshold_t2":round(t2,4),"win_rate":win_rate,"trade_count":count,"impact_ratio":wt.get("impact_ratio",0),"is_sports":is_sports}
 
+def market_yes_price(market):
+    try:
+        prices = market.get("outcomePrices","")
+        return float(json.loads(prices)[0]) if prices else 0.5
+    except: return 0.5
+
+def batch_find_whales(fetched, sketches=None):
+    """
+    v6.11: find_whale_trades() + calculate_signal() for every fetched market in one
+    vectorized pass. `fetched` is the drained iter_market_trades() output. Returns one
+    whale list per market; each whale carries its signal under "_signal" (without the
+    wallet fields, which qualify_whale() fills in per trade).
+    v6.24: per-market whale bars from market_whale_min() when `sketches` is given.
+    """
+    import signal_engine  # NumPy is only needed in batch mode
+    meta = []
+    for market, cid, trades in fetched:
+        is_sports = (market.get("_category","other") == "sports")
+        days      = market.get("_days_to_resolve", 7)
+        yes_price = market_yes_price(market)
+        meta.append({
+            "liquidity":   float(market.get("liquidityNum") or market.get("liquidity") or 0),
+            "whale_min":   market_whale_min(sketches, cid, days, is_sports),
+            "t1":          get_divergence_threshold(days, is_sports),
+            "market_prob": float(yes_price) if yes_price else 0.5,
+            "is_sports":   is_sports,
+        })
+    return signal_engine.detect_whales_batch([trades for _, _, trades in fetched], meta, MIN_IMPACT_RATIO)
+
 def send_telegram(message):
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
         print("[!] Telegram not configured"); print(message); return False
     try:
-        requests.post(f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage", json={"chat_id":TELEGRAM_CHAT_ID,"text":message}, timeout=10).raise_for_status()
+        http_client.post(f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage", json={"chat_id":TELEGRAM_CHAT_ID,"text":message}, timeout=10).raise_for_status()
         print("[+] Telegram sent"); return True
     except Exception as e:
         print(f"[x] Telegram failed: {e}"); return False
@@ -600,7 +1477,7 @@ def format_signal(market, wt, signal, stage, signal_type="Whale Single Trade", l
     wtier = wallet_info.get("tier", "unknown") if wallet_info else "unknown"
     boosted = boost_signal_tier(signal["tier"], wtier) if wtier in ("elite","smart","market_maker") else signal["tier"]
     is_extreme_pp = (boosted == "EXTREME++")
-    is_extreme    = is_extreme_pp or (boosted == "EXTREME") or ((liq_shock_info is not None) and (signal_type == "Whale Accumulation") and (signal["tier"] == 1))
+    is_extreme    = is_extreme_pp or (boosted == "EXTREME") or ((liq_shock_info is not None) and (signal_type in ("Whale Accumulation", "Swarm")) and (signal["tier"] == 1))
     if wtier == "elite":
         emoji = "\u2b50 ELITE WALLET DETECTED"
         label = "EXTREME++ - HIGHEST CONVICTION"
@@ -610,6 +1487,9 @@ def format_signal(market, wt, signal, stage, signal_type="Whale Single Trade", l
     elif is_extreme:
         emoji = "\u26a0\ufe0f PRE-WHALE SETUP DETECTED"
         label = "EXTREME - HIGH CONVICTION"
+    elif signal_type == "Swarm":
+        emoji = "COORDINATED ENTRY DETECTED"
+        label = "TIER 1 - SMART MONEY CONVERGENCE" if signal["tier"] == 1 else "TIER 2 - COORDINATED ENTRY"
     elif signal["tier"] == 1:
         emoji = "!! WHALE SIGNAL !!"
         label = "TIER 1 - ACT"
@@ -619,6 +1499,10 @@ def format_signal(market, wt, signal, stage, signal_type="Whale Single Trade", l
     cluster_line = ""
     if signal_type == "Whale Accumulation":
         cluster_line = f"Cluster: {wt.get('trade_count','?')} trades in {wt.get('span_mins','?'):.1f}min\n"
+    elif signal_type == "Swarm":
+        cluster_line = (f"Wallets: {wt['wallet_count']} unique addresses\n"
+                        f"Combined: ${wt['size_usd']:,.0f} in {wt['span_mins']:.0f} minutes\n"
+                        f"Largest single wallet: {wt['dominant_wallet_pct']:.1f}% of total\n")
     shock_line = ""
     if liq_shock_info is not None:
         prev_l, drop_p = liq_shock_info
@@ -648,137 +1532,388 @@ def format_signal(market, wt, signal, stage, signal_type="Whale Single Trade", l
             f"Divergence: +{signal['divergence']*100:.1f}% (threshold: {signal['threshold_t1']*100:.1f}%{sports})\n\n"
             f"Signal: {label}\nStage: {stage} {slabel}\nReply PAPER YES to enter trade.")
 
+def format_event_signal(es, wallet_info=None):
+    wtier = wallet_info.get("tier", "unknown") if wallet_info else "unknown"
+    label = {"elite": "EVENT ACCUMULATION - ELITE WALLET", "smart": "EVENT ACCUMULATION - SMART WALLET"}.get(wtier, "EVENT ACCUMULATION - MONITOR")
+    legs  = "".join(f"  ${leg['usd']:,.0f}  {leg['market_name'][:50]}\n" for leg in es["legs"][:6])
+    more  = f"  ... +{len(es['legs']) - 6} more\n" if len(es["legs"]) > 6 else ""
+    return (f"EVENT FLOW DETECTED  [EVENT ACCUMULATION]\n\nEvent: {es['event_title'][:60]}\n"
+            f"Wallet: {es['wallet'][:10]}... ({wtier.upper()})\n"
+            f"Direction: net {es['direction']}  Size: ${es['size_usd']:,.2f} (gross ${es['gross_usd']:,.0f})\n"
+            f"Spread over {es['market_count']} of {es['event_markets']} sibling markets:\n{legs}{more}"
+            f"Impact: {es['impact_ratio']*100:.2f}% of event liquidity (${es['event_liquidity']:,.0f})\n"
+            f"Event net flow (all wallets): {'-' if es['event_net_flow'] < 0 else '+'}${abs(es['event_net_flow']):,.0f}\n\n"
+            f"Signal: {label}\nNo single-market trade -- review the ladder before entering.")
+
 # --- MAIN SCAN ---
 
-def scan_markets(min_size=None, target_market_id=None, json_output=False, skip_resolution_filter=False, force_stage=None):
+def market_cid(market):
+    return market.get("conditionId") or market.get("condition_id") or market.get("id","")
+
+def _request_count():
+    """Requests made so far by http_client (retries included) -- what the scan budget is charged."""
+    return sum(st["requests"] + st["retries"] for st in http_client.stats().values())
+
+def build_scan_list(listing_workers=LISTING_WORKERS, skip_resolution_filter=False, force_stage=None):
+    """Fetch + merge + filter the listing and pick the stage. Returns (markets, liquid_markets, stage_used)."""
+    bytes_before = listing_bytes()
+    markets_flat, events_flat = fetch_listing_sources(listing_workers)
+    listing_kb   = (listing_bytes() - bytes_before) / 1024
+    all_markets  = merge_market_sources(markets_flat, events_flat)
+    new_ids      = market_index.index_markets(all_markets)
+    market_index.save()
+    print(f"[+] Market index: {market_index.size():,} markets ({new_ids} new) -> {os.path.basename(market_index.INDEX_FILE)}")
+    liquid_markets = filter_liquid_markets(all_markets)
+    print(f"[+] Listing: {listing_kb:,.0f} KB downloaded -> {len(liquid_markets)} markets kept "
+          f"({listing_kb/max(len(liquid_markets),1):.1f} KB per kept market)")
+    if skip_resolution_filter:
+        markets = liquid_markets; stage_used = 1
+        print("[i] Resolution filter SKIPPED")
+    else:
+        markets, stage_used = run_stage_expansion(liquid_markets, force_stage)
+    cfg = STAGE_CONFIG.get(stage_used, STAGE_CONFIG[1])
+    null_count = sum(1 for m in markets if m.get("_null_date"))
+    print(f"\n[>] Stage {stage_used} {cfg['label']} | {cfg['min_days']}-{cfg['max_days']}d + {null_count} Open Horizon | WhaleMin: dynamic | Div: V-shape")
+    return markets, liquid_markets, stage_used
+
+def scan_markets(min_size=None, target_market_id=None, json_output=False, skip_resolution_filter=False, force_stage=None, listing_workers=LISTING_WORKERS, trade_workers=TRADE_FETCH_WORKERS, batch_signals=False, full_refresh=False, schedule=None, listing_cache=None):
     global WHALE_MIN_SIZE
     print("\n" + "="*62)
-    print(f"WHALE TRACKER v6.3 - {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
+    print(f"WHALE TRACKER v6.26 - {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
     print(f"MinLiq=${MIN_LIQUIDITY:,} | NullDateMinLiq=${NULL_DATE_MIN_LIQ:,} | ImpactRatio={MIN_IMPACT_RATIO} | MaxHorizon={MAX_HORIZON_DAYS}d | Div=dynamic")
     print("="*62)
     if min_size: WHALE_MIN_SIZE = min_size
     signals_found    = []
     stage_used       = 1
-    liq_history      = load_liquidity_history()
-    liq_history_upd  = {}  # collected this scan, written at end
+    liq_store        = open_liquidity_store()
+    liq_detector     = liquidity_detector.load_state()
+    liq_samples      = []  # (cid, liq, ts) collected this scan, appended at end
     now              = datetime.now(timezone.utc)
-    wallet_stats     = load_wallet_stats()
-    pending_evals    = load_pending_evals()
-    # Phase 4: process any evals that are due
-    pending_evals    = process_pending_evals(pending_evals, wallet_stats, now)
+    req0             = _request_count()
+    if schedule is not None: scan_scheduler.refill(schedule, now.timestamp())
+    wallet_db        = open_wallet_store()
+    # Phase 4: process any evals that are due, then rescore the wallet population
+    process_pending_evals(wallet_db, now)
+    rescore_wallets(wallet_db, now)
+    trade_cursors    = None if target_market_id else load_trade_cursors()
+    sketches         = size_sketch.load_state()
+    adaptive_mins    = 0   # markets whose p99 bar sits above the static floor
+    tape_rows        = []  # every fetched trade, written to the tape once at the end
+    emitted          = load_emitted_windows() if trade_cursors is not None else None
+    tape             = None  # cursor scans: lookback for the windowed detectors
+    if trade_cursors is not None:
+        try:
+            tape = trade_tape.open_tape(TRADE_TAPE_DB)
+        except Exception as e:
+            print(f"  [x] Trade tape open failed (detectors see new trades only): {e}")
+    new_by_cid       = {}  # event members' new trades, folded into the event flow after the loop
 
+    listing_fresh = True
     if target_market_id:
         markets = [{"conditionId": target_market_id}]; stage_used = 1
         print(f"[i] Single market mode: {target_market_id}")
+    elif listing_cache and time.time() - listing_cache["ts"] < LISTING_REFRESH_MINUTES * 60:
+        markets, liquid_markets, stage_used = list(listing_cache["markets"]), listing_cache["liquid"], listing_cache["stage"]
+        listing_fresh = False
+        print(f"[i] Listing reused ({(time.time() - listing_cache['ts']) / 60:.0f} min old): {len(markets)} markets, Stage {stage_used}")
     else:
-        markets_flat = fetch_markets()
-        events_flat  = fetch_events()
-        all_markets  = merge_market_sources(markets_flat, events_flat)
-        liquid_markets = filter_liquid_markets(all_markets)
-        if skip_resolution_filter:
-            markets = liquid_markets; stage_used = 1
-            print("[i] Resolution filter SKIPPED")
-        else:
-            markets, stage_used = run_stage_expansion(liquid_markets, force_stage)
-        cfg = STAGE_CONFIG.get(stage_used, STAGE_CONFIG[1])
-        null_count = sum(1 for m in markets if m.get("_null_date"))
-        print(f"\n[>] Stage {stage_used} {cfg['label']} | {cfg['min_days']}-{cfg['max_days']}d + {null_count} Open Horizon | WhaleMin: dynamic | Div: V-shape")
+        markets, liquid_markets, stage_used = build_scan_list(listing_workers, skip_resolution_filter, force_stage)
+        if listing_cache is not None:
+            listing_cache.update(ts=time.time(), markets=markets, liquid=liquid_markets, stage=stage_used, surge={})
 
     if not target_market_id:
         markets.sort(key=lambda m: CATEGORY_PRIORITY.get(m.get("_category","other"), 99))
 
+    listing_snapshot = None
+    fetch_only       = None
+    surge_scores     = None
+    candidates       = []
+    if not target_market_id and listing_fresh:
+        listing_snapshot = load_listing_snapshot()
+        # v6.25: listing-only surge scoring -- ranks /trades fetches, emits Volume Surge candidates
+        surge_scores, candidates = score_listing_surges(liquid_markets, listing_snapshot, now.timestamp())
+        if listing_cache is not None: listing_cache["surge"] = surge_scores
+        hot = sum(1 for m in markets if surge_scores.get(m.get("conditionId") or m.get("condition_id") or m.get("id","")))
+        print(f"[+] Surge scoring: {len(surge_scores)} of {len(liquid_markets)} listed markets moving "
+              f"({hot} in scan, fetched first) | {len(candidates)} Volume Surge candidate(s)")
+        for c in candidates[:SURGE_TOP_N]:
+            print(f"  [^] SURGE [{c['market_category'].upper()}] x{c['surge_ratio']:.1f} +${c['volume_delta']:,.0f} "
+                  f"in {c['hours']:.1f}h px {c['price_move']:+.3f} score={c['score']:.2f}: {c['market_name'][:45]}")
+    elif not target_market_id:
+        surge_scores = listing_cache["surge"]
+
+    # v6.26: scheduled mode -- only markets whose next-scan time has passed, within the budget
+    due, exposed = None, set()
+    if schedule is not None and not target_market_id:
+        exposed = scan_scheduler.open_exposure()
+        budget  = max(0, int(schedule["tokens"] - (_request_count() - req0)))
+        due     = set(scan_scheduler.take_due(schedule, [market_cid(m) for m in markets], now.timestamp(), budget, surge_scores))
+        print(f"[+] Schedule: {len(due)} due markets taken (budget {budget} requests, {schedule.get('backlog', 0)} more overdue)")
+    if listing_snapshot is not None:
+        fetch_only = select_changed_markets(markets, listing_snapshot, full_refresh, due)
+    elif due is not None:
+        fetch_only = due   # stale listing: nothing to compare against, fetch every due market
+
+    # v6.23: event index over the scan list (sibling markets of one /events container)
+    event_index = build_event_index(markets)
+    flow_since  = now.timestamp() - EVENT_FLOW_WINDOW
+    if event_index:
+        print(f"[+] Event index: {len(event_index)} events spanning {sum(len(ev['markets']) for ev in event_index.values())} sibling markets")
+
     print(f"\n[>] Scanning {len(markets)} markets...\n")
     SKIP_THRESHOLD = 0.05
 
-    for market in markets:
-        cid = market.get("conditionId") or market.get("condition_id") or market.get("id","")
-        if not cid: continue
+    failed  = set()   # cursor fetches that errored: listing state and schedule left as they were
+    fetched = iter_market_trades(markets, trade_workers, trade_cursors, fetch_only, surge_scores, failed)
+    batch   = None
+    if batch_signals:
+        fetched = list(fetched)  # v6.11: drain the fan-out, then one vectorized detection pass
+        batch   = batch_find_whales(fetched, sketches)
+
+    for i, (market, cid, trades) in enumerate(fetched):
         name        = market.get("question", cid[:20])[:40]
         category    = market.get("_category","other")
         is_sports   = (category == "sports")
         liquidity   = float(market.get("liquidityNum") or market.get("liquidity") or 0)
         days_to_res = market.get("_days_to_resolve", 7)
-        # Phase 3: shock check + snapshot accumulation
-        shock, prev_liq, drop_pct = check_liquidity_shock(cid, liquidity, liq_history)
-        liq_history_upd[cid] = {"liq": liquidity, "ts": datetime.now(timezone.utc).isoformat()}
+        # Phase 3: shock check + snapshot accumulation (once per listing refresh in scheduled mode)
+        shock, prev_liq, drop_pct, shock_reason = False, 0.0, 0.0, ""
+        if listing_fresh:
+            shock, prev_liq, drop_pct, shock_reason = check_liquidity_shock(cid, liquidity, liq_store, liq_detector)
+            liq_samples.append((cid, liquidity, time.time()))
         if shock:
-            print(f"  [~] Liq SHOCK [{category.upper()}]: ${prev_liq:,.0f} -> ${liquidity:,.0f} (-{drop_pct*100:.1f}%) {name}")
-        trades = get_recent_trades(cid)
+            print(f"  [~] Liq SHOCK [{category.upper()}] ({shock_reason}): ${prev_liq:,.0f} -> ${liquidity:,.0f} (-{drop_pct*100:.1f}%) {name}")
+        if due is not None:
+            if shock: scan_scheduler.note_shock(schedule, cid, now.timestamp())
+            if cid in due and cid not in failed:   # a failed fetch stays due for the next tick
+                stage = 1 if days_to_res < 1 else _STAGE_BY_DAY.get(days_to_res, 4)   # Open Horizon (999) -> 4
+                scan_scheduler.reschedule(schedule, cid, now.timestamp(), stage,
+                                          len(trades), cid in exposed, surge_scores.get(cid, 0))
         if not trades: continue
-        whales   = find_whale_trades(trades, liquidity, days_to_res, is_sports)
-        clusters = find_whale_clusters(trades, liquidity, days_to_res, is_sports)
-        if not whales and not clusters: continue
+        tape_rows.extend(trade_tape.tape_row(cid, t, trade_key(t), now.timestamp()) for t in trades)
+        if event_key(market) in event_index: new_by_cid[cid] = trades
+        whale_min = market_whale_min(sketches, cid, days_to_res, is_sports)
+        if whale_min > get_whale_min_for_days(days_to_res, is_sports): adaptive_mins += 1
+        if trade_cursors is not None:  # cursor fetches are new trades only, so none is counted twice
+            size_sketch.update(sketches, cid, (_trade_usd(t) for t in trades), now.timestamp())
+        whales   = batch[i] if batch is not None else find_whale_trades(trades, liquidity, days_to_res, is_sports, whale_min)
+        # Phase 2/6 windows may start before this scan's first new trade: add the tape's
+        # lookback and keep only windows that end on a new trade and were not alerted yet
+        context, min_end = trades, None
+        if tape is not None:
+            min_end = min(int(t.get("timestamp", 0)) for t in trades)
+            context = with_tape_lookback(tape, cid, trades, min_end - max(CLUSTER_WINDOW, SWARM_WINDOW))
+        done     = emitted.get(cid) if emitted is not None else None
+        clusters = find_whale_clusters(context, liquidity, days_to_res, is_sports, min_end_ts=min_end, emitted=done)
+        swarms   = find_swarm_activity(context, liquidity, min_end, done)
+        if not whales and not clusters and not swarms: continue
         event_ctx = f" [{market.get('_parent_event_title','')[:25]}]" if market.get("_parent_event_title") else ""
         if clusters:
             print(f"[!] {len(clusters)} cluster(s) [{category.upper()}]{event_ctx}: {name}")
         if whales:
             print(f"[!] {len(whales)} whale(s) [{category.upper()}]{event_ctx}: {name}")
-        # Process clusters first (higher confidence), then singles
-        for wt in (clusters + whales):
+        # Phase 6: a swarm backed by a Phase 1/2 whale on the same outcome is Tier 1 and
+        # goes first (it subsumes the backing signal); an unbacked swarm is Tier 2, last.
+        backed_outcomes = {w.get("outcome","Yes") for w in clusters + whales}
+        for sw in swarms:
+            sw["_backed"] = sw["outcome"] in backed_outcomes
+            print(f"[!] Swarm [{category.upper()}]{event_ctx}: {sw['wallet_count']} wallets ${sw['size_usd']:,.0f} "
+                  f"{sw['outcome']} in {sw['span_mins']:.0f}min (top {sw['dominant_wallet_pct']:.0f}%)"
+                  f"{' + Phase 1/2 backing' if sw['_backed'] else ''}: {name}")
+        # Process backed swarms and clusters first (higher confidence), then singles
+        for wt in ([sw for sw in swarms if sw["_backed"]] + clusters + whales + [sw for sw in swarms if not sw["_backed"]]):
             ok, wr, cnt = qualify_whale(wt["wallet"])
             if not ok: continue
-            try:
-                prices = market.get("outcomePrices","")
-                yes_price = float(json.loads(prices)[0]) if prices else 0.5
-            except: yes_price = 0.5
-            sig = calculate_signal(wt, yes_price, wr, cnt, days_to_res, is_sports)
+            yes_price = market_yes_price(market)
+            pre_sig   = wt.pop("_signal", None)
+            sig = dict(pre_sig, win_rate=wr, trade_count=cnt) if pre_sig else calculate_signal(wt, yes_price, wr, cnt, days_to_res, is_sports)
+            if wt.get("signal_type") == "Swarm":
+                sig["tier"] = 1 if wt["_backed"] else 2   # Phase 6 tier mapping (draft spec)
             if sig["tier"] == 0: continue
             if yes_price < SKIP_THRESHOLD or yes_price > (1 - SKIP_THRESHOLD): continue
             days_label = "Open" if days_to_res == 999 else f"{days_to_res}d"
-            stype_short = "ACCUM" if wt.get("signal_type") == "Whale Accumulation" else "SINGLE"
+            stype_short = {"Whale Accumulation": "ACCUM", "Swarm": "SWARM"}.get(wt.get("signal_type"), "SINGLE")
             cluster_info = f" {wt['trade_count']}tx/{wt['span_mins']:.0f}min" if wt.get("signal_type") == "Whale Accumulation" else ""
+            if wt.get("signal_type") == "Swarm":
+                cluster_info = f" {wt['wallet_count']}w/{wt['span_mins']:.0f}min top={wt['dominant_wallet_pct']:.0f}%"
             wtag = f" [W:{wt['wallet'][:8]}]" if wt.get("wallet","unknown") != "unknown" else ""
             print(f"  [*] TIER {sig['tier']} [{stype_short}] [{category.upper()}] outcome={wt.get('outcome','?')} whale_YES={sig['whale_prob']:.3f} mkt_YES={sig['market_prob']:.3f} div={sig['divergence']*100:.1f}% (need {sig['threshold_t1']*100:.1f}%) ${wt['size_usd']:,.0f} impact={wt['impact_ratio']*100:.2f}% {days_label}{cluster_info}{wtag}")
             if any(s["market_id"]==cid for s in signals_found): continue
             stype = wt.get("signal_type", "Whale Single Trade")
             # Phase 4: wallet intelligence
-            winfo = get_wallet_info(wt["wallet"], wallet_stats)
+            winfo = get_wallet_info(wt["wallet"], wallet_db)
             boosted_tier = boost_signal_tier(sig["tier"], winfo["tier"])
             if boosted_tier is None:  # market_maker suppressed
                 print(f"  [--] Market maker suppressed: {wt['wallet'][:10]}")
                 continue
-            record_wallet_trade(pending_evals, wt["wallet"], cid,
+            record_wallet_trade(wallet_db, wt["wallet"], cid,
                                 market.get("question",""), wt["price"],
-                                wt.get("outcome","Yes"), now)
-            signals_found.append({"market_id":cid,"market_name":market.get("question","Unknown"),"market_slug":market.get("slug",""),"parent_event":market.get("_parent_event_title",""),"market_category":category,"yes_price":yes_price,"tier":sig["tier"],"boosted_tier":str(boosted_tier),"divergence":sig["divergence"],"threshold_t1":sig["threshold_t1"],"whale_prob":sig["whale_prob"],"market_prob":sig["market_prob"],"direction":wt["direction"],"outcome":wt.get("outcome","Yes"),"size_usd":wt["size_usd"],"impact_ratio":wt["impact_ratio"],"wallet":wt["wallet"],"wallet_tier":winfo["tier"],"end_date_iso":market.get("_end_date_iso",""),"days_to_resolve":days_to_res,"null_date":market.get("_null_date",False),"stage_used":stage_used,"liq_shock":shock,"prev_liq":round(prev_liq,2),"liq_drop_pct":round(drop_pct,4),"signal_type":stype,"scanned_at":now.isoformat()})
+                                wt.get("outcome","Yes"), now, market.get("_end_date_iso",""))
+            signals_found.append({"market_id":cid,"market_name":market.get("question","Unknown"),"market_slug":market.get("slug",""),"parent_event":market.get("_parent_event_title",""),"market_category":category,"yes_price":yes_price,"tier":sig["tier"],"boosted_tier":str(boosted_tier),"divergence":sig["divergence"],"threshold_t1":sig["threshold_t1"],"whale_prob":sig["whale_prob"],"market_prob":sig["market_prob"],"direction":wt["direction"],"outcome":wt.get("outcome","Yes"),"size_usd":wt["size_usd"],"impact_ratio":wt["impact_ratio"],"wallet":wt["wallet"],"wallet_tier":winfo["tier"],"end_date_iso":market.get("_end_date_iso",""),"days_to_resolve":days_to_res,"null_date":market.get("_null_date",False),"stage_used":stage_used,"liq_shock":shock,"prev_liq":round(prev_liq,2),"liq_drop_pct":round(drop_pct,4),"liq_shock_reason":shock_reason,"signal_type":stype,"scanned_at":now.isoformat()})
+            if emitted is not None and stype in ("Whale Accumulation", "Swarm"):
+                ekey = f"A|{wt['wallet']}|{wt['outcome']}" if stype == "Whale Accumulation" else f"S|{wt['outcome']}"
+                emitted.setdefault(cid, {})[ekey] = wt["window_end"]
+            if stype == "Swarm":
+                signals_found[-1]["swarm"] = {k: wt[k] for k in ("wallet_count", "wallets", "window_seconds", "dominant_wallet_pct", "trade_count")}
             shock_info = (prev_liq, drop_pct) if shock else None
             if shock and stype == "Whale Accumulation" and sig["tier"] == 1:
                 print(f"  [!!!] EXTREME signal: liq shock + accumulation + Tier 1")
+            if shock and stype == "Swarm" and wt["_backed"]:
+                print(f"  [!!!] EXTREME signal: liq shock + swarm + Phase 1/2 backing")
             if winfo["tier"] in ("elite","smart"):
-                print(f"  [W:{winfo['tier'].upper()}] acc={winfo['accuracy']*100:.0f}% trades={winfo['trades']} score={winfo['score']:.2f} -> tier {sig['tier']} boosted to {boosted_tier}")
+                print(f"  [W:{winfo['tier'].upper()}@{winfo['horizon']}] acc={winfo['accuracy']*100:.0f}% trades={winfo['trades']} score={winfo['score']:.2f} -> tier {sig['tier']} boosted to {boosted_tier}")
             if not json_output: send_telegram(format_signal(market, wt, sig, stage_used, stype, shock_info, winfo))
 
+    # v6.23: event-level accumulation across sibling markets (no extra API calls). Every
+    # member's EVENT_FLOW_WINDOW comes from the tape plus this scan's new trades, so members
+    # not fetched this scan (unchanged, or not due in --scheduled) still count.
+    for ev in event_index.values():
+        for mcid in ev["markets"]:
+            add_event_flow(ev, mcid, with_tape_lookback(tape, mcid, new_by_cid.get(mcid, []), flow_since), flow_since)
+    event_signals = []
+    for es in find_event_accumulation(event_index):
+        ekey = f"E|{es['wallet']}|{es['direction']}"
+        if emitted is not None and now.timestamp() - emitted.get("event:" + es["event_id"], {}).get(ekey, 0) < EVENT_FLOW_WINDOW:
+            continue  # same flow already alerted within its window
+        winfo = get_wallet_info(es["wallet"], wallet_db)
+        if winfo["tier"] == "market_maker":
+            print(f"  [--] Market maker suppressed (event): {es['wallet'][:10]}")
+            continue
+        es.update(wallet_tier=winfo["tier"], scanned_at=now.isoformat())
+        event_signals.append(es)
+        if emitted is not None: emitted.setdefault("event:" + es["event_id"], {})[ekey] = now.timestamp()
+        print(f"[!] EVENT ACCUM [{es['event_title'][:40]}]: {es['direction']} ${es['size_usd']:,.0f} across "
+              f"{es['market_count']}/{es['event_markets']} markets impact={es['impact_ratio']*100:.2f}% [W:{es['wallet'][:8]}]")
+        if not json_output: send_telegram(format_event_signal(es, winfo))
+
+    if due is not None:
+        scan_scheduler.spend(schedule, _request_count() - req0)
+        scan_scheduler.save_schedule(schedule)
+        print(f"[+] Schedule: {_request_count() - req0} requests this tick | {schedule['tokens']:.1f} tokens left "
+              f"(+{scan_scheduler.REQUESTS_PER_MINUTE}/min) -> {os.path.basename(scan_scheduler.SCHEDULE_FILE)}")
+    if trade_cursors is not None:
+        save_trade_cursors(trade_cursors)
+        save_emitted_windows(emitted)
+        size_sketch.save_state(sketches)
+        print(f"[+] Size sketches: {len(sketches)} markets | {adaptive_mins} scanned on a p{size_sketch.QUANTILE*100:.0f} "
+              f"whale bar above the floor -> {os.path.basename(size_sketch.STATE_FILE)}")
+    if listing_snapshot is not None:
+        for cid, st in fetch_only.items():
+            if cid not in failed: listing_snapshot["markets"][cid] = st
+        save_listing_snapshot(listing_snapshot)
+    # v6.8: one batched tape write per scan
+    try:
+        tape  = tape or trade_tape.open_tape(TRADE_TAPE_DB)
+        added = trade_tape.append_trades(tape, tape_rows)
+        tape.close()
+        print(f"[+] Trade tape: {added} new of {len(tape_rows)} fetched -> {os.path.basename(TRADE_TAPE_DB)}")
+    except Exception as e:
+        print(f"  [x] Trade tape write failed: {e}")
     # Phase 3: persist liquidity snapshots for next scan
-    liq_history.update(liq_history_upd)
-    save_liquidity_history(liq_history)
-    print(f"[+] Liq history: {len(liq_history_upd)} markets snapshotted -> {LIQUIDITY_HISTORY_FILE.split(chr(47))[-1]}")
+    try:
+        liquidity_store.append_samples(liq_store, liq_samples)
+        evicted = liquidity_store.compact(liq_store)
+        st      = liquidity_store.store_stats(liq_store)
+        print(f"[+] Liq store: {len(liq_samples)} markets sampled | {st['markets']} tracked ({evicted} evicted) "
+              f"| {st['bytes']/1024:,.0f} KB -> {os.path.basename(LIQUIDITY_STORE_FILE)}")
+    except Exception as e:
+        print(f"  [x] Liq store write failed: {e}")
+    finally:
+        liquidity_store.close_store(liq_store)
+    liquidity_detector.save_state(liq_detector)
     # Phase 4: persist wallet intelligence
-    save_wallet_stats(wallet_stats)
-    save_pending_evals(pending_evals)
-    print(f"[+] Wallet DB: {len(wallet_stats)} wallets | Pending evals: {len(pending_evals)}")
+    print(f"[+] Wallet DB: {wallet_store.wallet_count(wallet_db)} wallets | Pending evals: {wallet_store.eval_count(wallet_db)}")
+    wallet_db.close()
+    http_client.print_stats()
 
     print("\n" + "="*62)
-    print(f"SCAN COMPLETE -- Stage {stage_used} -- {len(signals_found)} signal(s)")
+    print(f"SCAN COMPLETE -- Stage {stage_used} -- {len(signals_found)} signal(s), {len(event_signals)} event signal(s)")
     print("="*62)
-    if not signals_found:
+    if not signals_found and not event_signals:
         print(f"[i] No signals (Stage {stage_used}: {STAGE_CONFIG.get(stage_used,{}).get('label','?')}). Patience is a position.")
     else:
         for s in signals_found:
             null_tag = " [OPEN HORIZON]" if s.get("null_date") else ""
             print(f"  Tier {s['tier']} [{s.get('market_category','?').upper()}]: {s['market_name'][:50]} | div {s['divergence']*100:.1f}% vs {s['threshold_t1']*100:.1f}% | {s['days_to_resolve']}d{null_tag}")
+        for es in event_signals:
+            print(f"  Event [{es['direction']}]: {es['event_title'][:50]} | ${es['size_usd']:,.0f} over {es['market_count']} markets")
     if json_output:
-        out = {"scanned_at":datetime.now(timezone.utc).isoformat(),"signals_count":len(signals_found),"markets_scanned":len(markets),"stage_used":stage_used,"signals":signals_found}
-        with open(SIGNALS_OUTPUT,"w") as f: json.dump(out, f, indent=2)
-        print(f"\n[+] Written to {SIGNALS_OUTPUT}")
+        n_scanned = (len(markets) if fetch_only is None else len(fetch_only)) - len(failed)   # markets whose trades were fetched
+        out = {"scanned_at":datetime.now(timezone.utc).isoformat(),"signals_count":len(signals_found),"markets_scanned":n_scanned,"markets_listed":len(markets),"stage_used":stage_used,"signals":signals_found,"event_signals":event_signals,"candidates":candidates}
+        if schedule is not None:
+            out = merge_signal_output(out, now.timestamp(), keep_candidates=not listing_fresh)
+        tmp = SIGNALS_OUTPUT + ".tmp"   # atomic: the bridge may read between ticks
+        with open(tmp,"w") as f: json.dump(out, f, indent=2)
+        os.replace(tmp, SIGNALS_OUTPUT)
+        kept = f" ({out['signals_count']} signal(s) from the last {SIGNALS_KEEP_HOURS}h)" if schedule is not None else ""
+        print(f"\n[+] Written to {SIGNALS_OUTPUT}{kept}")
     return signals_found
 
+def merge_signal_output(out, now_ts, keep_candidates=False):
+    """
+    --scheduled --json: a tick adds its signals to the ones already in SIGNALS_OUTPUT from
+    the last SIGNALS_KEEP_HOURS instead of overwriting them, so a bridge run between ticks
+    still sees them and a quiet tick does not wipe them (the file used to hold one 2h scan).
+    A newer signal replaces an older one for the same market / event wallet; the bridge's
+    duplicate guard covers re-reads. keep_candidates: this tick reused the listing, so the
+    previous Volume Surge candidates still stand.
+    """
+    try:
+        with open(SIGNALS_OUTPUT) as f:
+            prev = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return out
+    cutoff = now_ts - SIGNALS_KEEP_HOURS * 3600
+    def recent(s):
+        try: return datetime.fromisoformat(s.get("scanned_at", "")).timestamp() >= cutoff
+        except (TypeError, ValueError): return False
+    mids = {s["market_id"] for s in out["signals"]}
+    out["signals"] = out["signals"] + [s for s in prev.get("signals", []) if s.get("market_id") not in mids and recent(s)]
+    eids = {(e["event_id"], e["wallet"]) for e in out["event_signals"]}
+    out["event_signals"] = out["event_signals"] + [e for e in prev.get("event_signals", [])
+                                                   if (e.get("event_id"), e.get("wallet")) not in eids and recent(e)]
+    if keep_candidates:
+        out["candidates"] = prev.get("candidates", [])
+    out["signals_count"] = len(out["signals"])
+    return out
+
+def run_scheduled(ticks=None, **scan_kwargs):
+    """
+    v6.26: --scheduled. Runs scan_markets() every SCHEDULE_TICK_MINUTES on the markets whose
+    next-scan time has passed (scan_scheduler), within the request budget. The listing is
+    reused for LISTING_REFRESH_MINUTES. With json_output each tick merges its signals into
+    SIGNALS_OUTPUT (merge_signal_output). `ticks` bounds the loop (None = run until killed).
+    """
+    schedule      = scan_scheduler.load_schedule()
+    listing_cache = {}
+    tick = 0
+    while ticks is None or tick < ticks:
+        t0 = time.monotonic()
+        try:
+            scan_markets(schedule=schedule, listing_cache=listing_cache, **scan_kwargs)
+        except Exception as e:
+            print(f"[x] Scheduled tick failed: {e}")
+        tick += 1
+        if ticks is not None and tick >= ticks: break
+        time.sleep(max(0.0, SCHEDULE_TICK_MINUTES * 60 - (time.monotonic() - t0)))
+
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Polymarket Whale Signal Detection v6.3")
+    parser = argparse.ArgumentParser(description="Polymarket Whale Signal Detection v6.26")
     parser.add_argument("--min-size",             type=float, default=None)
     parser.add_argument("--market-id",            type=str,   default=None)
     parser.add_argument("--json",                 action="store_true", default=False)
     parser.add_argument("--no-resolution-filter", action="store_true", default=False)
     parser.add_argument("--stage",                type=int, choices=[1,2,3,4], default=None)
+    parser.add_argument("--listing-workers",      type=int, default=LISTING_WORKERS, help="offset pages fetched concurrently per listing endpoint")
+    parser.add_argument("--trade-workers",        type=int, default=TRADE_FETCH_WORKERS, help="/trades requests in flight during the market scan")
+    parser.add_argument("--full-refresh",         action="store_true", default=False, help="fetch trades for every market, ignoring the change filter")
+    parser.add_argument("--batch-signals",        action="store_true", default=False, help="fetch all trades first, then score every market in one NumPy pass")
+    parser.add_argument("--scheduled",            action="store_true", default=False, help="run continuously, scanning each market when its adaptive next-scan time is due")
+    parser.add_argument("--ticks",                type=int, default=None, help="--scheduled: stop after N ticks")
     args = parser.parse_args()
-    scan_markets(min_size=args.min_size, target_market_id=args.market_id, json_output=args.json, skip_resolution_filter=args.no_resolution_filter, force_stage=args.stage)
+    if args.scheduled:
+        if args.market_id: parser.error("--scheduled scans the whole universe; drop --market-id")
+        run_scheduled(ticks=args.ticks, min_size=args.min_size, json_output=args.json, skip_resolution_filter=args.no_resolution_filter, force_stage=args.stage, listing_workers=args.listing_workers, trade_workers=args.trade_workers, batch_signals=args.batch_signals, full_refresh=args.full_refresh)
+        sys.exit(0)
+    scan_markets(min_size=args.min_size, target_market_id=args.market_id, json_output=args.json, skip_resolution_filter=args.no_resolution_filter, force_stage=args.stage, listing_workers=args.listing_workers, trade_workers=args.trade_workers, batch_signals=args.batch_signals, full_refresh=args.full_refresh)
     sys.exit(0)